@@ -0,0 +1,107 @@
+"""
+Stateless JWT authentication.
+
+Access tokens carry the user's role and profile ids as claims. Read-only
+requests to views that only need those (``stateless_auth = True``) get a
+ClaimsUser built from the token, which saves the User lookup. Writes,
+every other view and tokens issued before the claims existed still load
+the User row.
+
+Deactivated and deleted users are kept in the 'auth' cache for as long as
+a token issued to them can be used, so the claims path turns them away
+without a query. Only saves and deletes through the ORM are noticed,
+``QuerySet.update(is_active=False)`` is not.
+"""
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from .models import StudentProfile, TutorProfile
+
+ROLE_CLAIM = 'role'
+STUDENT_PROFILE_CLAIM = 'student_profile_id'
+TUTOR_PROFILE_CLAIM = 'tutor_profile_id'
+AUTH_CACHE = 'auth'
+
+
+def inactive_key(user_id):
+    return f'auth:inactive:{user_id}'
+
+
+def set_user_inactive(user_id, inactive):
+    """Record on commit whether ``user_id`` may still authenticate from claims"""
+    def update():
+        cache = caches[AUTH_CACHE]
+        if inactive:
+            # Refreshing issues access tokens until the refresh token expires
+            lifetime = api_settings.REFRESH_TOKEN_LIFETIME + api_settings.ACCESS_TOKEN_LIFETIME
+            cache.set(inactive_key(user_id), True, lifetime.total_seconds())
+        else:
+            cache.delete(inactive_key(user_id))
+    transaction.on_commit(update)
+
+
+def is_user_inactive(user_id):
+    return caches[AUTH_CACHE].get(inactive_key(user_id), False)
+
+
+def add_profile_claims(token, user):
+    """Store the role and the profile id of ``user`` in ``token``"""
+    token[ROLE_CLAIM] = user.role
+    token[STUDENT_PROFILE_CLAIM] = None
+    token[TUTOR_PROFILE_CLAIM] = None
+    if user.role == 'student':
+        token[STUDENT_PROFILE_CLAIM] = StudentProfile.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+    elif user.role == 'tutor':
+        token[TUTOR_PROFILE_CLAIM] = TutorProfile.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+    return token
+
+
+class ClaimsUser(TokenUser):
+    """User stand-in backed by the token claims, has no database row behind it"""
+    
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+    
+    @cached_property
+    def student_profile_id(self):
+        return self.token.get(STUDENT_PROFILE_CLAIM)
+    
+    @cached_property
+    def tutor_profile_id(self):
+        return self.token.get(TUTOR_PROFILE_CLAIM)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that skips the User query for reads of views with ``stateless_auth``"""
+    
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        
+        validated_token = self.get_validated_token(raw_token)
+        if self.is_stateless(request, validated_token):
+            if is_user_inactive(validated_token[api_settings.USER_ID_CLAIM]):
+                raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+            return ClaimsUser(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+    
+    def is_stateless(self, request, validated_token):
+        view = (getattr(request, 'parser_context', None) or {}).get('view')
+        return (
+            getattr(view, 'stateless_auth', False) and
+            request.method in SAFE_METHODS and
+            ROLE_CLAIM in validated_token and
+            api_settings.USER_ID_CLAIM in validated_token
+        )
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Cached /me profile snapshots.
+
+A snapshot is the serialized profile of one user together with its ETag
+and Last-Modified. It is built with a single query (plus the subjects
+prefetch for tutors) and kept in the 'profile' cache until a write to the
+user, their profile or their subjects deletes it. Keys carry
+``SNAPSHOT_VERSION``, bump it when the snapshot's shape changes so a
+deploy never serves entries written by the previous code.
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from picourse.conditional import make_etag
+
+PROFILE_CACHE = 'profile'
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_key(user_id):
+    return f'profile:v{SNAPSHOT_VERSION}:{user_id}'
+
+
+def build_profile_snapshot(user_id, role):
+    from .serializers import UserProfileSerializer
+    
+    # Both profiles are joined, so the serializer finds the one that doesn't
+    # exist without a query of its own, only tutors need their subjects
+    queryset = get_user_model().objects.select_related('student_profile', 'tutor_profile')
+    if role == 'tutor':
+        queryset = queryset.prefetch_related('tutor_profile__subjects')
+    user = queryset.get(pk=user_id)
+    
+    timestamps = []
+    profile = getattr(user, f'{user.role}_profile', None)
+    if profile is not None:
+        timestamps.append(profile.updated_at)
+        if user.role == 'tutor':
+            timestamps.extend(subject.updated_at for subject in profile.subjects.all())
+    
+    # Plain JSON data, detached from the serializer's return types
+    data = json.loads(JSONRenderer().render(UserProfileSerializer(user).data))
+    return {
+        'data': data,
+        'etag': make_etag('me', data),
+        'last_modified': max(timestamps, default=None),
+    }
+
+
+def get_profile_snapshot(user):
+    cache = caches[PROFILE_CACHE]
+    key = snapshot_key(user.pk)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_profile_snapshot(user.pk, user.role)
+        cache.set(key, snapshot)
+    return snapshot
+
+
+def invalidate_profile_snapshots(user_ids):
+    """Drop the cached snapshots of these users"""
+    keys = [snapshot_key(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    
+    def delete():
+        caches[PROFILE_CACHE].delete_many(keys)
+    # Delete right away, and again on commit in case a concurrent request
+    # cached a snapshot read before this transaction committed
+    delete()
+    transaction.on_commit(delete)
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Bounded pool for password hashing.
+
+PBKDF2 holds a worker for tens of milliseconds per call. Login and
+registration hash in this pool instead of on the thread serving the
+request, so a burst of sign-ins can use at most ``PASSWORD_HASHING_WORKERS``
+cores and everything else keeps being served. hashlib releases the GIL
+while it hashes, so threads run in parallel without the cost of shipping
+work to other processes. Requests beyond ``PASSWORD_HASHING_QUEUE_SIZE``
+waiting hashes are turned away instead of piling up.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+
+class HashingPoolFull(Exception):
+    pass
+
+
+class HashingPool:
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.peak_queued = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+    
+    def submit(self, fn, *args):
+        with self.lock:
+            if self.queued >= self.queue_size:
+                self.rejected += 1
+                raise HashingPoolFull()
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        return self.executor.submit(self.call, fn, args)
+    
+    def call(self, fn, args):
+        with self.lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            return fn(*args)
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.completed += 1
+    
+    async def run(self, fn, *args):
+        """Await ``fn(*args)`` run in the pool, raises HashingPoolFull when the queue is full"""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+    
+    def stats(self):
+        with self.lock:
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'queued': self.queued,
+                'peak_queued': self.peak_queued,
+                'active': self.active,
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HashingPool(settings.PASSWORD_HASHING_WORKERS, settings.PASSWORD_HASHING_QUEUE_SIZE)
+    return _pool
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Bulk import of users from CSV or NDJSON.
+
+Rows are read one batch at a time and validated without touching the
+database except for one query per batch for the emails already taken.
+Passwords are hashed across a process pool, and the hashing of the next
+batch runs while the current one is inserted: users, profiles and subject
+links each go in with one ``bulk_create`` per batch. Rows that fail are
+reported by line number and skipped, the rest of their batch still goes in,
+also when the insert hits an email registered after the batch was checked.
+"""
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from tutoring import search
+from tutoring.cache import bump_catalog_version
+from tutoring.models import Subject
+from .models import StudentProfile, TutorProfile
+from .serializers import UserImportSerializer
+
+User = get_user_model()
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+IMPORT_BATCH_SIZE = 1000
+# Passwords sent to a hashing process at a time
+HASH_CHUNK_SIZE = 50
+
+
+def read_csv(lines):
+    for row in csv.DictReader(lines):
+        # Empty cells count as missing, subjects are separated by semicolons
+        row = {name: value for name, value in row.items() if name and value not in ('', None)}
+        if 'subjects' in row:
+            row['subjects'] = [name.strip() for name in row['subjects'].split(';') if name.strip()]
+        yield row
+
+
+def read_ndjson(lines):
+    for line in lines:
+        if not line.strip():
+            yield None
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield 'Invalid JSON'
+
+
+def read_rows(lines, import_format):
+    """Yields ``(line number, row)``, row is an error message when it can't be parsed"""
+    if import_format == 'csv':
+        # The header is line 1
+        return enumerate(read_csv(lines), start=2)
+    return ((number, row) for number, row in enumerate(read_ndjson(lines), start=1) if row is not None)
+
+
+def format_errors(errors):
+    return '; '.join(
+        f'{field}: {" ".join(str(message) for message in messages)}'
+        for field, messages in errors.items()
+    )
+
+
+def taken_emails(emails):
+    """Those of ``emails`` already used as the email or username of a user"""
+    taken = set()
+    for email, username in User.objects.filter(Q(email__in=emails) | Q(username__in=emails)).values_list(
+        'email', 'username'
+    ):
+        taken.update((email, username))
+    return taken & set(emails)
+
+
+def validate_batch(batch, subject_ids, seen_emails):
+    """Splits a batch into valid ``(line number, data)`` rows and ``(line number, message)`` errors"""
+    valid, errors = [], []
+    for number, row in batch:
+        if not isinstance(row, dict):
+            errors.append((number, row if isinstance(row, str) else 'Expected an object'))
+            continue
+        serializer = UserImportSerializer(data=row)
+        if not serializer.is_valid():
+            errors.append((number, format_errors(serializer.errors)))
+            continue
+        
+        data = serializer.validated_data
+        data['email'] = User.objects.normalize_email(data['email'])
+        unknown = [name for name in data['subjects'] if name not in subject_ids]
+        if unknown:
+            errors.append((number, f'subjects: Unknown subject {", ".join(unknown)}'))
+        elif data['email'] in seen_emails:
+            errors.append((number, f'email: {data["email"]} appears earlier in the file'))
+        else:
+            seen_emails.add(data['email'])
+            valid.append((number, data))
+    
+    taken = taken_emails([data['email'] for _, data in valid])
+    for number, data in valid:
+        if data['email'] in taken:
+            errors.append((number, f'email: A user with {data["email"]} already exists'))
+    return [(number, data) for number, data in valid if data['email'] not in taken], sorted(errors)
+
+
+def insert_batch(rows, password_hashes, subject_ids):
+    """Create the users, profiles and subject links of a batch, returns the tutor profile ids"""
+    users = []
+    for (_, data), password_hash in zip(rows, password_hashes):
+        user = User(
+            username=User.normalize_username(data['email']),
+            email=data['email'],
+            password=password_hash,
+            role=data['role'],
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+        )
+        users.append(user)
+    
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        students, tutors = [], []
+        for (_, data), user in zip(rows, users):
+            if user.role == 'student':
+                students.append(StudentProfile(user=user, grade_level=data.get('grade_level')))
+            else:
+                profile = TutorProfile(user=user, bio=data['bio'])
+                if data.get('hourly_rate') is not None:
+                    profile.hourly_rate = data['hourly_rate']
+                tutors.append((profile, data['subjects']))
+        
+        StudentProfile.objects.bulk_create(students)
+        TutorProfile.objects.bulk_create([profile for profile, _ in tutors])
+        Through = TutorProfile.subjects.through
+        Through.objects.bulk_create([
+            Through(tutorprofile_id=profile.id, subject_id=subject_ids[name])
+            for profile, names in tutors
+            for name in set(names)
+        ])
+        # bulk_create sends no post_save, so the search index is kept up here
+        tutor_ids = [profile.id for profile, _ in tutors]
+        search.index_tutors(tutor_ids)
+    return tutor_ids
+
+
+def batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_users(lines, import_format, batch_size=IMPORT_BATCH_SIZE, workers=None, on_error=None):
+    """
+    Import users from the lines of a CSV or NDJSON file, returns the number
+    of created users. ``on_error(line number, message)`` is called for every
+    rejected row; ``workers=0`` hashes in this process.
+    """
+    on_error = on_error or (lambda number, message: None)
+    subject_ids = dict(Subject.objects.values_list('name', 'id'))
+    seen_emails = set()
+    executor = ProcessPoolExecutor(workers, initializer=django.setup) if workers != 0 else None
+    created, tutors_created = 0, False
+    
+    def insert(rows, hashes):
+        nonlocal created, tutors_created
+        rows = list(zip(rows, hashes))
+        while rows:
+            try:
+                tutor_ids = insert_batch(
+                    [row for row, _ in rows], [password_hash for _, password_hash in rows], subject_ids
+                )
+            except IntegrityError as exc:
+                # Most likely emails registered since the batch was validated,
+                # their rows are rejected and the rest of the batch retried
+                taken = taken_emails([data['email'] for (_, data), _ in rows])
+                if not taken:
+                    for (number, _), _ in rows:
+                        on_error(number, f'Batch rejected by the database: {exc}')
+                    return
+                for (number, data), _ in rows:
+                    if data['email'] in taken:
+                        on_error(number, f'email: A user with {data["email"]} already exists')
+                rows = [((number, data), password_hash) for (number, data), password_hash in rows
+                        if data['email'] not in taken]
+                continue
+            created += len(rows)
+            tutors_created = tutors_created or bool(tutor_ids)
+            return
+    
+    pending = None
+    try:
+        for batch in batches(read_rows(lines, import_format), batch_size):
+            valid, errors = validate_batch(batch, subject_ids, seen_emails)
+            for number, message in errors:
+                on_error(number, message)
+            # Start hashing this batch, then insert the previous one meanwhile
+            passwords = [data['password'] for _, data in valid]
+            if executor:
+                hashes = executor.map(make_password, passwords, chunksize=HASH_CHUNK_SIZE)
+            else:
+                hashes = map(make_password, passwords)
+            if pending:
+                insert(*pending)
+            pending = (valid, hashes)
+        if pending:
+            insert(*pending)
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+    
+    if tutors_created:
+        bump_catalog_version()
+    return created
\ No newline at end of file
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from accounts.revocation import get_revocation_log
+
+
+class Command(BaseCommand):
+    help = 'Drop expired entries from the refresh-token revocation log'
+    
+    def handle(self, *args, **options):
+        kept, dropped = get_revocation_log().compact()
+        self.stdout.write(self.style.SUCCESS(f'Dropped {dropped} expired entries, kept {kept}'))
\ No newline at end of file
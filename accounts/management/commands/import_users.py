@@ -0,0 +1,45 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from accounts.imports import IMPORT_BATCH_SIZE, IMPORT_FORMATS, import_users
+
+
+class Command(BaseCommand):
+    help = 'Create students and tutors from a CSV or NDJSON file'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to read, - for stdin')
+        parser.add_argument('--format', dest='import_format', choices=IMPORT_FORMATS, help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, help='Hashing processes, defaults to the CPU count, 0 hashes inline')
+    
+    def handle(self, *args, **options):
+        path = options['path']
+        import_format = options['import_format'] or path.rsplit('.', 1)[-1].lower()
+        if import_format not in IMPORT_FORMATS:
+            raise CommandError('Pass --format, the file extension is neither csv nor ndjson')
+        
+        failed = 0
+        
+        def report(number, message):
+            nonlocal failed
+            failed += 1
+            self.stderr.write(f'line {number}: {message}')
+        
+        try:
+            lines = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        except OSError as exc:
+            raise CommandError(str(exc))
+        try:
+            created = import_users(
+                lines,
+                import_format,
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+                on_error=report
+            )
+        finally:
+            if lines is not sys.stdin:
+                lines.close()
+        
+        message = f'Imported {created} users, {failed} rows failed'
+        self.stdout.write(self.style.SUCCESS(message) if not failed else self.style.WARNING(message))
\ No newline at end of file
@@ -23,6 +23,7 @@ class StudentProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='student_profile')
     grade_level = models.CharField(max_length=50, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"Student: {self.user.email}"
@@ -38,6 +39,7 @@ class TutorProfile(models.Model):
     )
     subjects = models.ManyToManyField('tutoring.Subject', blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"Tutor: {self.user.email}"
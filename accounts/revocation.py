@@ -0,0 +1,187 @@
+"""
+Revocation of rotated refresh tokens.
+
+Revoked jtis are appended to a log file as ``<jti> <exp>`` lines. Each
+process keeps a Bloom filter of the log in memory and tails the file for
+lines other processes appended, so checking a token that was never revoked,
+the usual case, costs a stat() and a few bit lookups. Only a filter hit is
+confirmed against the log itself. Entries are useless once their token has
+expired, and compaction rewrites the log without them.
+"""
+import fcntl
+import hashlib
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+BLOOM_ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    """Set membership without false negatives in a fixed-size bit array"""
+    
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+    
+    def positions(self, item):
+        # Double hashing, k positions from the two halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+    
+    def add(self, item):
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+    
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(item))
+
+
+def entry_expiry(line):
+    # A line torn by a crash mid-write counts as expired
+    _, _, exp = line.partition(b' ')
+    return int(exp) if exp.isdigit() else 0
+
+
+class RevocationLog:
+    """Append-only log of revoked jtis, shared by every process through the file system"""
+    
+    def __init__(self, path, capacity=None, compact_bytes=None):
+        self.path = str(path)
+        self.lock_path = f'{self.path}.lock'
+        self.capacity = capacity or settings.TOKEN_REVOCATION_CAPACITY
+        self.compact_bytes = compact_bytes or settings.TOKEN_REVOCATION_COMPACT_BYTES
+        self.compact_at = self.compact_bytes
+        self.thread_lock = threading.RLock()
+        self.locked = False
+        self.inode = None
+        self.offset = 0
+        self.bloom = BloomFilter(self.capacity)
+    
+    @contextmanager
+    def exclusive(self):
+        """Serializes writers across threads and processes"""
+        with self.thread_lock:
+            # flock() would wait on the lock this thread already holds
+            if self.locked:
+                yield
+                return
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self.locked = True
+                try:
+                    yield
+                finally:
+                    self.locked = False
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def sync(self):
+        """Add the lines appended since the last call to the filter"""
+        with self.thread_lock:
+            try:
+                log = open(self.path, 'rb')
+            except FileNotFoundError:
+                return
+            with log:
+                stat = os.fstat(log.fileno())
+                if stat.st_ino != self.inode:
+                    # Compacted by some process, start over from the new file
+                    self.inode, self.offset = stat.st_ino, 0
+                    self.bloom = BloomFilter(self.capacity)
+                if stat.st_size <= self.offset:
+                    return
+                log.seek(self.offset)
+                data = log.read(stat.st_size - self.offset)
+            
+            # A line still being written is picked up by the next call
+            end = data.rfind(b'\n') + 1
+            for line in data[:end].splitlines():
+                self.bloom.add(line.split(b' ', 1)[0].decode())
+            self.offset += end
+    
+    def find(self, jti):
+        needle = f'{jti} '.encode()
+        try:
+            with open(self.path, 'rb') as log:
+                return any(line.startswith(needle) for line in log)
+        except FileNotFoundError:
+            return False
+    
+    def is_revoked(self, jti):
+        self.sync()
+        # Filter hits are rare, and may be false positives, so only they read the log
+        return jti in self.bloom and self.find(jti)
+    
+    def revoke(self, jti, exp):
+        """Revoke ``jti`` until ``exp``, returns False if it already was"""
+        with self.exclusive():
+            if self.is_revoked(jti):
+                return False
+            with open(self.path, 'ab') as log:
+                log.write(f'{jti} {int(exp)}\n'.encode())
+            self.sync()
+            if self.offset >= self.compact_at:
+                self.compact()
+        return True
+    
+    def compact(self, now=None):
+        """Rewrite the log without expired entries, returns how many were kept and dropped"""
+        now = time.time() if now is None else now
+        with self.exclusive():
+            try:
+                with open(self.path, 'rb') as log:
+                    lines = log.read().splitlines()
+            except FileNotFoundError:
+                return 0, 0
+            
+            live = [line for line in lines if entry_expiry(line) > now]
+            temporary = f'{self.path}.compact'
+            with open(temporary, 'wb') as log:
+                log.write(b''.join(line + b'\n' for line in live))
+                log.flush()
+                os.fsync(log.fileno())
+            os.replace(temporary, self.path)
+            
+            self.sync()
+            # Don't compact again until the live entries have had room to grow
+            self.compact_at = max(self.compact_bytes, 2 * self.offset)
+        return len(live), len(lines) - len(live)
+
+
+_logs = {}
+
+
+def get_revocation_log():
+    path = str(settings.TOKEN_REVOCATION_LOG)
+    if path not in _logs:
+        _logs[path] = RevocationLog(path)
+    return _logs[path]
+
+
+class RevocableRefreshToken(RefreshToken):
+    """
+    RefreshToken checked against the revocation log. ``blacklist()`` is what
+    TokenRefreshSerializer calls on the old token when BLACKLIST_AFTER_ROTATION
+    is set, so every rotated token is revoked.
+    """
+    
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        if get_revocation_log().is_revoked(self[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+    
+    def blacklist(self):
+        # Two refreshes racing with the same token, only the first one rotates it
+        if not get_revocation_log().revoke(self[api_settings.JTI_CLAIM], self['exp']):
+            raise TokenError(_('Token is blacklisted'))
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""OpenAPI extensions for drf-spectacular, loaded from AccountsConfig.ready()"""
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    target_class = 'accounts.authentication.StatelessJWTAuthentication'
\ No newline at end of file
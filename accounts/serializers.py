@@ -1,7 +1,15 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
+from .authentication import add_profile_claims
+from .cache import invalidate_profile_snapshots
 from .models import StudentProfile, TutorProfile
+from .revocation import RevocableRefreshToken
 from tutoring.models import Subject
 
 User = get_user_model()
@@ -29,11 +37,18 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop('password_confirm')
         password = validated_data.pop('password')
+        # RegisterView hashes in the hashing pool and passes the result
+        password_hash = validated_data.pop('password_hash', None) or make_password(password)
         
         # Set username to email for compatibility
         validated_data['username'] = validated_data['email']
         
-        user = User.objects.create_user(password=password, **validated_data)
+        # What create_user does, minus the hashing
+        user = User(**validated_data)
+        user.email = User.objects.normalize_email(user.email)
+        user.username = User.normalize_username(user.username)
+        user.password = password_hash
+        user.save()
         
         # Create corresponding profile based on role
         if user.role == 'student':
@@ -44,6 +59,49 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
+class UserImportSerializer(serializers.Serializer):
+    """One row of the import_users command"""
+    email = serializers.EmailField()
+    password = serializers.CharField(validators=[validate_password])
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    
+    # Student fields
+    grade_level = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    
+    # Tutor fields
+    bio = serializers.CharField(required=False, allow_blank=True, default='')
+    hourly_rate = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    subjects = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Adds the role and profile id claims read by StatelessJWTAuthentication"""
+    
+    @classmethod
+    def get_token(cls, user):
+        return add_profile_claims(super().get_token(user), user)
+    
+    @classmethod
+    def tokens_for(cls, user):
+        """Login response for a user whose password was already checked"""
+        refresh = cls.get_token(user)
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        return {'refresh': str(refresh), 'access': str(refresh.access_token)}
+
+
+class LoginSerializer(serializers.Serializer):
+    email = serializers.CharField()
+    password = serializers.CharField(write_only=True)
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """Rejects revoked refresh tokens and revokes the old one on rotation"""
+    token_class = RevocableRefreshToken
+
+
 class StudentProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = StudentProfile
@@ -69,6 +127,34 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'email', 'role']
 
 
+def apply_changes(obj, validated_data, fields):
+    """Set the given fields whose value differs, returns their names"""
+    changed = []
+    for field in fields:
+        if field not in validated_data:
+            continue
+        # Compared as the column's Python type, an unsaved object may still hold a string
+        current = obj._meta.get_field(field).to_python(getattr(obj, field))
+        if current != validated_data[field]:
+            setattr(obj, field, validated_data[field])
+            changed.append(field)
+    return changed
+
+
+def update_subjects(profile, subject_ids):
+    """Add and remove only the subject links that differ, returns whether any did"""
+    current = set(profile.subjects.values_list('id', flat=True))
+    wanted = set(subject_ids)
+    # Unknown ids are ignored, only the new ones need checking
+    added = set(Subject.objects.filter(id__in=wanted - current).values_list('id', flat=True))
+    removed = current - wanted
+    if added:
+        profile.subjects.add(*added)
+    if removed:
+        profile.subjects.remove(*removed)
+    return bool(added or removed)
+
+
 class ProfileUpdateSerializer(serializers.Serializer):
     first_name = serializers.CharField(max_length=150, required=False)
     last_name = serializers.CharField(max_length=150, required=False)
@@ -86,31 +172,32 @@ class ProfileUpdateSerializer(serializers.Serializer):
     )
     
     def update(self, instance, validated_data):
-        # Update user fields
-        if 'first_name' in validated_data:
-            instance.first_name = validated_data['first_name']
-        if 'last_name' in validated_data:
-            instance.last_name = validated_data['last_name']
-        instance.save()
-        
-        # Update profile based on role
-        if instance.role == 'student' and hasattr(instance, 'student_profile'):
-            profile = instance.student_profile
-            if 'grade_level' in validated_data:
-                profile.grade_level = validated_data['grade_level']
-                profile.save()
-        
-        elif instance.role == 'tutor' and hasattr(instance, 'tutor_profile'):
-            profile = instance.tutor_profile
-            if 'bio' in validated_data:
-                profile.bio = validated_data['bio']
-            if 'hourly_rate' in validated_data:
-                profile.hourly_rate = validated_data['hourly_rate']
+        with transaction.atomic():
+            changed = False
+            
+            # Update user fields
+            user_fields = apply_changes(instance, validated_data, ['first_name', 'last_name'])
+            if user_fields:
+                instance.save(update_fields=user_fields)
+                changed = True
+            
+            # Update profile based on role
+            profile, profile_fields = None, []
+            if instance.role == 'student' and hasattr(instance, 'student_profile'):
+                profile = instance.student_profile
+                profile_fields = apply_changes(profile, validated_data, ['grade_level'])
             
-            if 'subject_ids' in validated_data:
-                subjects = Subject.objects.filter(id__in=validated_data['subject_ids'])
-                profile.subjects.set(subjects)
+            elif instance.role == 'tutor' and hasattr(instance, 'tutor_profile'):
+                profile = instance.tutor_profile
+                profile_fields = apply_changes(profile, validated_data, ['bio', 'hourly_rate'])
+                
+                if 'subject_ids' in validated_data:
+                    changed |= update_subjects(profile, validated_data['subject_ids'])
             
-            profile.save()
+            if profile_fields:
+                profile.save(update_fields=[*profile_fields, 'updated_at'])
+                changed = True
         
+        if changed:
+            invalidate_profile_snapshots([instance.pk])
         return instance
\ No newline at end of file
@@ -0,0 +1,97 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from tutoring.models import Subject
+from .authentication import set_user_inactive
+from .cache import invalidate_profile_snapshots
+from .models import User, StudentProfile, TutorProfile
+
+PROFILE_USER_FIELDS = {'first_name', 'last_name', 'email'}
+
+
+@receiver(post_save, sender=User)
+def touch_profile(sender, instance, created=False, update_fields=None, **kwargs):
+    """Keep the profile's updated_at in step with the user fields it shows"""
+    if created:
+        return
+    if update_fields is not None and not PROFILE_USER_FIELDS.intersection(update_fields):
+        return
+    
+    if instance.role == 'student':
+        StudentProfile.objects.filter(user=instance).update(updated_at=timezone.now())
+    elif instance.role == 'tutor':
+        TutorProfile.objects.filter(user=instance).update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=TutorProfile.subjects.through)
+def touch_tutor_subjects(sender, instance, action, reverse, pk_set=None, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            TutorProfile.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+        return
+    
+    # Changed from the subject side, pk_set holds tutor ids
+    if action in ('post_add', 'post_remove'):
+        tutors = TutorProfile.objects.filter(id__in=pk_set)
+    elif action == 'pre_clear':
+        tutors = TutorProfile.objects.filter(subjects=instance)
+    else:
+        return
+    tutors.update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Subject)
+def touch_subject_tutors(sender, instance, **kwargs):
+    """Deleting a subject drops its tutor links by cascade, without m2m_changed"""
+    TutorProfile.objects.filter(subjects=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    # Also on creation, a recycled id must not find an old snapshot
+    invalidate_profile_snapshots([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def track_inactive_user(sender, instance, **kwargs):
+    # Tokens authenticated from their claims never see the user row
+    set_user_inactive(instance.pk, not instance.is_active)
+
+
+@receiver(post_delete, sender=User)
+def track_deleted_user(sender, instance, **kwargs):
+    set_user_inactive(instance.pk, True)
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+@receiver(post_save, sender=TutorProfile)
+@receiver(post_delete, sender=TutorProfile)
+def invalidate_profile_snapshot(sender, instance, **kwargs):
+    invalidate_profile_snapshots([instance.user_id])
+
+
+@receiver(m2m_changed, sender=TutorProfile.subjects.through)
+def invalidate_tutor_subject_snapshots(sender, instance, action, reverse, pk_set=None, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_profile_snapshots([instance.user_id])
+        return
+    
+    if action in ('post_add', 'post_remove'):
+        tutors = TutorProfile.objects.filter(id__in=pk_set)
+    elif action == 'pre_clear':
+        tutors = TutorProfile.objects.filter(subjects=instance)
+    else:
+        return
+    invalidate_profile_snapshots(tutors.values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=Subject)
+@receiver(pre_delete, sender=Subject)
+def invalidate_subject_snapshots(sender, instance, created=False, **kwargs):
+    """Tutor snapshots show subject names, and deletions cascade without m2m_changed"""
+    if not created:
+        invalidate_profile_snapshots(
+            TutorProfile.objects.filter(subjects=instance).values_list('user_id', flat=True)
+        )
@@ -1,11 +1,10 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
-from .views import RegisterView, LoginView, me_view, update_profile_view
+from .views import RegisterView, LoginView, RefreshView, hashing_stats_view, me_view
 
 urlpatterns = [
     path('auth/register/', RegisterView.as_view(), name='register'),
     path('auth/login/', LoginView.as_view(), name='login'),
-    path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/refresh/', RefreshView.as_view(), name='token_refresh'),
+    path('auth/hashing-stats/', hashing_stats_view, name='hashing-stats'),
     path('me/', me_view, name='me'),
-    path('me/', update_profile_view, name='update_profile'),
 ]
\ No newline at end of file
@@ -1,48 +1,170 @@
-from rest_framework import status, generics
+import inspect
+from asgiref.sync import sync_to_async
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import serializers, status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework.views import APIView
+from rest_framework_simplejwt.views import TokenRefreshView
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from picourse.conditional import conditional_response, set_validators
+from picourse.idempotency import idempotent
+from .cache import get_profile_snapshot
+from .hashing import HashingPoolFull, get_hashing_pool
 from .serializers import (
     UserRegistrationSerializer, 
     UserProfileSerializer, 
-    ProfileUpdateSerializer
+    ProfileUpdateSerializer,
+    ClaimsTokenObtainPairSerializer,
+    LoginSerializer,
+    RevocableTokenRefreshSerializer
 )
 
 User = get_user_model()
 
 
-class RegisterView(generics.CreateAPIView):
-    queryset = User.objects.all()
-    serializer_class = UserRegistrationSerializer
+class PasswordHashingView(APIView):
+    # Async base of the views that hash passwords. The hashing runs in the
+    # bounded pool of accounts/hashing.py and a full pool answers 503, so
+    # sign-in bursts can't take every worker away from the rest of the API.
+    # DRF's dispatch is synchronous, this one awaits the handler and runs
+    # the rest of DRF's request cycle unchanged.
+    authentication_classes = []
     permission_classes = [AllowAny]
     
-    def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            response = handler(request, *args, **kwargs)
+            # OPTIONS is answered by DRF's own synchronous handler
+            if inspect.isawaitable(response):
+                response = await response
+        except HashingPoolFull:
+            response = Response(
+                {'detail': 'Too many sign-ins in progress, try again shortly.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': '1'}
+            )
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class RegisterView(PasswordHashingView):
+    serializer_class = UserRegistrationSerializer
+    
+    @extend_schema(
+        request=UserRegistrationSerializer,
+        responses={201: inline_serializer('Registration', {
+            'message': serializers.CharField(),
+            'user': UserProfileSerializer(),
+        })}
+    )
+    async def post(self, request):
+        serializer = UserRegistrationSerializer(data=request.data)
+        if not await sync_to_async(serializer.is_valid)():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        password_hash = await get_hashing_pool().run(make_password, serializer.validated_data['password'])
+        user = await sync_to_async(serializer.save)(password_hash=password_hash)
         
+        profile = await sync_to_async(lambda: UserProfileSerializer(user).data)()
         return Response({
             'message': 'User registered successfully',
-            'user': UserProfileSerializer(user).data
+            'user': profile
         }, status=status.HTTP_201_CREATED)
 
 
-class LoginView(TokenObtainPairView):
+class LoginView(PasswordHashingView):
+    serializer_class = LoginSerializer
+    
+    @extend_schema(
+        request=LoginSerializer,
+        responses={200: inline_serializer('TokenPair', {
+            'refresh': serializers.CharField(),
+            'access': serializers.CharField(),
+        })}
+    )
+    async def post(self, request):
+        serializer = LoginSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        email = serializer.validated_data['email']
+        password = serializer.validated_data['password']
+        
+        pool = get_hashing_pool()
+        user = await User.objects.filter(email=email).afirst()
+        if user is None or not user.is_active:
+            # Hash anyway, so unknown emails take as long as wrong passwords
+            await pool.run(make_password, password)
+            return self.no_active_account()
+        
+        # The setter is called when the stored hash uses outdated parameters
+        upgrades = []
+        if not await pool.run(check_password, password, user.password, upgrades.append):
+            return self.no_active_account()
+        if upgrades:
+            user.password = await pool.run(make_password, password)
+            await user.asave(update_fields=['password'])
+        
+        tokens = await sync_to_async(ClaimsTokenObtainPairSerializer.tokens_for)(user)
+        return Response(tokens)
+    
+    def no_active_account(self):
+        return Response(
+            {'detail': 'No active account found with the given credentials'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+
+class RefreshView(TokenRefreshView):
     permission_classes = [AllowAny]
+    serializer_class = RevocableTokenRefreshSerializer
 
 
+@extend_schema(responses=inline_serializer('HashingStats', {
+    'workers': serializers.IntegerField(),
+    'queue_size': serializers.IntegerField(),
+    'queued': serializers.IntegerField(),
+    'peak_queued': serializers.IntegerField(),
+    'active': serializers.IntegerField(),
+    'completed': serializers.IntegerField(),
+    'rejected': serializers.IntegerField(),
+}))
 @api_view(['GET'])
+@permission_classes([IsAdminUser])
+def hashing_stats_view(request):
+    """Password hashing pool load, for staff"""
+    return Response(get_hashing_pool().stats())
+
+
+@api_view(['GET', 'PATCH'])
 @permission_classes([IsAuthenticated])
 def me_view(request):
-    """Get current user profile"""
-    serializer = UserProfileSerializer(request.user)
-    return Response(serializer.data)
+    """Get or update current user profile"""
+    if request.method == 'PATCH':
+        return update_profile_view(request)
+    
+    snapshot = get_profile_snapshot(request.user)
+    etag, last_modified = snapshot['etag'], snapshot['last_modified']
+    response = conditional_response(request, etag, last_modified)
+    if response is None:
+        response = Response(snapshot['data'])
+    return set_validators(response, etag, last_modified)
 
 
-@api_view(['PATCH'])
-@permission_classes([IsAuthenticated])
+@idempotent('profile')
 def update_profile_view(request):
     """Update current user profile"""
     serializer = ProfileUpdateSerializer(request.user, data=request.data, partial=True)
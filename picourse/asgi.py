@@ -13,4 +13,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'picourse.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after setup, the event stream reads settings
+from tutoring.events import EVENTS_PATH, events_app  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # Event streams bypass Django so idle connections don't hold a thread
+    if scope['type'] == 'http' and scope['path'] == EVENTS_PATH:
+        await events_app(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
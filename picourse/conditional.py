@@ -0,0 +1,47 @@
+"""
+Conditional GET helpers.
+
+Views compute an ETag and a Last-Modified date from cheap metadata (an
+``updated_at`` column, a row count) and answer ``If-None-Match`` /
+``If-Modified-Since`` with a 304 before building the response body.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """Strong ETag over the given metadata values"""
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def conditional_response(request, etag=None, last_modified=None):
+    """Returns a 304 (or 412) response when a precondition applies, else None"""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag=None, last_modified=None):
+    if etag and not response.has_header('ETag'):
+        response['ETag'] = etag
+    if last_modified and not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+class ConditionalGetMixin:
+    """Answers conditional GETs before the view evaluates its queryset"""
+    
+    def get_validators(self, request, *args, **kwargs):
+        """Return ``(etag, last_modified)``, either can be None"""
+        raise NotImplementedError
+    
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, *args, **kwargs)
+        response = conditional_response(request, etag, last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            set_validators(response, etag, last_modified)
+        return response
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Idempotency-Key support for write endpoints.
+
+The first response to a request carrying an ``Idempotency-Key`` header is
+stored, compressed, in the 'idempotency' cache for the cache's TTL. A retry
+with the same key and body gets that response back without running the view.
+A lock taken with ``cache.add`` makes concurrent duplicates wait for the
+first one to finish instead of running alongside it.
+"""
+import hashlib
+import json
+import time
+import zlib
+from functools import wraps
+
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+IDEMPOTENCY_CACHE = 'idempotency'
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+# A request holding the lock longer than this is considered dead
+LOCK_TIMEOUT = 30
+# How long a duplicate waits for the first request before giving up
+LOCK_WAIT = 5
+LOCK_POLL_INTERVAL = 0.05
+
+
+def request_fingerprint(request):
+    digest = hashlib.sha256()
+    for part in (request.method, request.path, request.content_type):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def pack_response(fingerprint, response):
+    body = json.dumps(response.data, cls=JSONEncoder).encode()
+    return (fingerprint, response.status_code, zlib.compress(body))
+
+
+def unpack_response(record):
+    _, status_code, body = record
+    response = Response(json.loads(zlib.decompress(body)), status=status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def replay_or_reject(record, fingerprint):
+    if record[0] != fingerprint:
+        return Response(
+            {'detail': f'{IDEMPOTENCY_HEADER} was already used for a different request.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return unpack_response(record)
+
+
+def idempotent(scope):
+    """
+    Decorates a view handler taking ``request`` first. Keys are scoped per
+    user and per ``scope``; requests without the header run as usual.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(request, *args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not key or not request.user.is_authenticated:
+                return handler(request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return Response(
+                    {'detail': f'{IDEMPOTENCY_HEADER} can be at most {MAX_KEY_LENGTH} characters.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            cache = caches[IDEMPOTENCY_CACHE]
+            key_hash = hashlib.sha256(key.encode()).hexdigest()
+            cache_key = f'idempotency:{scope}:{request.user.pk}:{key_hash}'
+            lock_key = f'{cache_key}:lock'
+            fingerprint = request_fingerprint(request)
+            
+            record = cache.get(cache_key)
+            if record is not None:
+                return replay_or_reject(record, fingerprint)
+            
+            # Only one request per key runs, duplicates wait for its response
+            deadline = time.monotonic() + LOCK_WAIT
+            while not cache.add(lock_key, fingerprint, LOCK_TIMEOUT):
+                if time.monotonic() >= deadline:
+                    return Response(
+                        {'detail': f'A request with this {IDEMPOTENCY_HEADER} is still in progress.'},
+                        status=status.HTTP_409_CONFLICT
+                    )
+                time.sleep(LOCK_POLL_INTERVAL)
+                record = cache.get(cache_key)
+                if record is not None:
+                    return replay_or_reject(record, fingerprint)
+            
+            try:
+                # The first request may have finished between the lookup and the lock
+                record = cache.get(cache_key)
+                if record is not None:
+                    return replay_or_reject(record, fingerprint)
+                
+                response = handler(request, *args, **kwargs)
+                # Server errors aren't stored, the client may retry them
+                if response.status_code < 500 and hasattr(response, 'data'):
+                    cache.set(cache_key, pack_response(fingerprint, response))
+                return response
+            finally:
+                cache.delete(lock_key)
+        return wrapper
+    return decorator
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+Token-bucket rate limiting in front of the whole app.
+
+Buckets live in a memory-mapped file shared by every worker on the host,
+``RATE_LIMIT_FILE``, which defaults to one in /dev/shm so it never touches
+a disk, named after the checkout and the OS user so separate deployments on
+one host don't share (or fight over) a table. The file is a fixed table of
+sets of ``WAYS`` slots, each holding the hash of a bucket key, its tokens
+and when it was last updated. A key only ever lives in its own set, and a
+set is locked with a byte-range lock for the few microseconds it takes to
+refill and take a token, so workers don't serialize on one lock and no
+request does a network round trip.
+
+The middleware runs before sessions and authentication. Identities come
+from the client address or the user id claim of the access token, so a
+rejected request costs no database work.
+"""
+import fcntl
+import hashlib
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+logger = logging.getLogger(__name__)
+
+# Key hash, tokens left and last update of one bucket
+SLOT = struct.Struct('<Qdd')
+WAYS = 4
+LOCK_STRIPES = 64
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """Requests per second of a DRF-style rate such as '10/min'"""
+    count, period = rate.split('/')
+    return int(count) / PERIODS[period[0]]
+
+
+class BucketTable:
+    def __init__(self, path, slots):
+        self.sets = max(1, slots // WAYS)
+        size = self.sets * WAYS * SLOT.size
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self.fd).st_size < size:
+            os.ftruncate(self.fd, size)
+        self.map = mmap.mmap(self.fd, size)
+        # Byte-range locks are held per process, threads also need their own
+        self.locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+    
+    def take(self, key, rate, burst, now=None):
+        """Take a token from the bucket of ``key``, returns 0 or the seconds until one is available"""
+        now = time.time() if now is None else now
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+        index = digest % self.sets
+        start = index * WAYS * SLOT.size
+        length = WAYS * SLOT.size
+        
+        with self.locks[index % LOCK_STRIPES]:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, length, start)
+            try:
+                slot, oldest = None, None
+                for position in range(start, start + length, SLOT.size):
+                    stored, tokens, updated = SLOT.unpack_from(self.map, position)
+                    if stored == digest:
+                        slot = position
+                        break
+                    if oldest is None or updated < oldest[1]:
+                        oldest = (position, updated)
+                if slot is None:
+                    # New keys take the empty or least recently used slot of the set
+                    slot, tokens, updated = oldest[0], burst, now
+                
+                tokens = min(burst, tokens + max(0, now - updated) * rate)
+                wait = 0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / rate
+                SLOT.pack_into(self.map, slot, digest, tokens, now)
+            finally:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN, length, start)
+        return wait
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def default_bucket_path():
+    # One table per checkout and OS user, another user couldn't open this one's file
+    digest = hashlib.blake2b(f'{settings.BASE_DIR}:{os.getuid()}'.encode(), digest_size=6).hexdigest()
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(directory, f'picourse-ratelimit-{digest}')
+
+
+def get_bucket_table():
+    """The shared bucket table, or None when its file can't be opened"""
+    path = settings.RATE_LIMIT_FILE or default_bucket_path()
+    with _tables_lock:
+        if path not in _tables:
+            try:
+                _tables[path] = BucketTable(path, settings.RATE_LIMIT_SLOTS)
+            except OSError:
+                # Failing open: an unusable table must not take the whole API down
+                logger.exception('Cannot open the rate limit table %s, requests are not rate limited', path)
+                _tables[path] = None
+    return _tables[path]
+
+
+def client_ip(request):
+    # With N trusted proxies in front, the client is the Nth address from the right
+    proxies = settings.RATE_LIMIT_TRUSTED_PROXIES
+    if proxies:
+        forwarded = [part.strip() for part in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')]
+        forwarded = [part for part in forwarded if part]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def user_identity(request):
+    """User id from the access token, without a database query, or the client address"""
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if header.startswith('Bearer '):
+        try:
+            return f'user:{AccessToken(header[len("Bearer "):])[api_settings.USER_ID_CLAIM]}'
+        except (TokenError, KeyError):
+            pass
+    return f'ip:{client_ip(request)}'
+
+
+def match_policy(request):
+    """First policy of RATE_LIMITS matching the request's path, method and query parameters"""
+    for policy in settings.RATE_LIMITS:
+        if policy.get('methods') and request.method not in policy['methods']:
+            continue
+        if any(param not in request.GET for param in policy.get('params', ())):
+            continue
+        if re.match(policy['path'], request.path_info):
+            return policy
+    return None
+
+
+class RateLimitMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        if settings.RATE_LIMIT_ENABLED:
+            policy = match_policy(request)
+            if policy is not None:
+                if policy.get('identity') == 'user':
+                    identity = user_identity(request)
+                else:
+                    identity = f'ip:{client_ip(request)}'
+                table = get_bucket_table()
+                wait = table and table.take(
+                    f"{policy['name']}:{identity}", parse_rate(policy['rate']), policy['burst']
+                )
+                if wait:
+                    response = JsonResponse(
+                        {'detail': f'Request was throttled. Expected available in {math.ceil(wait)} seconds.'},
+                        status=429
+                    )
+                    response['Retry-After'] = str(math.ceil(wait))
+                    return response
+        return self.get_response(request)
\ No newline at end of file
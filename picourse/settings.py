@@ -48,6 +48,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Before anything that can touch the database
+    'picourse.ratelimit.RateLimitMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -77,6 +79,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'picourse.wsgi.application'
 
+# Applies the settings the test suite runs with, see picourse/test_runner.py
+TEST_RUNNER = 'picourse.test_runner.TestRunner'
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -89,6 +94,95 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The catalog cache holds rendered tutor/subject listings, the idempotency
+# cache the responses replayed to retries carrying an Idempotency-Key, the
+# profile cache the /me snapshots of accounts/cache.py.
+# LocMemCache is an in-process LRU and is only safe with a single worker, use
+# FileBasedCache or RedisCache when several processes serve the API.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'catalog': {
+        'BACKEND': config('CATALOG_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CATALOG_CACHE_LOCATION', default='picourse-catalog'),
+        'TIMEOUT': config('CATALOG_CACHE_TIMEOUT', default=300, cast=int),
+    },
+    'idempotency': {
+        'BACKEND': config('IDEMPOTENCY_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('IDEMPOTENCY_CACHE_LOCATION', default='picourse-idempotency'),
+        'TIMEOUT': config('IDEMPOTENCY_KEY_TTL', default=86400, cast=int),
+    },
+    'profile': {
+        'BACKEND': config('PROFILE_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('PROFILE_CACHE_LOCATION', default='picourse-profile'),
+        'TIMEOUT': config('PROFILE_CACHE_TIMEOUT', default=3600, cast=int),
+    },
+    # Deactivated users, must be shared by all workers for tokens to stop
+    # working everywhere
+    'auth': {
+        'BACKEND': config('AUTH_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('AUTH_CACHE_LOCATION', default='picourse-auth'),
+        'TIMEOUT': None,
+    },
+}
+
+
+# Lesson requests that ended this many days ago are moved to the archive
+# table by the archive_lesson_requests command
+LESSON_REQUEST_RETENTION_DAYS = config('LESSON_REQUEST_RETENTION_DAYS', default=365, cast=int)
+# Tombstones of deleted lesson requests are kept this long for the sync feed,
+# clients that haven't synced for longer have to sync again from scratch
+LESSON_REQUEST_TOMBSTONE_RETENTION_DAYS = config('LESSON_REQUEST_TOMBSTONE_RETENTION_DAYS', default=30, cast=int)
+
+
+# Backend delivering lesson-request events to the /api/events/ streams. The
+# local backend only reaches streams served by the same process, use
+# tutoring.events.RedisBackend when several ASGI workers run
+LESSON_EVENTS_BACKEND = config('LESSON_EVENTS_BACKEND', default='tutoring.events.LocalBackend')
+LESSON_EVENTS_REDIS_URL = config('LESSON_EVENTS_REDIS_URL', default='redis://localhost:6379/0')
+
+
+# Append-only log of the refresh tokens revoked on rotation, see
+# accounts/revocation.py. Every process serving the API must see the same
+# file. It is compacted once it grows past TOKEN_REVOCATION_COMPACT_BYTES.
+TOKEN_REVOCATION_LOG = config('TOKEN_REVOCATION_LOG', default=str(BASE_DIR / 'revoked_tokens.log'))
+TOKEN_REVOCATION_CAPACITY = config('TOKEN_REVOCATION_CAPACITY', default=1000000, cast=int)
+TOKEN_REVOCATION_COMPACT_BYTES = config('TOKEN_REVOCATION_COMPACT_BYTES', default=16 * 1024 * 1024, cast=int)
+
+
+# Login and registration hash passwords in a pool of this many threads, see
+# accounts/hashing.py. When more than PASSWORD_HASHING_QUEUE_SIZE hashes are
+# waiting, new sign-ins get a 503 until the burst drains.
+PASSWORD_HASHING_WORKERS = config('PASSWORD_HASHING_WORKERS', default=4, cast=int)
+PASSWORD_HASHING_QUEUE_SIZE = config('PASSWORD_HASHING_QUEUE_SIZE', default=64, cast=int)
+
+
+# Token-bucket rate limits, see picourse/ratelimit.py. Buckets are shared by
+# the workers of one host through RATE_LIMIT_FILE (a file in /dev/shm when
+# empty). The first policy whose path regex, methods and query parameters
+# match a request applies; 'identity': 'user' keys buckets by the access
+# token's user id and falls back to the client address. TEST_RUNNER turns
+# it off while the test suite runs.
+RATE_LIMIT_ENABLED = config('RATE_LIMIT_ENABLED', default=True, cast=bool)
+RATE_LIMIT_FILE = config('RATE_LIMIT_FILE', default='')
+RATE_LIMIT_SLOTS = config('RATE_LIMIT_SLOTS', default=65536, cast=int)
+# Proxies appending to X-Forwarded-For in front of the app, 0 trusts REMOTE_ADDR
+RATE_LIMIT_TRUSTED_PROXIES = config('RATE_LIMIT_TRUSTED_PROXIES', default=0, cast=int)
+RATE_LIMITS = [
+    {'name': 'login', 'path': r'^/api/auth/(login|register)/$', 'methods': ['POST'], 'rate': '10/min', 'burst': 5},
+    {'name': 'refresh', 'path': r'^/api/auth/refresh/$', 'methods': ['POST'], 'rate': '30/min', 'burst': 10},
+    {
+        'name': 'tutor-search', 'path': r'^/api/tutors/$', 'params': ['search'],
+        'rate': '60/min', 'burst': 20, 'identity': 'user',
+    },
+    {'name': 'api', 'path': r'^/api/', 'rate': '600/min', 'burst': 100, 'identity': 'user'},
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -136,8 +230,10 @@ AUTH_USER_MODEL = 'accounts.User'
 
 # Rest Framework Configuration
 REST_FRAMEWORK = {
+    # JWTAuthentication that trusts the token's role claims on views with
+    # stateless_auth = True, see accounts/authentication.py
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -152,6 +248,7 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
+    # Rotated tokens are revoked in accounts.revocation, not token_blacklist
     'BLACKLIST_AFTER_ROTATION': True,
 }
 
@@ -0,0 +1,18 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runs the suite with rate limiting off, every test client request comes
+    from the same address. tests/test_ratelimit.py turns it back on.
+    """
+    
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.test_settings = override_settings(RATE_LIMIT_ENABLED=False)
+        self.test_settings.enable()
+    
+    def teardown_test_environment(self, **kwargs):
+        self.test_settings.disable()
+        super().teardown_test_environment(**kwargs)
\ No newline at end of file
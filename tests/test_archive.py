@@ -0,0 +1,114 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from tutoring.archive import archive_chunk, retention_cutoff
+from tutoring.models import Subject, LessonRequest, ArchivedLessonRequest, LessonRequestTombstone
+from accounts.models import TutorProfile, StudentProfile
+
+User = get_user_model()
+
+
+class ArchiveTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student)
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        TutorProfile.objects.create(user=self.tutor)
+        
+        now = timezone.now()
+        # Five lessons that ended two years ago, three upcoming ones
+        self.old = [self.create(now - timedelta(days=730, hours=index), 'approved') for index in range(5)]
+        self.recent = [self.create(now + timedelta(days=index + 1)) for index in range(3)]
+    
+    def create(self, start_time, status='pending'):
+        return LessonRequest.objects.create(
+            student=self.student,
+            tutor=self.tutor,
+            subject=self.subject,
+            start_time=start_time,
+            duration_minutes=60,
+            status=status
+        )
+    
+    def test_command_moves_old_requests_in_chunks(self):
+        """Test that finished requests past the retention window are moved, ids kept"""
+        out = StringIO()
+        call_command('archive_lesson_requests', '--days=365', '--chunk-size=2', stdout=out)
+        
+        self.assertIn('Archived 5 lesson requests', out.getvalue())
+        self.assertEqual(out.getvalue().count('last id'), 3)
+        self.assertEqual(
+            sorted(ArchivedLessonRequest.objects.values_list('id', flat=True)),
+            sorted(lesson.id for lesson in self.old)
+        )
+        self.assertEqual(
+            sorted(LessonRequest.objects.values_list('id', flat=True)),
+            sorted(lesson.id for lesson in self.recent)
+        )
+        archived = ArchivedLessonRequest.objects.get(id=self.old[0].id)
+        self.assertEqual(archived.end_time, self.old[0].end_time)
+        self.assertEqual(archived.status, 'approved')
+        # Archived requests aren't deleted for sync clients
+        self.assertFalse(LessonRequestTombstone.objects.exists())
+    
+    def test_chunks_resume_after_id(self):
+        """Test that a chunk starts after the given id and an interrupted chunk can be redone"""
+        cutoff = retention_cutoff(365)
+        ids = sorted(lesson.id for lesson in self.old)
+        self.assertEqual(archive_chunk(cutoff, after_id=ids[2], chunk_size=10), ids[3:])
+        
+        # A copy left behind by an interrupted run doesn't block the move
+        ArchivedLessonRequest.objects.create(
+            **LessonRequest.objects.filter(id=ids[0]).values(
+                'id', 'student_id', 'tutor_id', 'subject_id', 'start_time', 'duration_minutes',
+                'end_time', 'status', 'note', 'created_at', 'updated_at'
+            ).get()
+        )
+        self.assertEqual(archive_chunk(cutoff, chunk_size=10), ids[:3])
+        self.assertEqual(ArchivedLessonRequest.objects.count(), 5)
+    
+    def test_include_archived_listing(self):
+        """Test that include_archived lists both tables in every pagination mode"""
+        call_command('archive_lesson_requests', '--days=365', stdout=StringIO())
+        self.client.force_authenticate(user=self.student)
+        url = reverse('lesson-request-list-create')
+        
+        response = self.client.get(url)
+        self.assertEqual(response.data['count'], 3)
+        
+        response = self.client.get(url, {'include_archived': '1'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 8)
+        self.assertEqual(response.data['results'][-1]['id'], self.old[0].id)
+        self.assertEqual(response.data['results'][-1]['tutor_name'], 'tutor@test.com')
+        
+        seen = []
+        response = self.client.get(url, {'include_archived': '1', 'paginate': 'cursor', 'limit': 3})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen += [row['id'] for row in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(sorted(seen), sorted(lesson.id for lesson in self.old + self.recent))
+        self.assertEqual(len(seen), 8)
\ No newline at end of file
@@ -0,0 +1,131 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from drf_spectacular.generators import SchemaGenerator
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject, LessonRequest
+from accounts.models import TutorProfile, StudentProfile
+
+User = get_user_model()
+
+
+class StatelessAuthenticationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        self.student_profile = StudentProfile.objects.create(user=self.student)
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        TutorProfile.objects.create(user=self.tutor)
+        
+        LessonRequest.objects.create(
+            student=self.student,
+            tutor=self.tutor,
+            subject=self.subject,
+            start_time='2025-09-01T10:00:00Z',
+            duration_minutes=60
+        )
+    
+    def login(self, email):
+        response = self.client.post(reverse('login'), {'email': email, 'password': 'TestPass123!'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['access']
+    
+    def test_login_adds_role_and_profile_claims(self):
+        """Test that access tokens carry the role and profile ids"""
+        token = AccessToken(self.login('student@test.com'))
+        self.assertEqual(token['role'], 'student')
+        self.assertEqual(token['student_profile_id'], self.student_profile.id)
+        self.assertIsNone(token['tutor_profile_id'])
+    
+    def test_listing_skips_the_user_query(self):
+        """Test that stateless views answer from the token claims"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.login("student@test.com")}')
+        url = reverse('lesson-request-list-create')
+        # The count and the page, no user lookup
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.data['count'], 1)
+        
+        data = {
+            'tutor_id': self.tutor.id,
+            'subject_id': self.subject.id,
+            'start_time': '2025-09-02T10:00:00Z',
+            'duration_minutes': 60,
+        }
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(LessonRequest.objects.filter(student=self.student).count(), 2)
+    
+    def test_claims_keep_role_checks(self):
+        """Test that role checks still apply to stateless users"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.login("tutor@test.com")}')
+        response = self.client.post(reverse('lesson-request-batch'), {'requests': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_other_views_and_old_tokens_load_the_user(self):
+        """Test that the profile view and tokens without claims use the database"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.login("student@test.com")}')
+        response = self.client.get(reverse('me'))
+        self.assertEqual(response.data['email'], 'student@test.com')
+        
+        # Issued before the role claim existed
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.student)}')
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('lesson-request-list-create'))
+        self.assertEqual(response.data['count'], 1)    
+    def test_deactivated_user_is_rejected_on_the_claims_path(self):
+        """Test that tokens of deactivated users stop working on stateless views"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.login("student@test.com")}')
+        url = reverse('lesson-request-list-create')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.is_active = False
+            self.student.save()
+        
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get(reverse('me'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        # Reactivated users are let in again
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.is_active = True
+            self.student.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_writes_load_the_user(self):
+        """Test that a deleted user's token can't create lesson requests"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.login("student@test.com")}')
+        self.student.delete()
+        
+        data = {
+            'tutor_id': self.tutor.id,
+            'subject_id': self.subject.id,
+            'start_time': '2025-09-02T10:00:00Z',
+            'duration_minutes': 60,
+        }
+        response = self.client.post(reverse('lesson-request-list-create'), data)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(LessonRequest.objects.filter(student_id=self.student.id).exists())
+    
+    def test_schema_documents_the_authentication(self):
+        """Test that the OpenAPI schema keeps the JWT security scheme"""
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+        self.assertIn('jwtAuth', schema['components']['securitySchemes'])
+        operation = schema['paths']['/api/lesson-requests/']['get']
+        self.assertIn({'jwtAuth': []}, operation['security'])
@@ -0,0 +1,118 @@
+from datetime import time
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject, LessonRequest, TutorWorkingHours
+from accounts.models import TutorProfile, StudentProfile
+
+User = get_user_model()
+
+
+class AvailabilityTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student)
+        self.client.force_authenticate(user=self.student)
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        self.profile = TutorProfile.objects.create(user=self.tutor)
+        self.profile.subjects.add(self.subject)
+        
+        self.other_tutor = User.objects.create_user(
+            username='other@test.com',
+            email='other@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        self.other_profile = TutorProfile.objects.create(user=self.other_tutor)
+        self.other_profile.subjects.add(self.subject)
+        
+        # Mondays 09:00-17:00 for both, 2025-09-01 is a Monday
+        for profile in (self.profile, self.other_profile):
+            TutorWorkingHours.objects.create(
+                tutor=profile, weekday=0, start_time=time(9), end_time=time(17)
+            )
+        self.create('2025-09-01T10:00:00Z', 90, status='approved')
+        self.create('2025-09-01T15:30:00Z', 60, status='approved')
+        self.create('2025-09-01T13:00:00Z', 60)
+    
+    def create(self, start_time, duration_minutes, status='pending'):
+        return LessonRequest.objects.create(
+            student=self.student,
+            tutor=self.tutor,
+            subject=self.subject,
+            start_time=start_time,
+            duration_minutes=duration_minutes,
+            status=status
+        )
+    
+    def get_slots(self, url, **params):
+        params = {'from': '2025-09-01T00:00:00Z', 'to': '2025-09-02T00:00:00Z', **params}
+        return self.client.get(url, params)
+    
+    def test_approved_lessons_are_subtracted(self):
+        """Test that free slots are working hours minus approved lessons"""
+        url = reverse('tutor-availability', kwargs={'pk': self.profile.id})
+        response = self.get_slots(url, duration=60)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['tutor_id'], self.profile.id)
+        self.assertEqual(
+            [(slot['start'], slot['end']) for slot in response.data['slots']],
+            [
+                ('2025-09-01T09:00:00Z', '2025-09-01T10:00:00Z'),
+                ('2025-09-01T11:30:00Z', '2025-09-01T15:30:00Z'),
+            ]
+        )
+    
+    def test_short_gaps_are_dropped(self):
+        """Test that gaps shorter than the duration are not offered"""
+        url = reverse('tutor-availability', kwargs={'pk': self.profile.id})
+        response = self.get_slots(url, duration=90)
+        self.assertEqual(
+            [slot['start'] for slot in response.data['slots']],
+            ['2025-09-01T11:30:00Z']
+        )
+    
+    def test_range_is_clipped_and_limited(self):
+        """Test that windows are clipped to the range and long ranges are refused"""
+        url = reverse('tutor-availability', kwargs={'pk': self.profile.id})
+        response = self.get_slots(url, **{'from': '2025-09-01T16:00:00Z'})
+        self.assertEqual(response.data['slots'], [])
+        
+        response = self.get_slots(url, to='2025-12-01T00:00:00Z')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_subject_availability_batches_tutors(self):
+        """Test that a subject's tutors are computed together in a fixed number of queries"""
+        url = reverse('subject-availability', kwargs={'pk': self.subject.id})
+        # Subject check, count, tutor page, working hours, lessons
+        with self.assertNumQueries(5):
+            response = self.get_slots(url, duration=60)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        slots = {row['tutor_id']: row['slots'] for row in response.data['results']}
+        self.assertEqual(len(slots[self.profile.id]), 2)
+        self.assertEqual(
+            slots[self.other_profile.id],
+            [{'start': '2025-09-01T09:00:00Z', 'end': '2025-09-01T17:00:00Z'}]
+        )
+    
+    def test_unknown_tutor(self):
+        """Test that an unknown tutor gives 404"""
+        url = reverse('tutor-availability', kwargs={'pk': 9999})
+        self.assertEqual(self.get_slots(url).status_code, status.HTTP_404_NOT_FOUND)
\ No newline at end of file
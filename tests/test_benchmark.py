@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from tutoring.benchmark import SCENARIO_NAMES, compare
+from tutoring.loadgen import generate_load_data
+
+
+class BenchmarkEndpointsTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+    
+    def benchmark(self, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('benchmark_endpoints', '--requests', '2', '--warmup', '1', *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+    
+    def test_records_every_scenario(self):
+        """Test that a run measures every endpoint and saves the results as JSON"""
+        generate_load_data(5, 10, 40)
+        path = os.path.join(self.directory, 'baseline.json')
+        stdout, _ = self.benchmark('--output', path)
+        
+        with open(path, encoding='utf-8') as source:
+            results = json.load(source)
+        self.assertEqual(list(results['scenarios']), SCENARIO_NAMES)
+        self.assertEqual(results['dataset'], {'tutors': 5, 'students': 10, 'lessons': 40})
+        for name, result in results['scenarios'].items():
+            self.assertIn(name, stdout)
+            self.assertEqual(result['status'], 200, name)
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+            self.assertGreater(result['bytes'], 0)
+        # Listings read their rows with a fixed number of queries
+        self.assertLessEqual(results['scenarios']['lesson-requests-tutor']['queries'], 3)
+    
+    def test_compare_flags_regressions(self):
+        """Test that comparing against a baseline fails on extra queries and passes otherwise"""
+        generate_load_data(5, 10, 40)
+        path = os.path.join(self.directory, 'baseline.json')
+        self.benchmark('--only', 'me', '--output', path)
+        with open(path, encoding='utf-8') as source:
+            baseline = json.load(source)
+        
+        stdout, _ = self.benchmark('--only', 'me', '--compare', path, '--threshold', '100000')
+        self.assertIn('No regressions', stdout)
+        
+        baseline['scenarios']['me']['queries'] -= 1
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(baseline, output)
+        with self.assertRaises(CommandError):
+            self.benchmark('--only', 'me', '--compare', path, '--threshold', '100000')
+    
+    def test_compare_thresholds(self):
+        """Test that latency and size only count as regressions past the threshold"""
+        before = {'status': 200, 'p50_ms': 10.0, 'p95_ms': 20.0, 'queries': 2, 'bytes': 1000}
+        after = {**before, 'p50_ms': 11.5, 'p95_ms': 30.0, 'bytes': 1300}
+        regressions = compare({'scenarios': {'me': before}}, {'scenarios': {'me': after}}, threshold=20)
+        self.assertEqual(regressions, ['me: p95_ms 20.0 -> 30.0', 'me: bytes 1000 -> 1300'])
+    
+    def test_requires_load_data(self):
+        """Test that the benchmark refuses to run without generated data"""
+        with self.assertRaises(CommandError):
+            self.benchmark()
+    
+    def test_cold_only_clears_endpoint_caches(self):
+        """Test that --cold leaves the caches the endpoints don't read, like deactivated users, alone"""
+        generate_load_data(5, 10, 40)
+        caches['auth'].set('benchmark-marker', 1)
+        self.addCleanup(caches['auth'].delete, 'benchmark-marker')
+        self.benchmark('--only', 'tutor-list', '--cold')
+        self.assertEqual(caches['auth'].get('benchmark-marker'), 1)
+    
+    def test_cold_refuses_shared_caches(self):
+        """Test that --cold refuses to clear a catalog cache other processes share"""
+        generate_load_data(5, 10, 40)
+        directory = os.path.join(self.directory, 'catalog')
+        shared = {**settings.CACHES, 'catalog': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory,
+        }}
+        with override_settings(CACHES=shared), self.assertRaises(CommandError):
+            self.benchmark('--cold')
@@ -0,0 +1,90 @@
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject
+from accounts.models import TutorProfile
+
+User = get_user_model()
+
+
+class CatalogCacheTestCase(TestCase):
+    def setUp(self):
+        caches['catalog'].clear()
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        user = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            first_name='Emmy',
+            role='tutor'
+        )
+        self.tutor = TutorProfile.objects.create(user=user, rating=4.5)
+        self.tutor.subjects.add(self.subject)
+    
+    def test_repeated_query_is_served_from_cache(self):
+        """Test that equivalent queries hit the cache without touching the DB"""
+        url = reverse('tutor-list')
+        response = self.client.get(url, {'subject': self.subject.id, 'ordering': '-rating'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        
+        # Parameter order and unrelated parameters don't change the key
+        with self.assertNumQueries(0):
+            response = self.client.get(f'{url}?ordering=-rating&utm_source=ad&subject={self.subject.id}')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['results'][0]['name'], 'Emmy')
+    
+    def test_padded_or_invalid_params_get_their_own_key(self):
+        """Test that a value the view doesn't accept isn't cached under the valid one"""
+        user = User.objects.create_user(
+            username='cheap@test.com',
+            email='cheap@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        TutorProfile.objects.create(user=user, rating=3.0, hourly_rate=10)
+        self.tutor.hourly_rate = 90
+        self.tutor.save()
+        url = reverse('tutor-list')
+        expected = [user.tutor_profile.id, self.tutor.id]
+        
+        for ordering in ['hourly_rate ', ' hourly_rate', 'hourly_rate,', 'bogus']:
+            # Invalid orderings fall back to the best rated first
+            response = self.client.get(url, {'ordering': ordering})
+            self.assertEqual([tutor['id'] for tutor in response.data['results']], expected[::-1])
+        
+        response = self.client.get(url, {'ordering': 'hourly_rate'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([tutor['id'] for tutor in response.data['results']], expected)
+    
+    def test_writes_invalidate_cached_pages(self):
+        """Test that catalog writes bump the version"""
+        detail_url = reverse('tutor-detail', kwargs={'pk': self.tutor.pk})
+        self.client.get(detail_url)
+        self.client.get(reverse('subject-list'))
+        
+        user = self.tutor.user
+        user.first_name = 'Ada'
+        user.save()
+        response = self.client.get(detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['first_name'], 'Ada')
+        
+        self.subject.name = 'Algebra'
+        self.subject.save()
+        response = self.client.get(reverse('subject-list'))
+        self.assertEqual(response.data['results'][0]['name'], 'Algebra')
+        
+        self.tutor.subjects.clear()
+        response = self.client.get(detail_url)
+        self.assertEqual(response.data['subjects'], [])
+    
+    def test_unrelated_user_writes_keep_the_cache(self):
+        """Test that login bookkeeping does not invalidate the catalog"""
+        self.client.get(reverse('subject-list'))
+        user = self.tutor.user
+        user.save(update_fields=['last_login'])
+        response = self.client.get(reverse('subject-list'))
+        self.assertEqual(response['X-Cache'], 'HIT')
\ No newline at end of file
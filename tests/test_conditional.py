@@ -0,0 +1,97 @@
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject
+from accounts.models import TutorProfile, StudentProfile
+
+User = get_user_model()
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        caches['catalog'].clear()
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        user = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        self.tutor = TutorProfile.objects.create(user=user, bio='Algebra')
+        self.tutor.subjects.add(self.subject)
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student, grade_level='10th')
+    
+    def assertNotModified(self, url, etag, queries=1):
+        # Only the metadata query runs
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_tutor_detail_etag(self):
+        """Test that tutor details revalidate against updated_at"""
+        url = reverse('tutor-detail', kwargs={'pk': self.tutor.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+        etag = response['ETag']
+        self.assertNotModified(url, etag)
+        
+        self.subject.name = 'Algebra'
+        self.subject.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    def test_tutor_detail_etag_after_subject_deletion(self):
+        """Test that deleting one of the tutor's subjects changes the ETag"""
+        # The newest subject stays, so the subjects' updated_at doesn't move
+        newer = Subject.objects.create(name='Physics')
+        self.tutor.subjects.add(newer)
+        url = reverse('tutor-detail', kwargs={'pk': self.tutor.pk})
+        etag = self.client.get(url)['ETag']
+        
+        self.subject.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([subject['name'] for subject in response.data['subjects']], ['Physics'])
+    
+    def test_subject_list_if_modified_since(self):
+        """Test that the subject list honours If-Modified-Since"""
+        url = reverse('subject-list')
+        response = self.client.get(url)
+        last_modified = response['Last-Modified']
+        
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        # Deletions change the ETag even though no updated_at moves
+        etag = response['ETag']
+        Subject.objects.filter(name='Mathematics').delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_me_etag_follows_user_changes(self):
+        """Test that /me/ revalidates after the user's name changes"""
+        self.client.force_authenticate(user=self.student)
+        url = reverse('me')
+        etag = self.client.get(url)['ETag']
+        # Answered from the cached profile snapshot
+        self.assertNotModified(url, etag, queries=0)
+        
+        self.student.first_name = 'Ada'
+        self.student.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['first_name'], 'Ada')
\ No newline at end of file
@@ -0,0 +1,204 @@
+import asyncio
+import json
+from unittest.mock import patch
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth import get_user_model
+from tutoring import events
+from tutoring.models import Subject, LessonRequest
+from accounts.models import TutorProfile, StudentProfile
+
+User = get_user_model()
+
+
+class RecordingBackend:
+    published = []
+    
+    def publish(self, user_ids, event):
+        self.published.append((sorted(user_ids), event))
+    
+    async def start(self):
+        pass
+
+
+@override_settings(LESSON_EVENTS_BACKEND='tests.test_events.RecordingBackend')
+class LessonEventPublishTestCase(TestCase):
+    def setUp(self):
+        events._backend = None
+        RecordingBackend.published = []
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student)
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        TutorProfile.objects.create(user=self.tutor)
+    
+    def tearDown(self):
+        events._backend = None
+    
+    def test_events_follow_create_and_status_changes(self):
+        """Test that single and batch creates and status updates publish after commit"""
+        self.client.force_authenticate(user=self.student)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('lesson-request-batch'), {'requests': [
+                {
+                    'tutor_id': self.tutor.id,
+                    'subject_id': self.subject.id,
+                    'start_time': f'2025-09-0{day}T10:00:00Z',
+                    'duration_minutes': 60,
+                }
+                for day in (1, 2)
+            ]}, format='json')
+        ids = [row['id'] for row in response.data['results']]
+        self.assertEqual(
+            [event['type'] for _, event in RecordingBackend.published],
+            ['lesson_request.created', 'lesson_request.created']
+        )
+        recipients, event = RecordingBackend.published[0]
+        self.assertEqual(recipients, sorted([self.student.id, self.tutor.id]))
+        self.assertEqual(event['start_time'], '2025-09-01T10:00:00Z')
+        
+        RecordingBackend.published = []
+        self.client.force_authenticate(user=self.tutor)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('lesson-request-update', kwargs={'pk': ids[0]}), {'status': 'rejected'})
+            self.client.post(
+                reverse('lesson-request-bulk-status'), {'status': 'approved', 'ids': ids}, format='json'
+            )
+        self.assertEqual(
+            [(event['id'], event['status']) for _, event in RecordingBackend.published],
+            [(ids[0], 'rejected'), (ids[1], 'approved')]
+        )
+    
+    def test_no_event_without_commit(self):
+        """Test that nothing is published for a rolled back change"""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            LessonRequest.objects.create(
+                student=self.student,
+                tutor=self.tutor,
+                subject=self.subject,
+                start_time='2025-09-01T10:00:00Z',
+                duration_minutes=60
+            )
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(RecordingBackend.published, [])
+
+
+class EventStreamTestCase(TestCase):
+    def setUp(self):
+        caches['auth'].clear()
+        events._backend = None
+        self.user = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        self.token = str(AccessToken.for_user(self.user))
+    
+    def stream(self, scope, publish=()):
+        """Run the ASGI app, publish ``publish`` once connected, then disconnect"""
+        sent = []
+        disconnected = asyncio.Event()
+        
+        async def receive():
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+        
+        async def send(message):
+            sent.append(message)
+            if message.get('body') == b': connected\n\n':
+                for user_id, event in publish:
+                    events.get_backend().publish({user_id}, event)
+                # Let the events reach the queue before hanging up
+                asyncio.get_running_loop().call_later(0.05, disconnected.set)
+        
+        async def run():
+            await asyncio.wait_for(events.events_app(scope, receive, send), timeout=5)
+        
+        asyncio.run(run())
+        return sent
+    
+    def scope(self, query_string=b'', headers=()):
+        return {
+            'type': 'http',
+            'method': 'GET',
+            'path': events.EVENTS_PATH,
+            'query_string': query_string,
+            'headers': list(headers),
+        }
+    
+    def test_stream_delivers_own_events(self):
+        """Test that a stream receives its user's events and not other users'"""
+        event = {'type': 'lesson_request.updated', 'id': 7, 'status': 'approved'}
+        sent = self.stream(
+            self.scope(query_string=f'token={self.token}'.encode()),
+            publish=[(self.user.id + 1, {'type': 'lesson_request.created', 'id': 8}), (self.user.id, event)]
+        )
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), sent[0]['headers'])
+        bodies = [message['body'].decode() for message in sent[1:]]
+        self.assertEqual(bodies, [
+            ': connected\n\n',
+            f'event: lesson_request.updated\ndata: {json.dumps(event)}\n\n',
+        ])
+        self.assertEqual(events.broker.subscribers, {})
+    
+    def test_stream_requires_a_valid_token(self):
+        """Test that streams need a valid access token in the header or query string"""
+        sent = self.stream(self.scope(headers=[(b'authorization', b'Bearer nope')]))
+        self.assertEqual(sent[0]['status'], 401)
+        
+        sent = self.stream(self.scope(headers=[(b'authorization', f'Bearer {self.token}'.encode())]))
+        self.assertEqual(sent[0]['status'], 200)
+    
+    def test_stream_refuses_inactive_users(self):
+        """Test that a deactivated user's valid token can't open a stream"""
+        self.addCleanup(caches['auth'].clear)
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        sent = self.stream(self.scope(query_string=f'token={self.token}'.encode()))
+        self.assertEqual(sent[0]['status'], 401)
+
+
+class RedisListenerTestCase(TestCase):
+    def test_failed_listener_is_restarted(self):
+        """Test that the listener is restarted, with a growing delay, when it fails"""
+        backend = events.RedisBackend.__new__(events.RedisBackend)
+        backend.listener = None
+        attempts = []
+        
+        async def listen():
+            attempts.append(backend.delay)
+            if len(attempts) < 3:
+                raise ConnectionError('connection lost')
+            await asyncio.Event().wait()
+        backend.listen = listen
+        
+        async def run():
+            await backend.start()
+            while len(attempts) < 3:
+                await asyncio.sleep(0)
+            backend.listener.cancel()
+        
+        with patch('tutoring.events.LISTENER_BACKOFF', (0.001, 0.002)):
+            with self.assertLogs('tutoring.events', 'ERROR') as logs:
+                asyncio.run(asyncio.wait_for(run(), timeout=5))
+        self.assertEqual(attempts, [0.001, 0.002, 0.002])
+        self.assertEqual(len(logs.records), 2)
@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject, LessonRequest
+from accounts.models import TutorProfile, StudentProfile
+from accounts.serializers import ClaimsTokenObtainPairSerializer
+from tutoring.export import iterate_async
+
+User = get_user_model()
+
+
+class LessonRequestExportTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student)
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            first_name='Emmy',
+            last_name='Noether',
+            role='tutor'
+        )
+        TutorProfile.objects.create(user=self.tutor)
+        
+        for index in range(5):
+            LessonRequest.objects.create(
+                student=self.student,
+                tutor=self.tutor,
+                subject=self.subject,
+                start_time=f'2025-09-0{index + 1}T10:00:00Z',
+                duration_minutes=60,
+                status='approved' if index % 2 else 'pending',
+                note='Chapter 1, "limits"'
+            )
+    
+    def export(self, export_format, **params):
+        url = reverse('lesson-request-export', kwargs={'export_format': export_format})
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+    
+    def test_ndjson_matches_listing(self):
+        """Test that NDJSON rows match the listing rows and honour the status filter"""
+        self.client.force_authenticate(user=self.student)
+        response, body = self.export('ndjson', status='pending')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        
+        rows = [json.loads(line) for line in body.splitlines()]
+        listing = self.client.get(reverse('lesson-request-list-create'), {'status': 'pending'})
+        self.assertEqual(rows, [dict(row) for row in listing.data['results']])
+        self.assertEqual(len(rows), 3)
+    
+    def test_csv_export(self):
+        """Test that CSV has a header and quotes notes"""
+        self.client.force_authenticate(user=self.tutor)
+        response, body = self.export('csv')
+        self.assertIn('attachment; filename="lesson-requests.csv"', response['Content-Disposition'])
+        
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['tutor_name'], 'Emmy Noether')
+        self.assertEqual(rows[0]['note'], 'Chapter 1, "limits"')
+    
+    def test_asgi_export_is_streamed_asynchronously(self):
+        """Test that under ASGI the export is an async stream with the same rows"""
+        access = ClaimsTokenObtainPairSerializer.get_token(self.student).access_token
+        url = reverse('lesson-request-export', kwargs={'export_format': 'ndjson'})
+        
+        async def export():
+            response = await AsyncClient().get(url, headers={'Authorization': f'Bearer {access}'})
+            return response, b''.join([chunk async for chunk in response.streaming_content]).decode()
+        
+        response, body = async_to_sync(export)()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        self.assertEqual(len(body.splitlines()), 5)
+    
+    def test_async_iterator_reads_in_chunks(self):
+        """Test that the async iterator only reads one chunk of lines ahead"""
+        read = []
+        
+        def lines():
+            for number in range(5):
+                read.append(number)
+                yield f'{number}\n'
+        
+        async def collect():
+            chunks = iterate_async(lines(), chunk_size=2)
+            first = await anext(chunks)
+            self.assertEqual(read, [0, 1])
+            return [first] + [chunk async for chunk in chunks]
+        
+        self.assertEqual(async_to_sync(collect)(), ['0\n1\n', '2\n3\n', '4\n'])
+    
+    def test_unknown_format(self):
+        """Test that only ndjson and csv are served"""
+        self.client.force_authenticate(user=self.student)
+        url = reverse('lesson-request-export', kwargs={'export_format': 'xml'})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_export_command(self):
+        """Test that the command streams the same rows with the same filters"""
+        out = io.StringIO()
+        call_command(
+            'export_lesson_requests', '--user=tutor@test.com', '--status=approved', stdout=out
+        )
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(all(row['status'] == 'approved' for row in rows))
\ No newline at end of file
@@ -0,0 +1,87 @@
+import threading
+from unittest.mock import patch
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from drf_spectacular.generators import SchemaGenerator
+from accounts.hashing import HashingPool, HashingPoolFull, get_hashing_pool
+
+User = get_user_model()
+
+
+class HashingPoolTestCase(TestCase):
+    def test_pool_rejects_past_queue_size(self):
+        """Test that the pool counts queued work and turns away the overflow"""
+        pool = HashingPool(workers=1, queue_size=1)
+        started, release = threading.Event(), threading.Event()
+        
+        def block():
+            started.set()
+            release.wait(5)
+        
+        running = pool.submit(block)
+        started.wait(5)
+        queued = pool.submit(block)
+        with self.assertRaises(HashingPoolFull):
+            pool.submit(block)
+        
+        stats = pool.stats()
+        self.assertEqual((stats['active'], stats['queued'], stats['rejected']), (1, 1, 1))
+        release.set()
+        running.result(5)
+        queued.result(5)
+        self.assertEqual(pool.stats()['completed'], 2)
+
+
+class PasswordHashingViewsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+    
+    def test_login_rejects_wrong_password_and_unknown_email(self):
+        """Test that bad credentials get the same 401"""
+        for email, password in [('student@test.com', 'wrong'), ('nobody@test.com', 'TestPass123!')]:
+            response = self.client.post(reverse('login'), {'email': email, 'password': password}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        response = self.client.post(reverse('login'), {'email': 'student@test.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', response.data)
+    
+    def test_full_pool_returns_503(self):
+        """Test that sign-ins are turned away while the hashing queue is full"""
+        with patch.object(HashingPool, 'submit', side_effect=HashingPoolFull):
+            response = self.client.post(
+                reverse('login'), {'email': 'student@test.com', 'password': 'TestPass123!'}
+            )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+    
+    def test_stats_are_staff_only(self):
+        """Test that only staff can read the hashing pool stats"""
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse('hashing-stats'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('hashing-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('queued', response.data)
+    
+    def test_views_are_in_the_schema(self):
+        """Test that login, registration and the pool stats stay documented in the OpenAPI schema"""
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+        paths = schema['paths']
+        self.assertIn('post', paths['/api/auth/login/'])
+        self.assertIn('post', paths['/api/auth/register/'])
+        self.assertIn('get', paths['/api/auth/hashing-stats/'])
+        stats = schema['components']['schemas']['HashingStats']['properties']
+        self.assertEqual(set(stats), set(get_hashing_pool().stats()))
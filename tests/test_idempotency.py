@@ -0,0 +1,93 @@
+from unittest.mock import patch
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject, LessonRequest
+from accounts.models import TutorProfile, StudentProfile
+
+User = get_user_model()
+
+
+class IdempotencyKeyTestCase(TestCase):
+    def setUp(self):
+        caches['idempotency'].clear()
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student)
+        self.client.force_authenticate(user=self.student)
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        TutorProfile.objects.create(user=self.tutor)
+        
+        self.data = {
+            'tutor_id': self.tutor.id,
+            'subject_id': self.subject.id,
+            'start_time': '2025-09-01T10:00:00Z',
+            'duration_minutes': 60,
+        }
+    
+    def post(self, data, key):
+        return self.client.post(
+            reverse('lesson-request-list-create'), data, format='json', HTTP_IDEMPOTENCY_KEY=key
+        )
+    
+    def test_retry_replays_the_first_response(self):
+        """Test that a retry gets the stored response without running the write path"""
+        first = self.post(self.data, 'retry-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        
+        with self.assertNumQueries(0):
+            retry = self.post(self.data, 'retry-1')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(LessonRequest.objects.count(), 1)
+        
+        # Another key is another request
+        self.post(self.data, 'retry-2')
+        self.assertEqual(LessonRequest.objects.count(), 2)
+    
+    def test_key_reuse_with_another_body_is_rejected(self):
+        """Test that a key can't be replayed for a different payload"""
+        self.post(self.data, 'reused')
+        response = self.post({**self.data, 'duration_minutes': 90}, 'reused')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(LessonRequest.objects.count(), 1)
+    
+    def test_concurrent_duplicate_waits_for_the_first(self):
+        """Test that a duplicate arriving while the key is locked doesn't run"""
+        # Another request holds the lock and doesn't finish in time
+        with patch('picourse.idempotency.LOCK_WAIT', 0), patch.object(
+            caches['idempotency'], 'add', return_value=False
+        ):
+            response = self.post(self.data, 'busy')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(LessonRequest.objects.exists())
+    
+    def test_profile_update_is_idempotent(self):
+        """Test that PATCH /me/ reaches the update view and replays retries"""
+        url = reverse('me')
+        response = self.client.patch(url, {'first_name': 'Ada'}, format='json', HTTP_IDEMPOTENCY_KEY='profile-1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['first_name'], 'Ada')
+        
+        User.objects.filter(pk=self.student.pk).update(first_name='Grace')
+        response = self.client.patch(url, {'first_name': 'Ada'}, format='json', HTTP_IDEMPOTENCY_KEY='profile-1')
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.first_name, 'Grace')
\ No newline at end of file
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject
+from tutoring.search import search_tutors
+from accounts import imports
+from accounts.models import StudentProfile, TutorProfile
+
+User = get_user_model()
+
+
+class ImportUsersTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        Subject.objects.create(name='Mathematics')
+        Subject.objects.create(name='Physics')
+        User.objects.create_user(
+            username='taken@test.com',
+            email='taken@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+    
+    def run_import(self, filename, content, *args):
+        path = os.path.join(self.directory, filename)
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(content)
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_users', path, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+    
+    def test_csv_import_creates_users_and_profiles(self):
+        """Test that a CSV import creates users, profiles and subject links in batches"""
+        content = (
+            'email,password,role,first_name,last_name,grade_level,bio,hourly_rate,subjects\n'
+            'ada@test.com,TestPass123!,student,Ada,Lovelace,10,,,\n'
+            'emmy@test.com,TestPass123!,tutor,Emmy,Noether,,Abstract algebra,450.00,Mathematics;Physics\n'
+            'carl@test.com,TestPass123!,tutor,Carl,Gauss,,,,Mathematics\n'
+        )
+        stdout, stderr = self.run_import('users.csv', content, '--batch-size', '2', '--workers', '1')
+        self.assertIn('Imported 3 users, 0 rows failed', stdout)
+        self.assertEqual(stderr, '')
+        
+        ada = User.objects.get(email='ada@test.com')
+        self.assertTrue(ada.check_password('TestPass123!'))
+        self.assertEqual(StudentProfile.objects.get(user=ada).grade_level, '10')
+        emmy = TutorProfile.objects.get(user__email='emmy@test.com')
+        self.assertEqual(set(emmy.subjects.values_list('name', flat=True)), {'Mathematics', 'Physics'})
+        # Imported tutors are searchable right away
+        self.assertEqual(list(search_tutors(TutorProfile.objects.all(), 'noether')), [emmy])
+    
+    def test_bad_rows_are_reported_and_skipped(self):
+        """Test that rejected rows are reported by line and the others are imported"""
+        rows = [
+            {'email': 'ada@test.com', 'password': 'TestPass123!', 'role': 'student'},
+            {'email': 'taken@test.com', 'password': 'TestPass123!', 'role': 'student'},
+            {'email': 'ada@test.com', 'password': 'TestPass123!', 'role': 'student'},
+            {'email': 'emmy@test.com', 'password': 'TestPass123!', 'role': 'tutor', 'subjects': ['Alchemy']},
+            {'email': 'not-an-email', 'password': 'TestPass123!', 'role': 'admin'},
+        ]
+        content = '\n'.join(json.dumps(row) for row in rows) + '\n{broken\n'
+        stdout, stderr = self.run_import('users.ndjson', content, '--workers', '0')
+        self.assertIn('Imported 1 users, 5 rows failed', stdout)
+        
+        lines = stderr.splitlines()
+        self.assertTrue(lines[0].startswith('line 2: email: A user with taken@test.com'))
+        self.assertEqual(
+            [line.split(':')[0] for line in lines[1:]], ['line 3', 'line 4', 'line 5', 'line 6']
+        )
+        self.assertIn('Invalid JSON', lines[-1])
+        self.assertTrue(User.objects.filter(email='ada@test.com').exists())
+    
+    def test_email_registered_during_import_rejects_only_its_row(self):
+        """Test that a row whose email is taken after validation is reported and the rest of its batch imported"""
+        insert_batch = imports.insert_batch
+        
+        def register_then_insert(*args):
+            if not User.objects.filter(email='emmy@test.com').exists():
+                User.objects.create_user(
+                    username='emmy@test.com', email='emmy@test.com', password='TestPass123!', role='student'
+                )
+            return insert_batch(*args)
+        
+        rows = [
+            {'email': email, 'password': 'TestPass123!', 'role': 'student'}
+            for email in ['ada@test.com', 'emmy@test.com', 'carl@test.com']
+        ]
+        content = '\n'.join(json.dumps(row) for row in rows) + '\n'
+        with mock.patch('accounts.imports.insert_batch', side_effect=register_then_insert):
+            stdout, stderr = self.run_import('users.ndjson', content, '--workers', '0')
+        self.assertIn('Imported 2 users, 1 rows failed', stdout)
+        self.assertTrue(stderr.startswith('line 2: email: A user with emmy@test.com already exists'))
+        self.assertEqual(User.objects.filter(email__in=['ada@test.com', 'carl@test.com']).count(), 2)
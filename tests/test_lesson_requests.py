@@ -0,0 +1,253 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject, LessonRequest
+from tutoring.serializers import LessonRequestSerializer
+from accounts.models import TutorProfile, StudentProfile
+
+User = get_user_model()
+
+
+class LessonRequestListTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student)
+        
+        for index, (first_name, last_name) in enumerate([('Emmy', 'Noether'), ('', ''), ('Ada', '')]):
+            tutor = User.objects.create_user(
+                username=f'tutor{index}@test.com',
+                email=f'tutor{index}@test.com',
+                password='TestPass123!',
+                first_name=first_name,
+                last_name=last_name,
+                role='tutor'
+            )
+            TutorProfile.objects.create(user=tutor)
+            for _ in range(8):
+                LessonRequest.objects.create(
+                    student=self.student,
+                    tutor=tutor,
+                    subject=self.subject,
+                    start_time='2025-08-25T10:00:00Z',
+                    duration_minutes=60,
+                    note='Help with algebra'
+                )
+        
+        self.client.force_authenticate(user=self.student)
+    
+    def test_rows_match_model_serializer(self):
+        """Test that the projection renders like LessonRequestSerializer"""
+        response = self.client.get(reverse('lesson-request-list-create'), {'limit': 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        expected = LessonRequestSerializer(LessonRequest.objects.all(), many=True).data
+        self.assertEqual(response.json()['results'], [dict(row) for row in expected])
+        self.assertEqual(
+            {row['tutor_name'] for row in response.data['results']},
+            {'Emmy Noether', 'tutor1@test.com', 'Ada'}
+        )
+    
+    def test_page_query_count(self):
+        """Test that a page costs one query plus the count"""
+        url = reverse('lesson-request-list-create')
+        with self.assertNumQueries(2):
+            self.client.get(url, {'limit': 20})
+        with self.assertNumQueries(1):
+            self.client.get(url, {'limit': 20, 'paginate': 'cursor'})
+
+class LessonRequestBatchTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student)
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        TutorProfile.objects.create(user=self.tutor)
+    
+    def lesson(self, day, **overrides):
+        return {
+            'tutor_id': self.tutor.id,
+            'subject_id': self.subject.id,
+            'start_time': f'2025-09-{day:02d}T10:00:00Z',
+            'duration_minutes': 60,
+            **overrides
+        }
+    
+    def test_batch_create(self):
+        """Test that a series of lessons is created in one call"""
+        self.client.force_authenticate(user=self.student)
+        data = {'requests': [self.lesson(day) for day in range(1, 11)]}
+        
+        # Tutor and subject checks, one schedule lookup per tutor, the insert
+        # and the response projection
+        with self.assertNumQueries(5):
+            response = self.client.post(reverse('lesson-request-batch'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(LessonRequest.objects.filter(student=self.student, status='pending').count(), 10)
+    
+    def test_batch_reports_errors_per_item(self):
+        """Test that invalid items are reported by position and nothing is created"""
+        self.client.force_authenticate(user=self.student)
+        data = {'requests': [
+            self.lesson(1),
+            self.lesson(2, tutor_id=self.student.id),
+            self.lesson(3, subject_id=999),
+        ]}
+        
+        response = self.client.post(reverse('lesson-request-batch'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data['requests']
+        self.assertEqual(errors[0], {})
+        self.assertEqual(list(errors[1]), ['tutor_id'])
+        self.assertEqual(list(errors[2]), ['subject_id'])
+        
+        # Field errors are reported the same way
+        data['requests'][1] = self.lesson(2, duration_minutes='x')
+        response = self.client.post(reverse('lesson-request-batch'), data, format='json')
+        self.assertIn('duration_minutes', response.data['requests'][1])
+        self.assertFalse(LessonRequest.objects.exists())
+    
+    def test_tutor_cannot_batch_create(self):
+        """Test that only students can create lesson requests"""
+        self.client.force_authenticate(user=self.tutor)
+        response = self.client.post(reverse('lesson-request-batch'), {'requests': [self.lesson(1)]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class LessonRequestBulkStatusTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.math = Subject.objects.create(name='Mathematics')
+        self.physics = Subject.objects.create(name='Physics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        self.other_tutor = User.objects.create_user(
+            username='tutor2@test.com',
+            email='tutor2@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        self.client.force_authenticate(user=self.tutor)
+    
+    def create(self, subject, tutor=None, status='pending', day=1):
+        return LessonRequest.objects.create(
+            student=self.student,
+            tutor=tutor or self.tutor,
+            subject=subject,
+            start_time=f'2025-09-{day:02d}T10:00:00Z',
+            duration_minutes=60,
+            status=status
+        )
+    
+    def test_bulk_approve_by_ids(self):
+        """Test per-id outcomes of a bulk approval"""
+        pending = self.create(self.math)
+        rejected = self.create(self.math, status='rejected')
+        foreign = self.create(self.math, tutor=self.other_tutor)
+        
+        response = self.client.post(reverse('lesson-request-bulk-status'), {
+            'status': 'approved',
+            'ids': [pending.id, rejected.id, foreign.id],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(response.data['results'], [
+            {'id': pending.id, 'result': 'updated'},
+            {'id': rejected.id, 'result': 'not_pending'},
+            {'id': foreign.id, 'result': 'not_found'},
+        ])
+        
+        statuses = dict(LessonRequest.objects.values_list('id', 'status'))
+        self.assertEqual(statuses, {pending.id: 'approved', rejected.id: 'rejected', foreign.id: 'pending'})
+    
+    def test_bulk_reject_by_filter(self):
+        """Test rejecting all pending requests for a subject before a date"""
+        early = self.create(self.math, day=1)
+        late = self.create(self.math, day=20)
+        physics = self.create(self.physics, day=1)
+        
+        response = self.client.post(reverse('lesson-request-bulk-status'), {
+            'status': 'rejected',
+            'subject_id': self.math.id,
+            'start_before': '2025-09-10T00:00:00Z',
+        }, format='json')
+        self.assertEqual(response.data['results'], [{'id': early.id, 'result': 'updated'}])
+        self.assertEqual(
+            list(LessonRequest.objects.filter(status='rejected').values_list('id', flat=True)),
+            [early.id]
+        )
+        self.assertFalse(LessonRequest.objects.filter(id__in=[late.id, physics.id]).exclude(status='pending').exists())
+    
+    def test_bulk_filter_works_in_windows(self):
+        """Test that filter mode updates a window of matches at a time with one conditional UPDATE"""
+        lessons = [self.create(self.math, day=day) for day in range(1, 6)]
+        url = reverse('lesson-request-bulk-status')
+        data = {'status': 'rejected', 'subject_id': self.math.id, 'limit': 2}
+        
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(url, data, format='json')
+        self.assertEqual([row['id'] for row in response.data['results']], [lessons[0].id, lessons[1].id])
+        self.assertTrue(response.data['has_more'])
+        self.assertEqual(response.data['last_id'], lessons[1].id)
+        update = next(query['sql'] for query in captured if query['sql'].startswith('UPDATE'))
+        self.assertNotIn(' IN (', update)
+        
+        seen = []
+        while response.data['has_more']:
+            response = self.client.post(url, {**data, 'after_id': response.data['last_id']}, format='json')
+            seen += [row['id'] for row in response.data['results']]
+        self.assertEqual(seen, [lesson.id for lesson in lessons[2:]])
+        self.assertFalse(LessonRequest.objects.filter(status='pending').exists())
+    
+    def test_bulk_status_caps_the_selection(self):
+        """Test that too many ids or too large a window are refused"""
+        url = reverse('lesson-request-bulk-status')
+        response = self.client.post(url, {'status': 'rejected', 'ids': list(range(1, 502))}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(url, {'status': 'rejected', 'subject_id': self.math.id, 'limit': 501}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_bulk_status_requires_a_selection(self):
+        """Test that ids or a filter is required"""
+        response = self.client.post(reverse('lesson-request-bulk-status'), {'status': 'approved'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        self.client.force_authenticate(user=self.student)
+        response = self.client.post(reverse('lesson-request-bulk-status'), {'status': 'approved', 'ids': [1]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
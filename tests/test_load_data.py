@@ -0,0 +1,95 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from tutoring.loadgen import LOAD_PASSWORD, generate_load_data
+from tutoring.models import LessonRequest, TutorWorkingHours
+from tutoring.scheduling import overlapping_lessons
+from tutoring.search import search_tutors
+from accounts.models import StudentProfile, TutorProfile
+
+User = get_user_model()
+
+
+class GenerateLoadDataTestCase(TestCase):
+    def generate(self, *args):
+        stdout = StringIO()
+        call_command(
+            'generate_load_data', '--tutors', '5', '--students', '50', '--lessons', '300', *args, stdout=stdout
+        )
+        return stdout.getvalue()
+    
+    def test_generates_users_profiles_and_lessons(self):
+        """Test that the command creates the requested numbers of rows with consistent values"""
+        output = self.generate('--chunk-size', '7')
+        self.assertIn('Created 300 lesson requests', output)
+        self.assertEqual(TutorProfile.objects.count(), 5)
+        self.assertEqual(StudentProfile.objects.count(), 50)
+        self.assertEqual(LessonRequest.objects.count(), 300)
+        self.assertTrue(TutorWorkingHours.objects.exists())
+        
+        for lesson in LessonRequest.objects.select_related('tutor__tutor_profile', 'student'):
+            self.assertEqual(lesson.end_time, lesson.start_time + timedelta(minutes=lesson.duration_minutes))
+            self.assertEqual(lesson.student.role, 'student')
+            self.assertIn(lesson.subject_id, lesson.tutor.tutor_profile.subjects.values_list('id', flat=True))
+        
+        self.assertTrue(LessonRequest.objects.filter(status='approved').exists())
+        for lesson in LessonRequest.objects.all():
+            # Inside the tutor's working hours
+            self.assertTrue(TutorWorkingHours.objects.filter(
+                tutor__user_id=lesson.tutor_id,
+                weekday=lesson.start_time.weekday(),
+                start_time__lte=lesson.start_time.time(),
+                end_time__gte=lesson.end_time.time(),
+            ).exists())
+            # Requested before the lesson, and decided by its start
+            self.assertLessEqual(lesson.created_at, lesson.updated_at)
+            self.assertLessEqual(lesson.created_at, lesson.start_time)
+            if lesson.status != 'pending':
+                self.assertLessEqual(lesson.updated_at, lesson.start_time)
+            # Approved lessons of a tutor never overlap
+            if lesson.status == 'approved':
+                self.assertFalse(overlapping_lessons(
+                    lesson.tutor_id, lesson.start_time, lesson.end_time, exclude_ids=[lesson.id]
+                ).exists())
+        
+        # Listings ordered by created_at don't tie
+        self.assertEqual(LessonRequest.objects.values('created_at').distinct().count(), 300)
+        
+        tutor = User.objects.filter(role='tutor').first()
+        self.assertTrue(tutor.check_password(LOAD_PASSWORD))
+        # Generated tutors are searchable and the lesson indexes were rebuilt
+        self.assertTrue(search_tutors(TutorProfile.objects.all(), tutor.last_name).exists())
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, LessonRequest._meta.db_table)
+        self.assertTrue({index.name for index in LessonRequest._meta.indexes} <= set(constraints))
+        # Ids handed out later don't collide with the ones assigned by the generator
+        user = User.objects.create_user(username='new@test.com', email='new@test.com', password='x', role='student')
+        self.assertGreater(user.pk, User.objects.exclude(pk=user.pk).order_by('-pk').first().pk)
+    
+    def test_same_seed_generates_same_data(self):
+        """Test that generating twice with one seed yields identical rows"""
+        def snapshot():
+            with transaction.atomic():
+                generate_load_data(10, 30, 200, seed=7)
+                rows = list(LessonRequest.objects.order_by('pk').values_list(
+                    'student__email', 'tutor__email', 'subject__name', 'start_time', 'duration_minutes', 'status'
+                ))
+                ratings = list(TutorProfile.objects.order_by('pk').values_list('rating', 'hourly_rate'))
+                transaction.set_rollback(True)
+            return rows, ratings
+        
+        first = snapshot()
+        self.assertEqual(len(first[0]), 200)
+        self.assertEqual(snapshot(), first)
+    
+    def test_seed_can_only_be_generated_once(self):
+        """Test that a second run with the same seed is refused"""
+        self.generate('--lessons', '0')
+        with self.assertRaises(CommandError):
+            self.generate('--lessons', '0')
+        self.generate('--lessons', '0', '--seed', '1')
+        self.assertEqual(User.objects.count(), 110)
\ No newline at end of file
@@ -0,0 +1,129 @@
+from unittest.mock import patch
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject, LessonRequest
+from accounts.models import TutorProfile, StudentProfile
+from tutoring.pagination import EstimatedCountPagination
+
+User = get_user_model()
+
+
+class KeysetPaginationTestCase(TestCase):
+    def setUp(self):
+        caches['catalog'].clear()
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student)
+        
+        self.tutors = []
+        for index, rating in enumerate([4.5, 3.0, 4.5, 5.0, 3.0, 4.5, 2.0]):
+            user = User.objects.create_user(
+                username=f'tutor{index}@test.com',
+                email=f'tutor{index}@test.com',
+                password='TestPass123!',
+                role='tutor'
+            )
+            tutor = TutorProfile.objects.create(user=user, rating=rating, hourly_rate=100 + index % 3)
+            tutor.subjects.add(self.subject)
+            self.tutors.append(tutor)
+    
+    def walk(self, url, params):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids.extend(row['id'] for row in response.data['results'])
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+    
+    def test_tutor_pages_follow_active_ordering(self):
+        """Test that cursor pages match the offset ordering without gaps"""
+        for ordering in ['-rating', 'hourly_rate']:
+            expected = list(
+                TutorProfile.objects.order_by(ordering, 'id').values_list('id', flat=True)
+            )
+            ids = self.walk(reverse('tutor-list'), {
+                'paginate': 'cursor', 'limit': 2, 'ordering': ordering, 'subject': self.subject.id
+            })
+            self.assertEqual(ids, expected)
+    
+    def test_lesson_request_pages(self):
+        """Test cursor pagination of lesson requests"""
+        for tutor in self.tutors:
+            LessonRequest.objects.create(
+                student=self.student,
+                tutor=tutor.user,
+                subject=self.subject,
+                start_time='2025-08-25T10:00:00Z',
+                duration_minutes=60
+            )
+        self.client.force_authenticate(user=self.student)
+        
+        ids = self.walk(reverse('lesson-request-list-create'), {'paginate': 'cursor', 'limit': 3})
+        expected = list(LessonRequest.objects.order_by('-created_at', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+    
+    def test_tampered_cursor_is_rejected(self):
+        """Test that a modified cursor is refused"""
+        response = self.client.get(reverse('tutor-list'), {'paginate': 'cursor', 'limit': 2})
+        cursor = response.data['next'].split('cursor=')[1]
+        
+        response = self.client.get(reverse('tutor-list'), {'cursor': cursor[:-2] + 'xx'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        # A cursor is only valid for the ordering it was issued for
+        response = self.client.get(reverse('tutor-list'), {'cursor': cursor, 'ordering': 'hourly_rate'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class CountFreePaginationTestCase(TestCase):
+    def setUp(self):
+        caches['catalog'].clear()
+        self.client = APIClient()
+        for index in range(5):
+            user = User.objects.create_user(
+                username=f'tutor{index}@test.com',
+                email=f'tutor{index}@test.com',
+                password='TestPass123!',
+                role='tutor'
+            )
+            TutorProfile.objects.create(user=user, rating=index)
+    
+    def test_nocount_mode_skips_count_query(self):
+        """Test that count-free pages run no COUNT query"""
+        # One query for the page and one for the prefetched subjects
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('tutor-list'), {'paginate': 'nocount', 'limit': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertTrue(response.data['has_next'])
+        self.assertEqual(len(response.data['results']), 3)
+        
+        response = self.client.get(response.data['next'])
+        self.assertFalse(response.data['has_next'])
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(len(response.data['results']), 2)
+    
+    def test_estimate_mode_caps_the_count(self):
+        """Test that the estimated count stops at the cutoff"""
+        response = self.client.get(reverse('tutor-list'), {'paginate': 'estimate', 'limit': 2})
+        self.assertEqual(response.data['count'], 5)
+        self.assertFalse(response.data['count_is_estimate'])
+        
+        caches['catalog'].clear()
+        with patch.object(EstimatedCountPagination, 'exact_count_cutoff', 3):
+            response = self.client.get(reverse('tutor-list'), {'paginate': 'estimate', 'limit': 2})
+        self.assertEqual(response.data['count'], 3)
+        self.assertTrue(response.data['count_is_estimate'])
\ No newline at end of file
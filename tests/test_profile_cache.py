@@ -0,0 +1,69 @@
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject
+from accounts.models import StudentProfile, TutorProfile
+
+User = get_user_model()
+
+
+class ProfileSnapshotTestCase(TestCase):
+    def setUp(self):
+        caches['profile'].clear()
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student, grade_level='10')
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        TutorProfile.objects.create(user=self.tutor).subjects.add(self.subject)
+    
+    def test_snapshot_is_built_once(self):
+        """Test that /me/ reads the profile in one query and then from the cache"""
+        self.client.force_authenticate(user=self.student)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('me'))
+        self.assertEqual(response.data['student_profile'], {'grade_level': '10'})
+        self.assertIsNone(response.data['tutor_profile'])
+        
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('me'))
+        self.assertEqual(response.data['email'], 'student@test.com')
+    
+    def test_tutor_snapshot_prefetches_subjects(self):
+        """Test that a tutor's snapshot costs the profile query and the subjects prefetch"""
+        self.client.force_authenticate(user=self.tutor)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('me'))
+        self.assertEqual(response.data['tutor_profile']['subjects'], [{'id': self.subject.id, 'name': 'Mathematics'}])
+    
+    def test_writes_invalidate_the_snapshot(self):
+        """Test that profile updates and subject changes drop the cached snapshot"""
+        self.client.force_authenticate(user=self.tutor)
+        url = reverse('me')
+        self.client.get(url)
+        
+        response = self.client.patch(url, {'bio': 'Number theory'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(url).data['tutor_profile']['bio'], 'Number theory')
+        
+        self.subject.name = 'Algebra'
+        self.subject.save()
+        self.assertEqual(self.client.get(url).data['tutor_profile']['subjects'][0]['name'], 'Algebra')
+        
+        self.tutor.tutor_profile.subjects.clear()
+        self.assertEqual(self.client.get(url).data['tutor_profile']['subjects'], [])
\ No newline at end of file
@@ -0,0 +1,70 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject
+from accounts.models import TutorProfile
+
+User = get_user_model()
+
+
+class ProfileUpdateTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.algebra = Subject.objects.create(name='Algebra')
+        self.biology = Subject.objects.create(name='Biology')
+        self.chemistry = Subject.objects.create(name='Chemistry')
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            first_name='Emmy',
+            role='tutor'
+        )
+        self.profile = TutorProfile.objects.create(user=self.tutor, bio='Algebra', hourly_rate='40.00')
+        self.profile.subjects.add(self.algebra, self.biology)
+        self.client.force_authenticate(user=self.tutor)
+    
+    def patch(self, data):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(reverse('me'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+        ]
+    
+    def test_unchanged_values_write_nothing(self):
+        """Test that a PATCH repeating the current values doesn't write"""
+        writes = self.patch({
+            'first_name': 'Emmy',
+            'bio': 'Algebra',
+            'hourly_rate': '40.00',
+            'subject_ids': [self.biology.id, self.algebra.id],
+        })
+        self.assertEqual(writes, [])
+    
+    def test_only_changed_columns_are_written(self):
+        """Test that the profile update names only the changed columns"""
+        writes = self.patch({'bio': 'Number theory', 'hourly_rate': '40.00'})
+        self.assertEqual(len(writes), 1)
+        self.assertIn('"bio"', writes[0])
+        self.assertIn('"updated_at"', writes[0])
+        self.assertNotIn('"hourly_rate"', writes[0])
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.bio, 'Number theory')
+    
+    def test_subjects_are_updated_by_delta(self):
+        """Test that subject links are added and removed without rewriting the rest"""
+        writes = self.patch({'subject_ids': [self.biology.id, self.chemistry.id, 9999]})
+        links = [sql for sql in writes if 'tutorprofile_subjects' in sql]
+        self.assertEqual(len(links), 2)
+        self.assertTrue(links[0].startswith('INSERT'))
+        self.assertTrue(links[1].startswith('DELETE'))
+        self.assertEqual(
+            set(self.profile.subjects.values_list('name', flat=True)), {'Biology', 'Chemistry'}
+        )
\ No newline at end of file
@@ -0,0 +1,180 @@
+import json
+import re
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject, LessonRequest
+from accounts.models import TutorProfile, StudentProfile
+
+User = get_user_model()
+
+SQLITE_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?( USING (?:COVERING )?INDEX \w+)?')
+
+# Django aliases repeated joins as T2, T3...
+TABLE_ALIAS_RE = re.compile(r'"(\w+)" (T\d+)\b')
+
+
+def explain(sql):
+    """Plan nodes of ``sql``, dicts on PostgreSQL and detail strings on SQLite"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Only fall back to a sequential scan when no index applies
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            nodes, found = [plan[0]['Plan']], []
+            while nodes:
+                node = nodes.pop()
+                found.append(node)
+                nodes.extend(node.get('Plans', []))
+            return found
+        
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_full_scans(sql, allow_index_scans=False):
+    """
+    Tables read whole in the plan of ``sql``. Walking an entire index counts
+    too, unless ``allow_index_scans`` is set.
+    """
+    if connection.vendor == 'postgresql':
+        scans = []
+        for node in explain(sql):
+            full_index_scan = 'Index' in node['Node Type'] and 'Index Cond' not in node
+            if node['Node Type'] == 'Seq Scan' or (full_index_scan and not allow_index_scans):
+                scans.append(node['Relation Name'])
+        return scans
+    
+    aliases = {alias: table for table, alias in TABLE_ALIAS_RE.findall(sql)}
+    with connection.cursor() as cursor:
+        tables = set(connection.introspection.table_names(cursor))
+    scans = []
+    for detail in explain(sql):
+        match = SQLITE_SCAN_RE.match(detail)
+        if not match or (match.group(2) and allow_index_scans):
+            continue
+        table = aliases.get(match.group(1), match.group(1))
+        # Derived tables (COUNT over a subquery) are not stored tables
+        if table in tables:
+            scans.append(table)
+    return scans
+
+
+def plan_sorts(sql):
+    """Sort steps in the plan of ``sql``, rows that no index returns in order"""
+    if connection.vendor == 'postgresql':
+        return [node['Node Type'] for node in explain(sql) if node['Node Type'] in ('Sort', 'Incremental Sort')]
+    return [detail for detail in explain(sql) if detail.startswith('USE TEMP B-TREE') and 'ORDER BY' in detail]
+
+
+class QueryPlanTestCase(TestCase):
+    """Every SELECT an endpoint runs has to be answered from indexes"""
+    # Tables that are meant to be read whole
+    allowed_scans = {'tutoring_subject', 'django_content_type'}
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student)
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        self.profile = TutorProfile.objects.create(user=self.tutor)
+        self.profile.subjects.add(self.subject)
+        
+        self.lesson = LessonRequest.objects.create(
+            student=self.student,
+            tutor=self.tutor,
+            subject=self.subject,
+            start_time='2025-09-01T10:00:00Z',
+            duration_minutes=60
+        )
+    
+    def assertNoFullScans(self, request, allow_index_scans=False, allow_sorts=True):
+        with CaptureQueriesContext(connection) as context:
+            response = request()
+        self.assertLess(response.status_code, 400)
+        
+        selects = [query['sql'] for query in context.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertTrue(selects)
+        for sql in selects:
+            scans = set(plan_full_scans(sql, allow_index_scans)) - self.allowed_scans
+            self.assertFalse(scans, f'Full scan of {", ".join(sorted(scans))} in: {sql}')
+            if not allow_sorts:
+                self.assertFalse(plan_sorts(sql), f'Sort in: {sql}')
+    
+    def test_lesson_request_listings(self):
+        """Test that student and tutor listings seek on the role indexes and read them in order"""
+        url = reverse('lesson-request-list-create')
+        for user, params in [
+            (self.student, {}),
+            (self.tutor, {}),
+            (self.student, {'status': 'pending'}),
+            (self.tutor, {'status': 'approved', 'paginate': 'cursor'}),
+            (self.tutor, {'paginate': 'estimate'}),
+        ]:
+            with self.subTest(role=user.role, **params):
+                self.client.force_authenticate(user=user)
+                self.assertNoFullScans(lambda: self.client.get(url, params), allow_sorts=False)
+    
+    def test_lesson_request_sync(self):
+        """Test that a delta sync seeks on the (user, updated_at) indexes"""
+        self.client.force_authenticate(user=self.tutor)
+        url = reverse('lesson-request-sync')
+        cursor = self.client.get(url).data['cursor']
+        self.assertNoFullScans(lambda: self.client.get(url, {'cursor': cursor}))
+    
+    def test_lesson_request_updates(self):
+        """Test that single and bulk status updates seek on indexes"""
+        self.client.force_authenticate(user=self.tutor)
+        url = reverse('lesson-request-update', kwargs={'pk': self.lesson.id})
+        self.assertNoFullScans(lambda: self.client.patch(url, {'status': 'rejected'}))
+        
+        LessonRequest.objects.filter(pk=self.lesson.id).update(status='pending')
+        url = reverse('lesson-request-bulk-status')
+        self.assertNoFullScans(lambda: self.client.post(
+            url, {'status': 'approved', 'subject_id': self.subject.id}, format='json'
+        ))
+    
+    def test_schedule_lookups(self):
+        """Test that conflict and availability lookups seek on indexes"""
+        self.client.force_authenticate(user=self.student)
+        url = reverse('tutor-conflicts', kwargs={'pk': self.profile.id})
+        self.assertNoFullScans(lambda: self.client.get(
+            url, {'start': '2025-09-01T10:30:00Z', 'duration_minutes': 60}
+        ))
+        
+        url = reverse('subject-availability', kwargs={'pk': self.subject.id})
+        self.assertNoFullScans(lambda: self.client.get(
+            url, {'from': '2025-09-01T00:00:00Z', 'to': '2025-09-08T00:00:00Z'}
+        ))
+    
+    def test_admin_changelist(self):
+        """Test that the admin changelist walks the created_at index instead of the table"""
+        admin = User.objects.create_superuser(
+            username='admin@test.com',
+            email='admin@test.com',
+            password='TestPass123!'
+        )
+        self.client.force_login(admin)
+        url = reverse('admin:tutoring_lessonrequest_changelist')
+        # Paging the whole changelist reads an index in order, never the bare table
+        self.assertNoFullScans(lambda: self.client.get(url), allow_index_scans=True)
+        self.assertNoFullScans(lambda: self.client.get(url, {'status__exact': 'pending'}), allow_index_scans=True)
\ No newline at end of file
@@ -0,0 +1,99 @@
+import os
+import tempfile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth import get_user_model
+from picourse.ratelimit import BucketTable, default_bucket_path
+
+User = get_user_model()
+
+POLICIES = [
+    {'name': 'login', 'path': r'^/api/auth/login/$', 'methods': ['POST'], 'rate': '1/min', 'burst': 2},
+    {
+        'name': 'tutor-search', 'path': r'^/api/tutors/$', 'params': ['search'],
+        'rate': '1/min', 'burst': 1, 'identity': 'user',
+    },
+]
+
+
+class BucketTableTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'buckets')
+    
+    def test_bucket_refills_over_time(self):
+        """Test that a bucket allows its burst, then one request per refill"""
+        table = BucketTable(self.path, slots=64)
+        self.assertEqual(table.take('a', rate=1, burst=2, now=100), 0)
+        self.assertEqual(table.take('a', rate=1, burst=2, now=100), 0)
+        self.assertAlmostEqual(table.take('a', rate=1, burst=2, now=100), 1)
+        self.assertEqual(table.take('a', rate=1, burst=2, now=101), 0)
+        # Other keys have their own bucket
+        self.assertEqual(table.take('b', rate=1, burst=2, now=101), 0)
+    
+    def test_buckets_are_shared_through_the_file(self):
+        """Test that tables mapping the same file share their buckets"""
+        first = BucketTable(self.path, slots=64)
+        second = BucketTable(self.path, slots=64)
+        self.assertEqual(first.take('a', rate=1, burst=1, now=100), 0)
+        self.assertGreater(second.take('a', rate=1, burst=1, now=100), 0)
+    
+    def test_default_file_is_per_checkout(self):
+        """Test that checkouts in other directories get their own default table"""
+        path = default_bucket_path()
+        with override_settings(BASE_DIR=self.path):
+            self.assertNotEqual(default_bucket_path(), path)
+
+
+class RateLimitMiddlewareTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = directory.name
+        settings = override_settings(
+            RATE_LIMIT_ENABLED=True,
+            RATE_LIMIT_FILE=os.path.join(directory.name, 'buckets'),
+            RATE_LIMITS=POLICIES
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client = APIClient()
+    
+    def test_login_is_throttled_before_any_query(self):
+        """Test that rejected logins get a 429 without touching the database"""
+        data = {'email': 'nobody@test.com', 'password': 'wrong'}
+        for _ in range(2):
+            response = self.client.post(reverse('login'), data)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse('login'), data)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '60')
+    
+    def test_search_is_limited_per_user(self):
+        """Test that each token gets its own bucket and other routes aren't limited"""
+        url = reverse('tutor-list')
+        tokens = []
+        for email in ['first@test.com', 'second@test.com']:
+            user = User.objects.create_user(username=email, email=email, password='TestPass123!', role='student')
+            tokens.append(str(AccessToken.for_user(user)))
+        
+        for token in tokens:
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            self.assertEqual(self.client.get(url, {'search': 'math'}).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(url, {'search': 'math'}).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+    
+    def test_unusable_table_fails_open(self):
+        """Test that requests go through, with an error logged, when the table can't be opened"""
+        url = reverse('tutor-list')
+        with override_settings(RATE_LIMIT_FILE=os.path.join(self.path, 'missing', 'buckets')):
+            with self.assertLogs('picourse.ratelimit', level='ERROR'):
+                self.assertEqual(self.client.get(url, {'search': 'math'}).status_code, status.HTTP_200_OK)
+            for _ in range(2):
+                self.assertEqual(self.client.get(url, {'search': 'math'}).status_code, status.HTTP_200_OK)
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import time
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from accounts.models import StudentProfile
+from accounts.revocation import BloomFilter, RevocationLog
+
+User = get_user_model()
+
+
+class RevocationLogTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'revoked.log')
+    
+    def test_bloom_filter_has_no_false_negatives(self):
+        """Test that every added item is reported present"""
+        bloom = BloomFilter(1000)
+        items = [f'jti-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+        false_positives = sum(f'other-{i}' in bloom for i in range(1000))
+        self.assertLess(false_positives, 20)
+    
+    def test_revocations_are_seen_by_other_processes(self):
+        """Test that a log picks up lines appended through another instance"""
+        exp = time.time() + 3600
+        first = RevocationLog(self.path, capacity=1000)
+        second = RevocationLog(self.path, capacity=1000)
+        self.assertFalse(second.is_revoked('a'))
+        
+        self.assertTrue(first.revoke('a', exp))
+        self.assertTrue(second.is_revoked('a'))
+        # Revoking twice, from anywhere, is refused
+        self.assertFalse(second.revoke('a', exp))
+        self.assertFalse(first.is_revoked('b'))
+    
+    def test_compaction_drops_expired_entries(self):
+        """Test that compaction keeps live entries and other instances reload the file"""
+        now = time.time()
+        first = RevocationLog(self.path, capacity=1000)
+        second = RevocationLog(self.path, capacity=1000)
+        first.revoke('expired', now - 10)
+        first.revoke('live', now + 3600)
+        self.assertTrue(second.is_revoked('expired'))
+        
+        self.assertEqual(first.compact(now), (1, 1))
+        with open(self.path) as log:
+            self.assertEqual(log.read(), f'live {int(now + 3600)}\n')
+        self.assertTrue(second.is_revoked('live'))
+        self.assertFalse(second.is_revoked('expired'))
+    
+    def test_log_compacts_itself_when_it_grows(self):
+        """Test that revoking past the size threshold drops expired entries"""
+        log = RevocationLog(self.path, capacity=1000, compact_bytes=200)
+        for i in range(20):
+            log.revoke(f'old-{i}', time.time() - 10)
+        self.assertLess(os.path.getsize(self.path), 200)
+
+
+class TokenRefreshRevocationTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(TOKEN_REVOCATION_LOG=os.path.join(directory.name, 'revoked.log'))
+        settings.enable()
+        self.addCleanup(settings.disable)
+        
+        self.client = APIClient()
+        student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=student)
+    
+    def test_rotated_refresh_token_is_revoked(self):
+        """Test that a refresh token can't be used again after rotation"""
+        response = self.client.post(reverse('login'), {'email': 'student@test.com', 'password': 'TestPass123!'})
+        refresh = response.data['refresh']
+        
+        response = self.client.post(reverse('token_refresh'), {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        rotated = response.data['refresh']
+        self.assertNotEqual(rotated, refresh)
+        
+        response = self.client.post(reverse('token_refresh'), {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        response = self.client.post(reverse('token_refresh'), {'refresh': rotated})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
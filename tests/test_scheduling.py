@@ -0,0 +1,107 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject, LessonRequest
+from accounts.models import TutorProfile, StudentProfile
+
+User = get_user_model()
+
+
+class ScheduleConflictTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student)
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        self.profile = TutorProfile.objects.create(user=self.tutor)
+        
+        # Approved 10:00-11:30
+        self.approved = self.create('2025-09-01T10:00:00Z', 90, status='approved')
+    
+    def create(self, start_time, duration_minutes, status='pending'):
+        return LessonRequest.objects.create(
+            student=self.student,
+            tutor=self.tutor,
+            subject=self.subject,
+            start_time=start_time,
+            duration_minutes=duration_minutes,
+            status=status
+        )
+    
+    def test_end_time_is_stored(self):
+        """Test that end_time follows start_time and duration"""
+        self.approved.refresh_from_db()
+        self.assertEqual(self.approved.end_time.isoformat(), '2025-09-01T11:30:00+00:00')
+    
+    def test_create_rejects_overlapping_slot(self):
+        """Test that a request overlapping an approved lesson is refused"""
+        self.client.force_authenticate(user=self.student)
+        data = {
+            'tutor_id': self.tutor.id,
+            'subject_id': self.subject.id,
+            'start_time': '2025-09-01T11:00:00Z',
+            'duration_minutes': 60,
+        }
+        response = self.client.post(reverse('lesson-request-list-create'), data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('start_time', response.data)
+        
+        # Back-to-back lessons don't overlap
+        data['start_time'] = '2025-09-01T11:30:00Z'
+        response = self.client.post(reverse('lesson-request-list-create'), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+    
+    def test_approve_rejects_overlap(self):
+        """Test that approving a double-booked slot fails"""
+        pending = self.create('2025-09-01T09:30:00Z', 60)
+        self.client.force_authenticate(user=self.tutor)
+        response = self.client.patch(
+            reverse('lesson-request-update', kwargs={'pk': pending.id}),
+            {'status': 'approved'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_bulk_approve_reports_conflicts(self):
+        """Test that bulk approval skips slots that collide"""
+        clash = self.create('2025-09-01T11:00:00Z', 30)
+        first = self.create('2025-09-01T12:00:00Z', 60)
+        second = self.create('2025-09-01T12:30:00Z', 60)
+        
+        self.client.force_authenticate(user=self.tutor)
+        response = self.client.post(reverse('lesson-request-bulk-status'), {
+            'status': 'approved',
+            'ids': [clash.id, first.id, second.id],
+        }, format='json')
+        self.assertEqual([row['result'] for row in response.data['results']], ['conflict', 'updated', 'conflict'])
+    
+    def test_conflicts_endpoint(self):
+        """Test querying the conflicts of a candidate slot"""
+        pending = self.create('2025-09-01T12:00:00Z', 60)
+        self.client.force_authenticate(user=self.student)
+        url = reverse('tutor-conflicts', kwargs={'pk': self.profile.pk})
+        
+        response = self.client.get(url, {'start': '2025-09-01T11:00:00Z', 'duration_minutes': 120})
+        self.assertEqual([row['id'] for row in response.data['conflicts']], [self.approved.id])
+        
+        response = self.client.get(url, {
+            'start': '2025-09-01T11:00:00Z', 'end': '2025-09-01T13:00:00Z', 'include_pending': 'true'
+        })
+        self.assertEqual([row['id'] for row in response.data['conflicts']], [self.approved.id, pending.id])
+        
+        response = self.client.get(url, {'start': '2025-09-01T11:00:00Z'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
@@ -0,0 +1,77 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from accounts.models import TutorProfile
+from tutoring import search
+
+User = get_user_model()
+
+
+class TutorSearchTestCase(TestCase):
+    def setUp(self):
+        caches['catalog'].clear()
+        self.client = APIClient()
+        self.physicist = self.create_tutor('physicist@test.com', 'Marie', 'Curie', 'Physics and chemistry lessons', 4.9)
+        self.mathematician = self.create_tutor('math@test.com', 'Emmy', 'Noether', 'Algebra tutor, some physics too', 4.5)
+        self.linguist = self.create_tutor('english@test.com', 'Noam', 'Physick', 'English grammar', 3.0)
+    
+    def create_tutor(self, email, first_name, last_name, bio, rating):
+        user = User.objects.create_user(
+            username=email,
+            email=email,
+            password='TestPass123!',
+            first_name=first_name,
+            last_name=last_name,
+            role='tutor'
+        )
+        return TutorProfile.objects.create(user=user, bio=bio, rating=rating)
+    
+    def search(self, text, **params):
+        response = self.client.get(reverse('tutor-list'), {'search': text, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [tutor['id'] for tutor in response.data['results']]
+    
+    def test_prefix_search_ranks_name_matches_first(self):
+        """Test that name matches outrank bio matches"""
+        ids = self.search('phys')
+        self.assertEqual(set(ids), {self.physicist.id, self.mathematician.id, self.linguist.id})
+        self.assertEqual(ids[0], self.linguist.id)
+    
+    def test_all_terms_must_match(self):
+        """Test that every search term has to match"""
+        self.assertEqual(self.search('physics algebra'), [self.mathematician.id])
+        self.assertEqual(self.search('nonexistent'), [])
+    
+    def test_explicit_ordering_overrides_rank(self):
+        """Test that an explicit ordering is applied to search results"""
+        ids = self.search('phys', ordering='-rating')
+        self.assertEqual(ids, [self.physicist.id, self.mathematician.id, self.linguist.id])
+    
+    def test_index_follows_profile_and_user_updates(self):
+        """Test that the index is kept in sync with writes"""
+        self.physicist.bio = 'Biology'
+        self.physicist.save()
+        self.assertNotIn(self.physicist.id, self.search('chemistry'))
+        
+        user = self.linguist.user
+        user.first_name = 'Ada'
+        user.save()
+        self.assertEqual(self.search('ada'), [self.linguist.id])
+        
+        self.mathematician.delete()
+        self.assertEqual(self.search('noether'), [])
+    
+    def test_rebuild_command(self):
+        """Test that the rebuild command repopulates the index"""
+        with connection.cursor() as cursor:
+            search.get_backend().clear(cursor)
+        self.assertEqual(self.search('curie'), [])
+        
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('curie'), [self.physicist.id])
\ No newline at end of file
@@ -0,0 +1,139 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from tutoring.models import Subject, LessonRequest, LessonRequestTombstone
+from tutoring.sync import prune_tombstones
+from accounts.models import TutorProfile, StudentProfile
+
+User = get_user_model()
+
+
+class LessonRequestSyncTestCase(TestCase):
+    def setUp(self):
+        settle = patch('tutoring.sync.SETTLE_TIME', timedelta(0))
+        settle.start()
+        self.addCleanup(settle.stop)
+        
+        self.client = APIClient()
+        self.subject = Subject.objects.create(name='Mathematics')
+        
+        self.student = User.objects.create_user(
+            username='student@test.com',
+            email='student@test.com',
+            password='TestPass123!',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student)
+        self.client.force_authenticate(user=self.student)
+        
+        self.tutor = User.objects.create_user(
+            username='tutor@test.com',
+            email='tutor@test.com',
+            password='TestPass123!',
+            role='tutor'
+        )
+        TutorProfile.objects.create(user=self.tutor)
+        
+        self.lessons = [self.create(day) for day in range(1, 6)]
+    
+    def create(self, day):
+        return LessonRequest.objects.create(
+            student=self.student,
+            tutor=self.tutor,
+            subject=self.subject,
+            start_time=f'2025-09-0{day}T10:00:00Z',
+            duration_minutes=60
+        )
+    
+    def sync(self, **params):
+        response = self.client.get(reverse('lesson-request-sync'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+    
+    def test_first_sync_pages_through_everything(self):
+        """Test that a first sync returns every row, in pages"""
+        page = self.sync(limit=3)
+        self.assertTrue(page['has_more'])
+        ids = [row['id'] for row in page['changed']]
+        
+        page = self.sync(limit=3, cursor=page['cursor'])
+        self.assertFalse(page['has_more'])
+        ids += [row['id'] for row in page['changed']]
+        self.assertEqual(ids, [lesson.id for lesson in self.lessons])
+        self.assertEqual(page['deleted'], [])
+    
+    def test_steady_state_returns_only_changes(self):
+        """Test that later syncs return updates, new rows and deletions only"""
+        cursor = self.sync()['cursor']
+        self.assertEqual(self.sync(cursor=cursor)['changed'], [])
+        
+        self.lessons[1].status = 'approved'
+        self.lessons[1].save(update_fields=['status', 'updated_at'])
+        created = self.create(6)
+        deleted_id = self.lessons[3].id
+        self.lessons[3].delete()
+        
+        with self.assertNumQueries(2):
+            page = self.sync(cursor=cursor)
+        self.assertEqual([row['id'] for row in page['changed']], [self.lessons[1].id, created.id])
+        self.assertEqual(page['changed'][0]['status'], 'approved')
+        self.assertEqual(page['deleted'], [deleted_id])
+        
+        page = self.sync(cursor=page['cursor'])
+        self.assertEqual((page['changed'], page['deleted']), ([], []))
+    
+    def test_recent_changes_wait_for_the_settle_time(self):
+        """Test that rows saved within the settle time are left for the next call"""
+        with patch('tutoring.sync.SETTLE_TIME', timedelta(minutes=5)):
+            page = self.sync()
+        self.assertEqual(page['changed'], [])
+        self.assertEqual(len(self.sync(cursor=page['cursor'])['changed']), 5)
+    
+    def test_cursor_is_bound_to_the_role(self):
+        """Test that a cursor can't be replayed for the other role or modified"""
+        cursor = self.sync()['cursor']
+        response = self.client.get(reverse('lesson-request-sync'), {'cursor': cursor, 'role': 'tutor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('lesson-request-sync'), {'cursor': cursor[:-2] + 'xx'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_regular_syncs_keep_the_cursor_fresh(self):
+        """Test that a cursor moves on with each sync even when nothing was deleted"""
+        cursor = self.sync()['cursor']
+        for days in (20, 40):
+            with patch('tutoring.sync.timezone.now', return_value=timezone.now() + timedelta(days=days)):
+                cursor = self.sync(cursor=cursor)['cursor']
+    
+    def test_old_cursor_requires_a_resync(self):
+        """Test that tombstones are pruned after the retention and older cursors are refused"""
+        cursor = self.sync()['cursor']
+        deleted_id = self.lessons[0].id
+        self.lessons[0].delete()
+        with patch('tutoring.sync.timezone.now', return_value=timezone.now() + timedelta(days=20)):
+            page = self.sync(cursor=cursor)
+        self.assertEqual(page['deleted'], [deleted_id])
+        cursor = page['cursor']
+        
+        # Past the 30 days retention of the last sync
+        later = timezone.now() + timedelta(days=55)
+        with patch('tutoring.sync.timezone.now', return_value=later):
+            self.assertEqual(prune_tombstones(), 1)
+            response = self.client.get(reverse('lesson-request-sync'), {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_410_GONE)
+            self.assertEqual(response.data['code'], 'resync_required')
+            # Syncing from scratch works again
+            self.assertNotIn(deleted_id, [row['id'] for row in self.sync()['changed']])
+    
+    def test_archiving_leaves_no_tombstones(self):
+        """Test that archived requests are not reported as deleted"""
+        LessonRequest.objects.filter(id=self.lessons[0].id).update(end_time='2020-01-01T00:00:00Z')
+        call_command('archive_lesson_requests', '--days=30', stdout=StringIO())
+        self.assertFalse(LessonRequest.objects.filter(id=self.lessons[0].id).exists())
+        self.assertFalse(LessonRequestTombstone.objects.exists())
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Subject, LessonRequest
+from .models import Subject, LessonRequest, ArchivedLessonRequest, TutorWorkingHours
 
 
 @admin.register(Subject)
@@ -14,3 +14,23 @@ class LessonRequestAdmin(admin.ModelAdmin):
     list_filter = ['status', 'subject', 'created_at']
     search_fields = ['student__email', 'tutor__email', 'subject__name']
     date_hierarchy = 'created_at'
+
+
+@admin.register(ArchivedLessonRequest)
+class ArchivedLessonRequestAdmin(admin.ModelAdmin):
+    list_display = ['id', 'student', 'tutor', 'subject', 'start_time', 'status', 'archived_at']
+    list_filter = ['status']
+    search_fields = ['student__email', 'tutor__email']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TutorWorkingHours)
+class TutorWorkingHoursAdmin(admin.ModelAdmin):
+    list_display = ['tutor', 'weekday', 'start_time', 'end_time']
+    list_filter = ['weekday']
+    search_fields = ['tutor__user__email']
\ No newline at end of file
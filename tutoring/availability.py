@@ -0,0 +1,104 @@
+"""
+Free-slot computation for tutors.
+
+Weekly working hours are expanded into concrete windows for the requested
+range, then the approved lessons are subtracted in a single sweep over both
+lists sorted by (tutor, start). Several tutors are handled in the same sweep,
+so a subject's whole tutor list costs one query for the working hours and one
+for the lessons.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from .models import LessonRequest, TutorWorkingHours
+from .scheduling import BLOCKING_STATUSES, MAX_DURATION
+
+MAX_RANGE = timedelta(days=31)
+
+
+def working_windows(rules, start, end):
+    """
+    Expand ``(key, weekday, start_time, end_time)`` rules into
+    ``(key, window_start, window_end)`` tuples clipped to [start, end).
+    Rule times are UTC wall clock times.
+    """
+    by_weekday = {}
+    for key, weekday, start_time, end_time in rules:
+        by_weekday.setdefault(weekday, []).append((key, start_time, end_time))
+    
+    windows = []
+    day = start.astimezone(dt_timezone.utc).date()
+    last_day = end.astimezone(dt_timezone.utc).date()
+    while day <= last_day:
+        for key, start_time, end_time in by_weekday.get(day.weekday(), ()):
+            window_start = max(datetime.combine(day, start_time, dt_timezone.utc), start)
+            window_end = min(datetime.combine(day, end_time, dt_timezone.utc), end)
+            if window_start < window_end:
+                windows.append((key, window_start, window_end))
+        day += timedelta(days=1)
+    windows.sort()
+    return windows
+
+
+def free_slots(windows, busy, duration):
+    """
+    Subtract ``busy`` from ``windows`` and keep the gaps of at least ``duration``.
+    
+    Both inputs are ``(key, start, end)`` tuples sorted by (key, start); the
+    result is a list of ``(key, start, end)`` gaps in the same order.
+    """
+    slots = []
+    index = 0
+    for key, window_start, window_end in windows:
+        # Skip busy intervals of earlier keys or that ended before this window
+        while index < len(busy) and (
+            busy[index][0] < key or (busy[index][0] == key and busy[index][2] <= window_start)
+        ):
+            index += 1
+        
+        cursor = window_start
+        position = index
+        while position < len(busy):
+            busy_key, busy_start, busy_end = busy[position]
+            if busy_key != key or busy_start >= window_end:
+                break
+            if busy_start - cursor >= duration:
+                slots.append((key, cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            position += 1
+        if window_end - cursor >= duration:
+            slots.append((key, cursor, window_end))
+    return slots
+
+
+def tutor_availability(tutors, start, end, duration):
+    """
+    Free slots of several tutor profiles, returns ``{profile_id: [(start, end), ...]}``.
+    
+    ``tutors`` is a list of ``(profile_id, user_id)`` pairs.
+    """
+    profile_ids = {profile_id: user_id for profile_id, user_id in tutors}
+    rules = TutorWorkingHours.objects.filter(tutor_id__in=profile_ids).values_list(
+        'tutor_id', 'weekday', 'start_time', 'end_time'
+    )
+    windows = [
+        (profile_ids[profile_id], window_start, window_end)
+        for profile_id, window_start, window_end in working_windows(rules, start, end)
+    ]
+    
+    busy = []
+    if windows:
+        # Bounded range scan of the (tutor, status, start_time) index
+        busy = list(LessonRequest.objects.filter(
+            tutor_id__in={key for key, _, _ in windows},
+            status__in=BLOCKING_STATUSES,
+            start_time__gt=start - MAX_DURATION,
+            start_time__lt=end,
+            end_time__gt=start,
+        ).order_by('tutor_id', 'start_time').values_list('tutor_id', 'start_time', 'end_time'))
+    windows.sort()
+    
+    availability = {profile_id: [] for profile_id in profile_ids}
+    by_user = {user_id: profile_id for profile_id, user_id in profile_ids.items()}
+    for user_id, slot_start, slot_end in free_slots(windows, busy, duration):
+        availability[by_user[user_id]].append((slot_start, slot_end))
+    return availability
\ No newline at end of file
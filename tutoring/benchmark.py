@@ -0,0 +1,155 @@
+"""
+Endpoint benchmarks against the generated load data.
+
+Every scenario sends the same request through the test client, so the
+whole middleware stack runs, first a few times to warm up and then
+``requests`` times measured. A scenario's result holds the p50 and p95
+latency, the most queries any request made and the size of the response.
+Results are plain JSON: a run can be saved as a baseline and a later run
+compared against it, where latency or size growing past a threshold, any
+extra query or a different status code count as regressions.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import StudentProfile, TutorProfile
+from accounts.serializers import ClaimsTokenObtainPairSerializer
+from .loadgen import LOAD_EMAIL_DOMAIN, LOAD_PASSWORD
+from .models import LessonRequest
+
+User = get_user_model()
+
+# ``user`` is whose access token is sent, ``login`` posts their credentials instead
+SCENARIOS = [
+    {'name': 'tutor-list', 'url': 'tutor-list'},
+    {'name': 'tutor-search', 'url': 'tutor-list', 'params': {'search': 'exam preparation'}},
+    {'name': 'lesson-requests-student', 'url': 'lesson-request-list-create', 'user': 'student'},
+    {'name': 'lesson-requests-tutor', 'url': 'lesson-request-list-create', 'user': 'tutor'},
+    {'name': 'me', 'url': 'me', 'user': 'tutor'},
+    {'name': 'login', 'url': 'login', 'method': 'post', 'login': 'tutor'},
+]
+SCENARIO_NAMES = [scenario['name'] for scenario in SCENARIOS]
+# Latency differences below this are noise, whatever the threshold
+LATENCY_NOISE_MS = 1.0
+# Caches the scenarios read, what ``cold`` clears. The others hold state such
+# as deactivated users, which clearing would lose
+COLD_CACHES = ('catalog', 'profile')
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile"""
+    values = sorted(values)
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def busiest_user(role, seed):
+    """The generated user of ``role`` with the most lesson requests, the worst case for listings"""
+    related = 'tutor_lesson_requests' if role == 'tutor' else 'student_lesson_requests'
+    return User.objects.filter(
+        role=role, email__endswith=f'.{seed}@{LOAD_EMAIL_DOMAIN}'
+    ).annotate(lessons=Count(related)).order_by('-lessons', 'id').first()
+
+
+def shared_cold_caches():
+    """Aliases of ``COLD_CACHES`` whose backend other processes may share, which ``cold`` must not clear"""
+    return [alias for alias in COLD_CACHES if settings.CACHES[alias]['BACKEND'] not in LOCAL_CACHE_BACKENDS]
+
+
+def dataset_size():
+    return {
+        'tutors': TutorProfile.objects.count(),
+        'students': StudentProfile.objects.count(),
+        'lessons': LessonRequest.objects.count(),
+    }
+
+
+def run_scenario(client, scenario, user, password, requests, warmup, cold):
+    kwargs = {'data': scenario.get('params')}
+    if scenario.get('login'):
+        kwargs = {'data': {'email': user.email, 'password': password}, 'content_type': 'application/json'}
+    elif scenario.get('user'):
+        access = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        kwargs['HTTP_AUTHORIZATION'] = f'Bearer {access}'
+    send = getattr(client, scenario.get('method', 'get'))
+    url = reverse(scenario['url'])
+    
+    timings, queries, sizes = [], [], []
+    for number in range(warmup + requests):
+        if cold:
+            for alias in COLD_CACHES:
+                caches[alias].clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = send(url, **kwargs)
+            elapsed = time.perf_counter() - started
+        if number >= warmup:
+            timings.append(elapsed * 1000)
+            queries.append(len(captured))
+            sizes.append(len(response.content))
+    
+    return {
+        'status': response.status_code,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'queries': max(queries),
+        'bytes': percentile(sizes, 50),
+    }
+
+
+def run_benchmarks(names=None, requests=50, warmup=5, cold=False, seed=0, password=LOAD_PASSWORD):
+    """
+    Run the scenarios called ``names``, or all of them. ``cold`` clears the
+    catalog and profile caches before each request, so cached endpoints do
+    their full work, and is refused when those are shared with other processes.
+    """
+    if cold and shared_cold_caches():
+        raise ValueError(f"Won't clear shared caches: {', '.join(shared_cold_caches())}")
+    users = {role: busiest_user(role, seed) for role in ('student', 'tutor')}
+    client = Client()
+    scenarios = {}
+    # Requests come from one client, which the rate limits would soon turn away
+    with override_settings(RATE_LIMIT_ENABLED=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        for scenario in SCENARIOS:
+            if names and scenario['name'] not in names:
+                continue
+            user = users[scenario.get('login') or scenario.get('user') or 'tutor']
+            scenarios[scenario['name']] = run_scenario(client, scenario, user, password, requests, warmup, cold)
+    return {
+        'dataset': dataset_size(),
+        'requests': requests,
+        'cold': cold,
+        'scenarios': scenarios,
+    }
+
+
+def compare(baseline, results, threshold):
+    """Regressions of ``results`` against ``baseline``, ``threshold`` is in percent"""
+    regressions = []
+    limit = 1 + threshold / 100
+    for name, result in results['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if before is None:
+            continue
+        if result['status'] != before['status']:
+            regressions.append(f"{name}: status {before['status']} -> {result['status']}")
+        for key in ('p50_ms', 'p95_ms'):
+            if result[key] > before[key] * limit and result[key] - before[key] > LATENCY_NOISE_MS:
+                regressions.append(f'{name}: {key} {before[key]} -> {result[key]}')
+        if result['queries'] > before['queries']:
+            regressions.append(f"{name}: queries {before['queries']} -> {result['queries']}")
+        if result['bytes'] > before['bytes'] * limit:
+            regressions.append(f"{name}: bytes {before['bytes']} -> {result['bytes']}")
+    return regressions
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+Versioned response cache for the public catalog endpoints.
+
+Every cache key embeds the current catalog version. Writes to tutors,
+subjects or tutor names bump the version, which orphans all cached pages at
+once instead of deleting them one by one; the backend evicts them later.
+"""
+import hashlib
+import json
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+CATALOG_CACHE = 'catalog'
+CATALOG_VERSION_KEY = 'catalog:version'
+
+
+def get_catalog_version():
+    cache = caches[CATALOG_CACHE]
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Start from the clock so an evicted counter never reuses an old version
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY, 0)
+    return version
+
+
+def _bump():
+    cache = caches[CATALOG_CACHE]
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog response"""
+    # Bump right away so this process stops serving old pages, and again on
+    # commit to drop pages another request cached from pre-commit reads.
+    _bump()
+    transaction.on_commit(_bump)
+
+
+class CatalogCacheMixin:
+    """Serves GET responses from the catalog cache, keyed on the listed query params"""
+    cache_query_params = ()
+    
+    def get_cache_key(self, request):
+        # Values are keyed exactly as sent, the views read them unnormalized
+        # and may resolve a padded or invalid value to something else
+        params = sorted(
+            (name, value)
+            for name in self.cache_query_params
+            for value in request.query_params.getlist(name)
+        )
+        raw = json.dumps([request.scheme, request.get_host(), request.path, params])
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        return f'catalog:{get_catalog_version()}:{digest}'
+    
+    def get(self, request, *args, **kwargs):
+        cache = caches[CATALOG_CACHE]
+        key = self.get_cache_key(request)
+        
+        data = cache.get(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            # Store plain JSON data, the serializer's return types hold a reference to it
+            cache.set(key, json.loads(JSONRenderer().render(response.data)))
+        response['X-Cache'] = 'MISS'
+        return response
\ No newline at end of file
@@ -0,0 +1,264 @@
+"""
+Server-sent lesson-request events.
+
+Every ASGI worker keeps an in-process broker that maps user ids to the
+queues of their open streams. A backend carries published events to the
+brokers: LocalBackend hands them straight to this process's broker, and
+RedisBackend fans them out to every worker through a Redis channel.
+
+The stream itself is a bare ASGI app mounted next to Django in
+``picourse/asgi.py``, so an idle connection costs one queue and one
+coroutine, and no thread or database connection.
+"""
+import asyncio
+import json
+import logging
+import threading
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+EVENTS_PATH = '/api/events/'
+KEEPALIVE_SECONDS = 15
+QUEUE_SIZE = 100
+# Seconds before restarting a failed Redis listener, doubling up to the second
+LISTENER_BACKOFF = (1, 60)
+
+logger = logging.getLogger(__name__)
+
+
+class Broker:
+    """Per-process fan-out from user ids to the queues of their open streams"""
+    
+    def __init__(self):
+        self.subscribers = {}
+        self.lock = threading.Lock()
+    
+    def subscribe(self, user_id):
+        # Called from the event loop that will read the queue
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self.lock:
+            self.subscribers.setdefault(user_id, {})[queue] = asyncio.get_running_loop()
+        return queue
+    
+    def unsubscribe(self, user_id, queue):
+        with self.lock:
+            queues = self.subscribers.get(user_id, {})
+            queues.pop(queue, None)
+            if not queues:
+                self.subscribers.pop(user_id, None)
+    
+    def deliver(self, user_ids, event):
+        """Queue ``event`` for the users' streams, safe to call from any thread"""
+        with self.lock:
+            targets = [
+                (queue, loop)
+                for user_id in user_ids
+                for queue, loop in self.subscribers.get(user_id, {}).items()
+            ]
+        for queue, loop in targets:
+            loop.call_soon_threadsafe(self.put, queue, event)
+    
+    @staticmethod
+    def put(queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled client misses events and resyncs from the listing
+            pass
+
+
+broker = Broker()
+
+
+class LocalBackend:
+    """Delivers to streams of this process only, for a single worker and for tests"""
+    
+    def publish(self, user_ids, event):
+        broker.deliver(user_ids, event)
+    
+    async def start(self):
+        pass
+
+
+class RedisBackend:
+    """Fans events out to every worker through a Redis pub/sub channel"""
+    channel = 'picourse:lesson-events'
+    
+    def __init__(self, url=None):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            raise ImproperlyConfigured('RedisBackend needs the redis package')
+        self.redis = redis
+        self.url = url or settings.LESSON_EVENTS_REDIS_URL
+        self.client = redis.Redis.from_url(self.url)
+        self.listener = None
+    
+    def publish(self, user_ids, event):
+        self.client.publish(self.channel, json.dumps({'users': list(user_ids), 'event': event}))
+    
+    async def start(self):
+        # One subscription per worker, shared by all of its streams
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.ensure_future(self.supervise())
+    
+    async def supervise(self):
+        """Keep the listener running, restarting it with a growing delay when it fails"""
+        self.delay = LISTENER_BACKOFF[0]
+        while True:
+            try:
+                await self.listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Lesson event listener failed, restarting in %s s', self.delay)
+            else:
+                logger.warning('Lesson event listener stopped, restarting in %s s', self.delay)
+            await asyncio.sleep(self.delay)
+            self.delay = min(self.delay * 2, LISTENER_BACKOFF[1])
+    
+    async def listen(self):
+        client = self.redis.asyncio.Redis.from_url(self.url)
+        async with client.pubsub() as pubsub:
+            await pubsub.subscribe(self.channel)
+            # Subscribed again, the next failure starts over from the shortest delay
+            self.delay = LISTENER_BACKOFF[0]
+            async for message in pubsub.listen():
+                if message['type'] == 'message':
+                    payload = json.loads(message['data'])
+                    broker.deliver(payload['users'], payload['event'])
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = import_string(settings.LESSON_EVENTS_BACKEND)()
+    return _backend
+
+
+def lesson_request_event(event_type, lesson_id, status, student_id, tutor_id, start_time):
+    return {
+        'type': f'lesson_request.{event_type}',
+        'id': lesson_id,
+        'status': status,
+        'student_id': student_id,
+        'tutor_id': tutor_id,
+        'start_time': start_time,
+    }
+
+
+def publish_lesson_events(events):
+    """Publish events to their student and tutor once the transaction commits"""
+    # Round-trip through JSON so every backend gets the same plain payload
+    events = json.loads(json.dumps(list(events), cls=DjangoJSONEncoder))
+    if not events:
+        return
+    
+    def publish():
+        backend = get_backend()
+        for event in events:
+            backend.publish({event['student_id'], event['tutor_id']}, event)
+    transaction.on_commit(publish)
+
+
+def authenticate_scope(scope):
+    """
+    User id from a Bearer header or a ``token`` query parameter (EventSource
+    can't set headers), None if missing, invalid or of an inactive user
+    """
+    from rest_framework_simplejwt.exceptions import TokenError
+    from rest_framework_simplejwt.settings import api_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+    from accounts.authentication import is_user_inactive
+    
+    token = None
+    for name, value in scope.get('headers', []):
+        if name == b'authorization' and value.startswith(b'Bearer '):
+            token = value[len(b'Bearer '):].decode('latin-1')
+    if token is None:
+        token = parse_qs(scope.get('query_string', b'').decode('latin-1')).get('token', [None])[0]
+    if not token:
+        return None
+    
+    try:
+        user_id = AccessToken(token)[api_settings.USER_ID_CLAIM]
+    except (TokenError, KeyError):
+        return None
+    # Deactivated and deleted users are turned away like on the API
+    if is_user_inactive(user_id):
+        return None
+    return user_id
+
+
+async def send_json(send, status, body):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json')],
+    })
+    await send({'type': 'http.response.body', 'body': json.dumps(body).encode()})
+
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def events_app(scope, receive, send):
+    """ASGI app streaming the lesson-request events of the authenticated user"""
+    if scope['method'] != 'GET':
+        await send_json(send, 405, {'detail': 'Method not allowed.'})
+        return
+    # The inactive check may hit a shared cache, keep it off the event loop
+    user_id = await sync_to_async(authenticate_scope)(scope)
+    if user_id is None:
+        await send_json(send, 401, {'detail': 'Authentication credentials were not provided.'})
+        return
+    
+    backend = get_backend()
+    await backend.start()
+    queue = broker.subscribe(user_id)
+    disconnect = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': b': connected\n\n', 'more_body': True})
+        
+        while True:
+            next_event = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait(
+                {next_event, disconnect},
+                timeout=KEEPALIVE_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnect in done:
+                next_event.cancel()
+                break
+            if next_event in done:
+                event = next_event.result()
+                body = f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            else:
+                # Comments keep proxies from closing an idle stream
+                next_event.cancel()
+                body = ': keepalive\n\n'
+            await send({'type': 'http.response.body', 'body': body.encode(), 'more_body': True})
+    finally:
+        disconnect.cancel()
+        broker.unsubscribe(user_id, queue)
\ No newline at end of file
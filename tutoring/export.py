@@ -0,0 +1,79 @@
+"""
+Streaming exports of lesson requests.
+
+Rows are read with ``.iterator()`` over the flat ``.values()`` projection
+used by the listing, and rendered one line at a time, so an export holds
+one chunk of rows in memory however many it writes. Under ASGI Django
+would collect a sync iterator into a list before sending anything, so
+there the lines are handed over through an async iterator that reads one
+chunk at a time in the request's sync thread.
+"""
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+
+from .serializers import LessonRequestRowSerializer
+
+EXPORT_COLUMNS = [
+    'id', 'student_email', 'tutor_email', 'tutor_name', 'subject_name',
+    'start_time', 'duration_minutes', 'status', 'note', 'created_at',
+]
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() hands the line back to the csv writer's caller"""
+    
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    serializer = LessonRequestRowSerializer()
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield serializer.to_representation(row)
+
+
+def render_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def render_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow([row[column] for column in EXPORT_COLUMNS])
+
+
+EXPORT_FORMATS = {
+    'ndjson': (render_ndjson, 'application/x-ndjson'),
+    'csv': (render_csv, 'text/csv'),
+}
+
+
+def export_lines(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    render, _ = EXPORT_FORMATS[export_format]
+    return render(export_rows(queryset, chunk_size))
+
+
+async def iterate_async(lines, chunk_size=EXPORT_CHUNK_SIZE):
+    """Async iterator over ``lines``, a sync iterator advanced ``chunk_size`` lines at a time"""
+    take = sync_to_async(lambda: ''.join(islice(lines, chunk_size)))
+    while chunk := await take():
+        yield chunk
+
+
+def export_response(queryset, export_format, filename='lesson-requests', asynchronous=False):
+    """``asynchronous`` streams through an async iterator, for ASGI requests"""
+    _, content_type = EXPORT_FORMATS[export_format]
+    lines = export_lines(queryset, export_format)
+    if asynchronous:
+        lines = iterate_async(lines)
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
\ No newline at end of file
@@ -0,0 +1,22 @@
+LESSON_REQUEST_STATUSES = ['pending', 'approved', 'rejected']
+
+
+def resolve_role(user, role=None):
+    """Which side of its lesson requests (``student`` or ``tutor``) a user is looking at"""
+    role = role or user.role
+    if role in ('student', 'tutor'):
+        return role
+    # Fallback: show user's own requests based on their actual role
+    return 'student' if user.role == 'student' else 'tutor'
+
+
+def filter_lesson_requests(queryset, user=None, role=None, status=None):
+    """Role and status filters shared by the lesson-request listing and exports"""
+    # Get requests based on user role
+    if user is not None:
+        queryset = queryset.filter(**{f'{resolve_role(user, role)}_id': user.id})
+    
+    # Filter by status
+    if status and status in LESSON_REQUEST_STATUSES:
+        queryset = queryset.filter(status=status)
+    return queryset
@@ -0,0 +1,370 @@
+"""
+Synthetic data for load testing.
+
+Every value is drawn from one ``random.Random(seed)``, so the same options
+build the same data. Distributions follow what production looks like
+rather than being uniform: subject popularity and tutor demand are Zipf
+distributed, ratings are skewed towards the top of the scale and hourly
+rates are log-normal. Requests are made some days before their lesson
+and settled ones were last updated when they were decided.
+
+At these volumes ``bulk_create`` spends most of its time preparing every
+value through the model fields, so rows are built as tuples of values
+already adapted for the database and written with multi-row INSERTs in
+chunks. Primary keys are assigned here, after the highest existing one,
+and the sequences are reset at the end. The lesson indexes are built
+once after the load instead of being updated on every row, all users
+share one precomputed password hash and the search index is rebuilt
+once, so a million rows take under a minute.
+"""
+import math
+import random
+from contextlib import contextmanager
+from datetime import time, timedelta
+from decimal import Decimal
+from functools import lru_cache
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from accounts.models import StudentProfile, TutorProfile
+from . import search
+from .cache import bump_catalog_version
+from .models import LessonRequest, Subject, TutorWorkingHours
+
+User = get_user_model()
+
+LOAD_EMAIL_DOMAIN = 'load.test'
+LOAD_PASSWORD = 'LoadTest123!'
+LOAD_CHUNK_SIZE = 5000
+SQLITE_CACHE_KIB = 512 * 1024
+
+# Most popular first, popularity falls off along a Zipf curve
+SUBJECT_NAMES = [
+    'Mathematics', 'English', 'Physics', 'Chemistry', 'Biology', 'Computer Science',
+    'Turkish', 'History', 'Geography', 'German', 'French', 'Economics', 'Statistics',
+    'Philosophy', 'Music', 'Spanish', 'Art', 'Psychology', 'Literature', 'Accounting',
+    'Calculus', 'Linear Algebra', 'Programming', 'Astronomy', 'Sociology', 'Latin',
+    'Geometry', 'Environmental Science', 'Political Science', 'Italian',
+]
+FIRST_NAMES = [
+    'Ali', 'Ayşe', 'Mehmet', 'Fatma', 'Ahmet', 'Zeynep', 'Can', 'Elif', 'Emre', 'Selin',
+    'Deniz', 'Ece', 'Burak', 'Merve', 'Kerem', 'Derya', 'Ozan', 'Defne', 'Mert', 'Ceren',
+]
+LAST_NAMES = [
+    'Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Yıldırım', 'Öztürk', 'Aydın',
+    'Özdemir', 'Arslan', 'Doğan', 'Kılıç', 'Aslan', 'Çetin', 'Kara', 'Koç', 'Kurt', 'Özkan', 'Şimşek',
+]
+BIO_TOPICS = ['exam preparation', 'olympiad training', 'homework help', 'university entrance', 'conversation practice']
+
+DURATIONS = [30, 45, 60, 90, 120]
+DURATION_WEIGHTS = [10, 15, 50, 20, 5]
+TUTOR_SUBJECT_COUNTS = [1, 2, 3]
+TUTOR_SUBJECT_WEIGHTS = [50, 35, 15]
+# Lessons in the past were mostly settled, upcoming ones are often still pending
+PAST_STATUS_WEIGHTS = {'approved': 70, 'rejected': 15, 'pending': 15}
+UPCOMING_STATUS_WEIGHTS = {'approved': 40, 'rejected': 10, 'pending': 50}
+ZIPF_EXPONENT = 1.1
+# Lessons fall between this many days ago and ahead, on a half-hour grid
+LESSON_DAYS_BACK = 180
+LESSON_DAYS_AHEAD = 60
+SLOT_MINUTES = 30
+# No tutor opens earlier
+FIRST_HOUR = 8
+# Requests are made on average this long before the lesson, and approved or
+# rejected on average this long after they were made
+REQUEST_RATE = 1 / timedelta(days=7).total_seconds()
+DECISION_RATE = 1 / timedelta(hours=12).total_seconds()
+
+
+def zipf_cum_weights(count, exponent=ZIPF_EXPONENT):
+    """Cumulative weights of ranks 1..count for ``random.choices``"""
+    weights, total = [], 0
+    for rank in range(1, count + 1):
+        total += 1 / rank ** exponent
+        weights.append(total)
+    return weights
+
+
+def load_email(role, number, seed):
+    return f'{role}{number}.{seed}@{LOAD_EMAIL_DOMAIN}'
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def insert_rows(model, fields, rows):
+    """
+    INSERT tuples of already adapted values for ``fields``, as many rows per
+    statement as the database takes parameters
+    """
+    if not rows:
+        return
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(model._meta.get_field(name).column) for name in fields)
+    placeholders = f"({', '.join(['%s'] * len(fields))})"
+    per_statement = (connection.features.max_query_params or 2 ** 16 - 1) // len(fields)
+    # The backend's own cursor, without DEBUG logging every statement
+    connection.ensure_connection()
+    cursor = connection.create_cursor()
+    try:
+        for start in range(0, len(rows), per_statement):
+            batch = rows[start:start + per_statement]
+            cursor.execute(
+                f'INSERT INTO {quote(model._meta.db_table)} ({columns}) '
+                f'VALUES {", ".join([placeholders] * len(batch))}',
+                [value for row in batch for value in row]
+            )
+    finally:
+        cursor.close()
+
+
+def reset_sequences(models):
+    """Move the id sequences past the primary keys assigned here"""
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+
+
+def create_subjects():
+    """Subject ids ordered by popularity"""
+    Subject.objects.bulk_create([Subject(name=name) for name in SUBJECT_NAMES], ignore_conflicts=True)
+    ids = dict(Subject.objects.filter(name__in=SUBJECT_NAMES).values_list('name', 'id'))
+    return [ids[name] for name in SUBJECT_NAMES]
+
+
+def create_users(rng, role, count, seed, password_hash, now, chunk_size):
+    fields = ['id', 'password', 'is_superuser', 'username', 'first_name', 'last_name',
+              'email', 'is_staff', 'is_active', 'date_joined', 'role']
+    first_id = next_id(User)
+    for start in range(0, count, chunk_size):
+        rows = []
+        for number in range(start, min(start + chunk_size, count)):
+            email = load_email(role, number, seed)
+            rows.append((
+                first_id + number, password_hash, False, email,
+                rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+                email, False, True, now, role,
+            ))
+        insert_rows(User, fields, rows)
+    return list(range(first_id, first_id + count))
+
+
+def create_students(rng, user_ids, now, chunk_size):
+    fields = ['user', 'grade_level', 'created_at', 'updated_at']
+    for start in range(0, len(user_ids), chunk_size):
+        insert_rows(StudentProfile, fields, [
+            (user_id, f'{rng.randint(5, 12)}th Grade', now, now)
+            for user_id in user_ids[start:start + chunk_size]
+        ])
+
+
+def create_tutors(rng, user_ids, subject_ids, now, chunk_size):
+    """
+    Creates profiles, subject links and working hours, returns
+    ``{user id: (subject ids, [(weekday, opening hour, closing hour), ...])}``
+    """
+    subject_weights = zipf_cum_weights(len(subject_ids))
+    Through = TutorProfile.subjects.through
+    adapt_rate = connection.ops.adapt_decimalfield_value
+    adapt_time = lru_cache(maxsize=None)(connection.ops.adapt_timefield_value)
+    tutors = {}
+    
+    profile_id = next_id(TutorProfile)
+    for start in range(0, len(user_ids), chunk_size):
+        profiles, subjects, hours = [], [], []
+        for user_id in user_ids[start:start + chunk_size]:
+            count = rng.choices(TUTOR_SUBJECT_COUNTS, TUTOR_SUBJECT_WEIGHTS)[0]
+            chosen = sorted(set(rng.choices(subject_ids, cum_weights=subject_weights, k=count)))
+            profiles.append((
+                profile_id,
+                user_id,
+                f'{rng.randint(1, 20)} years of {rng.choice(BIO_TOPICS)}.',
+                # Most tutors are rated well, a long tail isn't
+                round(5 * rng.betavariate(8, 2), 1),
+                adapt_rate(Decimal(round(rng.lognormvariate(math.log(400), 0.35))), 10, 2),
+                now,
+                now,
+            ))
+            subjects.extend((profile_id, subject_id) for subject_id in chosen)
+            
+            opening = rng.randint(FIRST_HOUR, 12)
+            windows = []
+            for weekday in sorted(rng.sample(range(7), rng.randint(3, 6))):
+                closing = opening + rng.randint(4, 9)
+                windows.append((weekday, opening, closing))
+                hours.append((profile_id, weekday, adapt_time(time(opening)), adapt_time(time(closing))))
+            tutors[user_id] = (chosen, windows)
+            profile_id += 1
+        
+        insert_rows(TutorProfile, ['id', 'user', 'bio', 'rating', 'hourly_rate', 'created_at', 'updated_at'], profiles)
+        insert_rows(Through, ['tutorprofile', 'subject'], subjects)
+        insert_rows(TutorWorkingHours, ['tutor', 'weekday', 'start_time', 'end_time'], hours)
+    return tutors
+
+
+@contextmanager
+def indexes_deferred(model, rows):
+    """
+    Drop the ``Meta.indexes`` of ``model`` while ``rows`` rows are inserted and
+    build them again afterwards, sorting once is much cheaper than updating
+    every index row by row. Skipped when the table is larger than the load.
+    """
+    if model.objects.count() > rows:
+        yield
+        return
+    editor = connection.schema_editor()
+    with connection.cursor() as cursor:
+        for index in model._meta.indexes:
+            cursor.execute(str(index.remove_sql(model, editor)))
+        yield
+        for index in model._meta.indexes:
+            cursor.execute(str(index.create_sql(model, editor)))
+
+
+def request_times(rng, start_time, status, today):
+    """
+    created_at some exponentially distributed time before the lesson, and
+    before today for upcoming ones; settled requests were updated when
+    they were decided, at the latest at the start of the lesson
+    """
+    created_at = min(start_time, today) - timedelta(seconds=rng.expovariate(REQUEST_RATE))
+    if status == 'pending':
+        return created_at, created_at
+    decided_at = created_at + timedelta(seconds=rng.expovariate(DECISION_RATE))
+    return created_at, min(decided_at, start_time, today)
+
+
+def create_lessons(rng, count, student_ids, tutors, chunk_size):
+    """
+    Lessons start on half hours inside the tutor's working hours. Approved
+    lessons of a tutor never overlap: a draw that would is stored as
+    rejected, the API would have refused to approve it. Pending ones may
+    overlap, as requests made before the other lesson was approved can.
+    Requests are spread out in time before their lesson, so the created_at
+    listings and the sync feed don't see every row tie.
+    """
+    fields = ['student', 'tutor', 'subject', 'start_time', 'duration_minutes', 'end_time',
+              'status', 'note', 'created_at', 'updated_at']
+    # Demand ranks are shuffled so the busiest tutors aren't simply the first ids
+    tutor_ids = list(tutors)
+    rng.shuffle(tutor_ids)
+    tutor_weights = zipf_cum_weights(len(tutor_ids))
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    days = range(-LESSON_DAYS_BACK, LESSON_DAYS_AHEAD + 1)
+    days_by_weekday = {weekday: [] for weekday in range(7)}
+    for day in days:
+        days_by_weekday[(today + timedelta(days=day)).weekday()].append(day)
+    # Half-hour slots taken by approved lessons, one byte per slot from
+    # FIRST_HOUR on every day of the range, per tutor
+    day_slots = (24 - FIRST_HOUR) * 60 // SLOT_MINUTES
+    booked = {}
+    adapt = connection.ops.adapt_datetimefield_value
+    # There are only a few thousand distinct times to adapt:
+    # ``(day, slot, duration)`` -> start, adapted start and end, whether it's past
+    times = {}
+    
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        rows = []
+        for tutor_id, student_id, duration, past_status, upcoming_status in zip(
+            rng.choices(tutor_ids, cum_weights=tutor_weights, k=size),
+            rng.choices(student_ids, k=size),
+            rng.choices(DURATIONS, DURATION_WEIGHTS, k=size),
+            rng.choices(list(PAST_STATUS_WEIGHTS), list(PAST_STATUS_WEIGHTS.values()), k=size),
+            rng.choices(list(UPCOMING_STATUS_WEIGHTS), list(UPCOMING_STATUS_WEIGHTS.values()), k=size),
+        ):
+            subject_ids, windows = tutors[tutor_id]
+            weekday, opening, closing = rng.choice(windows)
+            day = rng.choice(days_by_weekday[weekday])
+            length = -(-duration // SLOT_MINUTES)
+            slot = (opening - FIRST_HOUR) * 60 // SLOT_MINUTES + rng.randrange(
+                (closing - opening) * 60 // SLOT_MINUTES - length + 1
+            )
+            
+            key = (day, slot, duration)
+            if key not in times:
+                start_time = today + timedelta(days=day, hours=FIRST_HOUR, minutes=slot * SLOT_MINUTES)
+                # end_time is what save() would have set
+                times[key] = (
+                    start_time,
+                    adapt(start_time),
+                    adapt(start_time + timedelta(minutes=duration)),
+                    start_time < today,
+                )
+            start_time, start_value, end_value, past = times[key]
+            
+            status = past_status if past else upcoming_status
+            if status == 'approved':
+                taken = booked.setdefault(tutor_id, bytearray(len(days) * day_slots))
+                offset = (day + LESSON_DAYS_BACK) * day_slots + slot
+                if any(taken[offset:offset + length]):
+                    status = 'rejected'
+                else:
+                    taken[offset:offset + length] = b'\x01' * length
+            created_at, updated_at = request_times(rng, start_time, status, today)
+            created_value = adapt(created_at)
+            # Values already adapted are reused, adapting is a good part of the run
+            if updated_at is created_at:
+                updated_value = created_value
+            elif updated_at is start_time:
+                updated_value = start_value
+            else:
+                updated_value = adapt(updated_at)
+            
+            rows.append((
+                student_id,
+                tutor_id,
+                rng.choice(subject_ids),
+                start_value,
+                duration,
+                end_value,
+                status,
+                '',
+                created_value,
+                updated_value,
+            ))
+        insert_rows(LessonRequest, fields, rows)
+
+
+def generate_load_data(
+    tutors, students, lessons, seed=0, password=LOAD_PASSWORD, chunk_size=LOAD_CHUNK_SIZE, log=None
+):
+    """Create the given numbers of tutors, students and lesson requests"""
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+    # One hash for everyone instead of one PBKDF2 run per user
+    password_hash = make_password(password)
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    if connection.vendor == 'sqlite':
+        # Rows land all over the foreign key indexes, keep their pages in memory
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA cache_size = -{SQLITE_CACHE_KIB}')
+    
+    subject_ids = create_subjects()
+    with transaction.atomic():
+        tutor_ids = create_users(rng, 'tutor', tutors, seed, password_hash, now, chunk_size)
+        tutor_profiles = create_tutors(rng, tutor_ids, subject_ids, now, chunk_size)
+        reset_sequences([User, TutorProfile])
+    log(f'Created {tutors} tutors')
+    
+    with transaction.atomic():
+        student_ids = create_users(rng, 'student', students, seed, password_hash, now, chunk_size)
+        create_students(rng, student_ids, now, chunk_size)
+        reset_sequences([User])
+    log(f'Created {students} students')
+    
+    if lessons:
+        with transaction.atomic(), indexes_deferred(LessonRequest, lessons):
+            create_lessons(rng, lessons, student_ids, tutor_profiles, chunk_size)
+        log(f'Created {lessons} lesson requests')
+    
+    # Nothing went through the ORM's save(), so no signals were sent: the
+    # index and the catalog cache are brought up to date here
+    search.rebuild_index()
+    bump_catalog_version()
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from tutoring.archive import archivable, archive_lesson_requests, retention_cutoff
+from tutoring.models import LessonRequestTombstone
+from tutoring.sync import prune_tombstones, tombstone_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        'Move finished lesson requests older than the retention window to the archive table '
+        'and prune sync tombstones past theirs'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Retention window, defaults to LESSON_REQUEST_RETENTION_DAYS')
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between chunks')
+        parser.add_argument('--after-id', type=int, default=0, help='Resume after this lesson request id')
+        parser.add_argument('--dry-run', action='store_true')
+    
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff(options['days'])
+        
+        if options['dry_run']:
+            count = archivable(cutoff).filter(id__gt=options['after_id']).count()
+            self.stdout.write(f'{count} lesson requests would be archived (cutoff {cutoff:%Y-%m-%d %H:%M})')
+            count = LessonRequestTombstone.objects.filter(deleted_at__lt=tombstone_cutoff()).count()
+            self.stdout.write(f'{count} sync tombstones would be pruned')
+            return
+        
+        archived = 0
+        for ids in archive_lesson_requests(
+            cutoff,
+            after_id=options['after_id'],
+            chunk_size=options['chunk_size'],
+            pause=options['pause']
+        ):
+            archived += len(ids)
+            # The last id is the resume point if the run is interrupted
+            self.stdout.write(f'Archived {archived} lesson requests (last id {ids[-1]})')
+        
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} lesson requests'))
+        self.stdout.write(self.style.SUCCESS(f'Pruned {prune_tombstones()} sync tombstones'))
\ No newline at end of file
@@ -0,0 +1,67 @@
+import json
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from tutoring.benchmark import SCENARIO_NAMES, compare, run_benchmarks, shared_cold_caches
+from tutoring.loadgen import LOAD_EMAIL_DOMAIN, LOAD_PASSWORD
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Measure latency, queries and response size of the main endpoints on the load data'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests before those')
+        parser.add_argument('--only', action='append', choices=SCENARIO_NAMES, help='Run only this scenario')
+        parser.add_argument('--cold', action='store_true', help='Clear the endpoint caches before each request')
+        parser.add_argument('--seed', type=int, default=0, help='Seed the load data was generated with')
+        parser.add_argument('--password', default=LOAD_PASSWORD, help='Password the load data was generated with')
+        parser.add_argument('--output', help='Save the results as JSON, e.g. as a new baseline')
+        parser.add_argument('--compare', help='Baseline JSON to check the results against')
+        parser.add_argument('--threshold', type=float, default=20, help='Allowed growth in percent')
+    
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be at least 1')
+        if options['cold'] and shared_cold_caches():
+            raise CommandError(
+                f"--cold only clears local caches, {', '.join(shared_cold_caches())} use a shared backend"
+            )
+        for role in ('student', 'tutor'):
+            if not User.objects.filter(role=role, email__endswith=f".{options['seed']}@{LOAD_EMAIL_DOMAIN}").exists():
+                raise CommandError(f"No load data for seed {options['seed']}, run generate_load_data first")
+        baseline = None
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as source:
+                baseline = json.load(source)
+        
+        results = run_benchmarks(
+            names=options['only'],
+            requests=options['requests'],
+            warmup=options['warmup'],
+            cold=options['cold'],
+            seed=options['seed'],
+            password=options['password'],
+        )
+        self.stdout.write(f"{'scenario':<24} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'queries':>7} {'bytes':>9}")
+        for name, result in results['scenarios'].items():
+            self.stdout.write(
+                f"{name:<24} {result['status']:>6} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                f"{result['queries']:>7} {result['bytes']:>9}"
+            )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2)
+                output.write('\n')
+        
+        if baseline is None:
+            return
+        if baseline['dataset'] != results['dataset'] or baseline['cold'] != results['cold']:
+            self.stderr.write(self.style.WARNING('The baseline was measured on other data or cache settings'))
+        regressions = compare(baseline, results, options['threshold'])
+        for regression in regressions:
+            self.stderr.write(regression)
+        if regressions:
+            raise CommandError(f"{len(regressions)} regression(s) against {options['compare']}")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}"))
\ No newline at end of file
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from tutoring.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_lines
+from tutoring.filters import LESSON_REQUEST_STATUSES, filter_lesson_requests
+from tutoring.models import LessonRequest
+from tutoring.serializers import LessonRequestRowSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Stream lesson requests as NDJSON or CSV'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--format', dest='export_format', choices=sorted(EXPORT_FORMATS), default='ndjson')
+        parser.add_argument('--user', help='Only this user\'s requests (email)')
+        parser.add_argument('--role', choices=['student', 'tutor'])
+        parser.add_argument('--status', choices=LESSON_REQUEST_STATUSES)
+        parser.add_argument('--output', help='File to write, defaults to stdout')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+    
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(email=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email {options['user']}")
+        
+        queryset = filter_lesson_requests(
+            LessonRequest.objects.all(), user, options['role'], options['status']
+        )
+        queryset = LessonRequestRowSerializer.project(queryset).order_by('-created_at', 'id')
+        lines = export_lines(queryset, options['export_format'], options['chunk_size'])
+        
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
\ No newline at end of file
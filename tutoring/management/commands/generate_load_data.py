@@ -0,0 +1,38 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from tutoring.loadgen import LOAD_CHUNK_SIZE, LOAD_EMAIL_DOMAIN, LOAD_PASSWORD, generate_load_data
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Generate a large, realistic dataset for load testing'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--tutors', type=int, default=1000)
+        parser.add_argument('--students', type=int, default=10000)
+        parser.add_argument('--lessons', type=int, default=100000)
+        parser.add_argument('--seed', type=int, default=0, help='Same seed, same data')
+        parser.add_argument('--password', default=LOAD_PASSWORD, help='Password of every generated user')
+        parser.add_argument('--chunk-size', type=int, default=LOAD_CHUNK_SIZE)
+    
+    def handle(self, *args, **options):
+        if min(options['tutors'], options['students'], options['lessons']) < 0:
+            raise CommandError('Counts can\'t be negative')
+        if options['lessons'] and not (options['tutors'] and options['students']):
+            raise CommandError('Lesson requests need at least one tutor and one student')
+        if User.objects.filter(email__endswith=f".{options['seed']}@{LOAD_EMAIL_DOMAIN}").exists():
+            raise CommandError(f"Data for seed {options['seed']} was already generated, pick another --seed")
+        
+        started = time.monotonic()
+        generate_load_data(
+            options['tutors'],
+            options['students'],
+            options['lessons'],
+            seed=options['seed'],
+            password=options['password'],
+            chunk_size=options['chunk_size'],
+            log=self.stdout.write
+        )
+        self.stdout.write(self.style.SUCCESS(f'Load data generated in {time.monotonic() - started:.1f}s'))
\ No newline at end of file
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from tutoring.search import get_backend, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the tutor full-text search index'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+    
+    def handle(self, *args, **options):
+        if get_backend() is None:
+            self.stdout.write(self.style.WARNING(
+                'No search index for this database, searches fall back to a table scan.'
+            ))
+            return
+        
+        indexed = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} tutors'))
\ No newline at end of file
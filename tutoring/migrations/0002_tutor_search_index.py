@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# The DDL is spelled out instead of taken from tutoring/search.py, so this
+# migration keeps creating the same index whatever that module becomes
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in ('sqlite', 'postgresql'):
+        return
+
+    TutorProfile = apps.get_model('accounts', 'TutorProfile')
+    rows = [
+        (pk, f'{first_name} {last_name}'.strip(), bio)
+        for pk, first_name, last_name, bio in TutorProfile.objects.values_list(
+            'id', 'user__first_name', 'user__last_name', 'bio'
+        )
+    ]
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS tutoring_tutorsearch USING fts5("
+                "name, bio, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+            cursor.executemany('INSERT INTO tutoring_tutorsearch (rowid, name, bio) VALUES (%s, %s, %s)', rows)
+        else:
+            cursor.execute(
+                'CREATE TABLE IF NOT EXISTS tutoring_tutorsearch ('
+                'tutor_id bigint PRIMARY KEY REFERENCES accounts_tutorprofile(id) '
+                'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+                'document tsvector NOT NULL)'
+            )
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS tutoring_tutorsearch_document_gin '
+                'ON tutoring_tutorsearch USING GIN (document)'
+            )
+            cursor.executemany(
+                'INSERT INTO tutoring_tutorsearch (tutor_id, document) VALUES (%s, '
+                "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B'))",
+                rows
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('sqlite', 'postgresql'):
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP TABLE IF EXISTS tutoring_tutorsearch')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_initial'),
+        ('tutoring', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
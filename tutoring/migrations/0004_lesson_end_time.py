@@ -0,0 +1,69 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:52
+
+from datetime import timedelta
+
+import django.core.validators
+from django.db import migrations, models
+
+
+# Overlap checks only look this far back, see tutoring/scheduling.py
+MAX_DURATION_MINUTES = 8 * 60
+
+
+def check_durations(apps, schema_editor):
+    # Durations had no upper bound before, longer lessons would be missed by
+    # overlap checks. They aren't shortened here, that's a decision to make
+    # per booking, so the migration stops until they're fixed.
+    LessonRequest = apps.get_model('tutoring', 'LessonRequest')
+    too_long = list(
+        LessonRequest.objects.filter(duration_minutes__gt=MAX_DURATION_MINUTES).values_list('id', flat=True)[:20]
+    )
+    if too_long:
+        raise ValueError(
+            f'Lesson requests longer than {MAX_DURATION_MINUTES} minutes (ids {", ".join(map(str, too_long))}); '
+            f'shorten or delete them, then run the migration again'
+        )
+
+
+def fill_end_time(apps, schema_editor):
+    LessonRequest = apps.get_model('tutoring', 'LessonRequest')
+    batch = []
+    for lesson_request in LessonRequest.objects.only('id', 'start_time', 'duration_minutes').iterator(chunk_size=2000):
+        lesson_request.end_time = lesson_request.start_time + timedelta(minutes=lesson_request.duration_minutes)
+        batch.append(lesson_request)
+        if len(batch) >= 2000:
+            LessonRequest.objects.bulk_update(batch, ['end_time'])
+            batch = []
+    if batch:
+        LessonRequest.objects.bulk_update(batch, ['end_time'])
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('tutoring', '0003_subject_updated_at'),
+    ]
+    
+    operations = [
+        migrations.RunPython(check_durations, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='lessonrequest',
+            name='end_time',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_end_time, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='lessonrequest',
+            name='end_time',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name='lessonrequest',
+            name='duration_minutes',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(MAX_DURATION_MINUTES)]),
+        ),
+        migrations.AddIndex(
+            model_name='lessonrequest',
+            index=models.Index(fields=['tutor', 'status', 'start_time'], name='lessonreq_tutor_status_start'),
+        ),
+    ]
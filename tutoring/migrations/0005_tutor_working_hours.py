@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_profile_updated_at'),
+        ('tutoring', '0004_lesson_end_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TutorWorkingHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('tutor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='working_hours', to='accounts.tutorprofile')),
+            ],
+            options={
+                'verbose_name_plural': 'tutor working hours',
+                'ordering': ['tutor', 'weekday', 'start_time'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tutorworkinghours',
+            constraint=models.CheckConstraint(check=models.Q(('end_time__gt', models.F('start_time'))), name='working_hours_end_after_start'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutoring', '0005_tutor_working_hours'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lessonrequest',
+            index=models.Index(fields=['student', 'status', '-created_at'], name='lessonreq_student_status_crt'),
+        ),
+        migrations.AddIndex(
+            model_name='lessonrequest',
+            index=models.Index(fields=['tutor', 'status', '-created_at'], name='lessonreq_tutor_status_crt'),
+        ),
+        migrations.AddIndex(
+            model_name='lessonrequest',
+            index=models.Index(fields=['-created_at'], name='lessonreq_created'),
+        ),
+    ]
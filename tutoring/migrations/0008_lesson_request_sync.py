@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutoring', '0007_archived_lesson_request'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonRequestTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lesson_request_id', models.BigIntegerField()),
+                ('student_id', models.BigIntegerField()),
+                ('tutor_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='lessonrequest',
+            index=models.Index(fields=['student', 'updated_at'], name='lessonreq_student_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='lessonrequest',
+            index=models.Index(fields=['tutor', 'updated_at'], name='lessonreq_tutor_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='lessonrequesttombstone',
+            index=models.Index(fields=['student_id', 'deleted_at'], name='tombstone_student_deleted'),
+        ),
+        migrations.AddIndex(
+            model_name='lessonrequesttombstone',
+            index=models.Index(fields=['tutor_id', 'deleted_at'], name='tombstone_tutor_deleted'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tutoring', '0008_lesson_request_sync'),
+    ]
+
+    operations = [
+        # Build the replacements before the foreign key indexes go away
+        migrations.AddIndex(
+            model_name='lessonrequest',
+            index=models.Index(fields=['student', '-created_at'], name='lessonreq_student_created'),
+        ),
+        migrations.AddIndex(
+            model_name='lessonrequest',
+            index=models.Index(fields=['tutor', '-created_at'], name='lessonreq_tutor_created'),
+        ),
+        migrations.AlterField(
+            model_name='lessonrequest',
+            name='student',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='student_lesson_requests', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='lessonrequest',
+            name='tutor',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tutor_lesson_requests', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
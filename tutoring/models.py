@@ -1,12 +1,18 @@
+from datetime import timedelta
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.core.validators import MinValueValidator, MaxValueValidator
 
 User = get_user_model()
 
+# Upper bound on a lesson, also bounds how far back an overlap check looks
+MAX_DURATION_MINUTES = 8 * 60
+
 
 class Subject(models.Model):
     name = models.CharField(max_length=100, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.name
@@ -25,16 +31,21 @@ class LessonRequest(models.Model):
     student = models.ForeignKey(
         User, 
         on_delete=models.CASCADE, 
-        related_name='student_lesson_requests'
+        related_name='student_lesson_requests',
+        db_index=False
     )
     tutor = models.ForeignKey(
         User, 
         on_delete=models.CASCADE, 
-        related_name='tutor_lesson_requests'
+        related_name='tutor_lesson_requests',
+        db_index=False
     )
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
     start_time = models.DateTimeField()
-    duration_minutes = models.PositiveIntegerField()
+    duration_minutes = models.PositiveIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(MAX_DURATION_MINUTES)]
+    )
+    end_time = models.DateTimeField(editable=False)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     note = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -43,5 +54,111 @@ class LessonRequest(models.Model):
     def __str__(self):
         return f"Lesson Request: {self.student.email} -> {self.tutor.email} ({self.subject.name})"
     
+    def set_end_time(self):
+        self.start_time = self._meta.get_field('start_time').to_python(self.start_time)
+        self.end_time = self.start_time + timedelta(minutes=self.duration_minutes)
+    
+    def save(self, *args, **kwargs):
+        self.set_end_time()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'start_time', 'duration_minutes'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'end_time'}
+        super().save(*args, **kwargs)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Overlap checks seek on (tutor, status) and range-scan start_time
+            models.Index(fields=['tutor', 'status', 'start_time'], name='lessonreq_tutor_status_start'),
+            # Role listings filter on the user, newest first, and optionally on
+            # the status. Each shape needs its own index to skip the sort, and
+            # they make separate indexes on the foreign keys redundant
+            models.Index(fields=['student', '-created_at'], name='lessonreq_student_created'),
+            models.Index(fields=['tutor', '-created_at'], name='lessonreq_tutor_created'),
+            models.Index(fields=['student', 'status', '-created_at'], name='lessonreq_student_status_crt'),
+            models.Index(fields=['tutor', 'status', '-created_at'], name='lessonreq_tutor_status_crt'),
+            # Admin changelist ordering and date hierarchy
+            models.Index(fields=['-created_at'], name='lessonreq_created'),
+            # Delta sync walks a user's changes in updated_at order
+            models.Index(fields=['student', 'updated_at'], name='lessonreq_student_updated'),
+            models.Index(fields=['tutor', 'updated_at'], name='lessonreq_tutor_updated'),
+        ]
+
+
+class ArchivedLessonRequest(models.Model):
+    """Finished lesson request moved out of the hot table, keeps its original id"""
+    id = models.BigIntegerField(primary_key=True)
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    tutor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='+')
+    start_time = models.DateTimeField()
+    duration_minutes = models.PositiveIntegerField()
+    end_time = models.DateTimeField()
+    status = models.CharField(max_length=10, choices=LessonRequest.STATUS_CHOICES)
+    note = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Archived Lesson Request #{self.id}"
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['student', '-created_at'], name='archivedreq_student_created'),
+            models.Index(fields=['tutor', '-created_at'], name='archivedreq_tutor_created'),
+        ]
+
+
+class LessonRequestTombstone(models.Model):
+    """Marks a deleted lesson request for the delta sync feed"""
+    # Plain ids, the users may be deleted along with their requests
+    lesson_request_id = models.BigIntegerField()
+    student_id = models.BigIntegerField()
+    tutor_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Deleted Lesson Request #{self.lesson_request_id}"
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['student_id', 'deleted_at'], name='tombstone_student_deleted'),
+            models.Index(fields=['tutor_id', 'deleted_at'], name='tombstone_tutor_deleted'),
+        ]
+
+
+class TutorWorkingHours(models.Model):
+    """Weekly recurring window in which a tutor takes lessons, in UTC"""
+    WEEKDAY_CHOICES = [
+        (0, 'Monday'),
+        (1, 'Tuesday'),
+        (2, 'Wednesday'),
+        (3, 'Thursday'),
+        (4, 'Friday'),
+        (5, 'Saturday'),
+        (6, 'Sunday'),
+    ]
+    
+    tutor = models.ForeignKey(
+        'accounts.TutorProfile',
+        on_delete=models.CASCADE,
+        related_name='working_hours'
+    )
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    
+    def __str__(self):
+        return f"{self.tutor}: {self.get_weekday_display()} {self.start_time}-{self.end_time}"
+    
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['tutor', 'weekday', 'start_time']
+        verbose_name_plural = 'tutor working hours'
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(end_time__gt=models.F('start_time')),
+                name='working_hours_end_after_start'
+            ),
+        ]
\ No newline at end of file
@@ -0,0 +1,290 @@
+"""
+Pagination modes for the listing endpoints.
+
+Views mixing in PaginationModeMixin keep LimitOffsetPagination as the default
+and let clients opt into another mode with ``?paginate=<mode>``.
+"""
+import json
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework import exceptions
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Seeks past the last row of the previous page instead of skipping rows.
+    
+    The view provides the ordering through ``get_keyset_ordering()``, which
+    has to end with a unique column. The cursor carries the ordering values
+    of the last row and is signed, so clients can't forge positions.
+    """
+    page_size = api_settings.PAGE_SIZE
+    limit_query_param = 'limit'
+    max_limit = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    signing_salt = 'tutoring.pagination.keyset'
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = tuple(view.get_keyset_ordering())
+        self.limit = self.get_limit(request)
+        
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = self.seek(queryset, self.get_seek_condition(position))
+        
+        # One extra row tells whether there is a next page
+        rows = list(queryset.order_by(*self.ordering)[:self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        rows = rows[:self.limit]
+        self.next_position = self.get_position(rows[-1]) if self.has_next else None
+        return rows
+    
+    def seek(self, queryset, condition):
+        if not queryset.query.combinator:
+            return queryset.filter(condition)
+        
+        # A UNION can't be filtered as a whole, seek inside every part instead
+        queryset = queryset._chain()
+        parts = []
+        for part in queryset.query.combined_queries:
+            part = part.chain()
+            part.add_q(condition)
+            parts.append(part)
+        queryset.query.combined_queries = tuple(parts)
+        return queryset
+    
+    def get_limit(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+    
+    def get_seek_condition(self, position):
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': position[index]})
+            for previous_field, value in zip(self.ordering[:index], position):
+                step &= Q(**{previous_field.lstrip('-'): value})
+            condition |= step
+        return condition
+    
+    def get_position(self, row):
+        names = [field.lstrip('-') for field in self.ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, name) for name in names]
+    
+    def encode_cursor(self, position):
+        values = []
+        for value in position:
+            if isinstance(value, Decimal):
+                value = str(value)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            values.append(value)
+        return signing.dumps({'o': list(self.ordering), 'v': values}, salt=self.signing_salt, compress=True)
+    
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        
+        try:
+            payload = signing.loads(token, salt=self.signing_salt)
+            if payload['o'] != list(self.ordering) or len(payload['v']) != len(self.ordering):
+                raise ValueError
+            position = []
+            for field, value in zip(self.ordering, payload['v']):
+                try:
+                    value = model._meta.get_field(field.lstrip('-')).to_python(value)
+                except FieldDoesNotExist:
+                    # Annotations are stored as plain JSON values
+                    pass
+                position.append(value)
+        except (signing.BadSignature, ValidationError, ValueError, KeyError, TypeError):
+            raise exceptions.ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+        return position
+    
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+    
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
+
+
+class CountFreePagination(LimitOffsetPagination):
+    """Limit/offset pages without the COUNT query, ``has_next`` comes from one extra row"""
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        
+        self.offset = self.get_offset(request)
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+    
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+    
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('has_next', self.has_next),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'has_next': {
+                    'type': 'boolean',
+                },
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'previous': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
+
+
+def estimate_count(queryset, cutoff):
+    """
+    Returns ``(count, is_estimate)`` without an unbounded COUNT(*).
+    
+    PostgreSQL answers from the planner's row estimate. Other databases count
+    at most ``cutoff + 1`` rows, anything past the cutoff is reported as the
+    cutoff and flagged as an estimate.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows']), True
+    
+    count = queryset[:cutoff + 1].count()
+    return min(count, cutoff), count > cutoff
+
+
+class EstimatedCountPagination(CountFreePagination):
+    """Count-free pages plus a cheap ``count`` estimate for scrollbars"""
+    exact_count_cutoff = 1000
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        rows = super().paginate_queryset(queryset, request, view)
+        if rows is None:
+            return None
+        
+        count, self.count_is_estimate = estimate_count(queryset, self.exact_count_cutoff)
+        # Never report fewer rows than we have already seen
+        self.count = max(count, self.offset + len(rows) + int(self.has_next))
+        return rows
+    
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('count_is_estimate', self.count_is_estimate),
+            ('has_next', self.has_next),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+    
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties'] = {
+            'count': {
+                'type': 'integer',
+                'example': 123,
+            },
+            'count_is_estimate': {
+                'type': 'boolean',
+            },
+            **response_schema['properties'],
+        }
+        return response_schema
+
+
+class PaginationModeMixin:
+    """Picks the paginator from ``?paginate=`` (a ``?cursor=`` implies cursor mode)"""
+    pagination_modes = {
+        'offset': LimitOffsetPagination,
+        'cursor': KeysetPagination,
+        'nocount': CountFreePagination,
+        'estimate': EstimatedCountPagination,
+    }
+    default_pagination_mode = 'offset'
+    
+    def get_pagination_mode(self):
+        request = getattr(self, 'request', None)
+        if request is None:
+            return self.default_pagination_mode
+        
+        params = request.query_params
+        if params.get(KeysetPagination.cursor_query_param):
+            return 'cursor'
+        mode = params.get('paginate', self.default_pagination_mode)
+        return mode if mode in self.pagination_modes else self.default_pagination_mode
+    
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = self.pagination_modes[self.get_pagination_mode()]()
+        return self._paginator
\ No newline at end of file
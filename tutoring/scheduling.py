@@ -0,0 +1,52 @@
+"""
+Schedule conflict detection for tutors.
+
+A lesson lasts at most MAX_DURATION_MINUTES, so anything overlapping
+[start, end) must start inside (start - MAX_DURATION_MINUTES, end). That
+turns the overlap test into a bounded range scan of the
+(tutor, status, start_time) index instead of a scan of the tutor's history.
+"""
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+from .models import LessonRequest, MAX_DURATION_MINUTES
+
+MAX_DURATION = timedelta(minutes=MAX_DURATION_MINUTES)
+
+BLOCKING_STATUSES = ('approved',)
+
+
+def overlapping_lessons(tutor_id, start, end, statuses=BLOCKING_STATUSES, exclude_ids=()):
+    """Lessons of the tutor that overlap [start, end)"""
+    queryset = LessonRequest.objects.filter(
+        tutor_id=tutor_id,
+        status__in=statuses,
+        start_time__gt=start - MAX_DURATION,
+        start_time__lt=end,
+        end_time__gt=start,
+    )
+    if exclude_ids:
+        queryset = queryset.exclude(id__in=exclude_ids)
+    return queryset.order_by('start_time')
+
+
+class IntervalSet:
+    """Sorted, possibly overlapping intervals with bounded overlap lookups"""
+
+    def __init__(self, intervals=()):
+        self.intervals = sorted(intervals)
+
+    @classmethod
+    def for_tutor(cls, tutor_id, start, end, statuses=BLOCKING_STATUSES):
+        """Loads the tutor's lessons that could overlap anything in [start, end)"""
+        lessons = overlapping_lessons(tutor_id, start, end, statuses)
+        return cls(lessons.values_list('start_time', 'end_time'))
+
+    def overlaps(self, start, end):
+        # Only intervals starting in (start - MAX_DURATION, end) can overlap
+        low = bisect_left(self.intervals, (start - MAX_DURATION,))
+        high = bisect_left(self.intervals, (end,))
+        return any(other_end > start for _, other_end in self.intervals[low:high])
+
+    def add(self, start, end):
+        insort(self.intervals, (start, end))
@@ -0,0 +1,220 @@
+"""
+Full-text search for the tutor catalog.
+
+Tutor names and bios are kept in an inverted index next to the main tables:
+an FTS5 virtual table on SQLite and a tsvector table with a GIN index on
+PostgreSQL. Both are keyed by the TutorProfile id, so a search is an index
+lookup joined back to the profile rows instead of a LIKE scan.
+"""
+import re
+
+from django.db import connection, transaction
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from accounts.models import TutorProfile
+from .cache import bump_catalog_version
+
+SEARCH_TABLE = 'tutoring_tutorsearch'
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return [token.lower() for token in TOKEN_RE.findall(text or '')]
+
+
+class SQLiteSearchBackend:
+    """FTS5 table whose rowid is the TutorProfile id"""
+    
+    def create_table(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "name, bio, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+    
+    def drop_table(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+    
+    def build_query(self, tokens):
+        # Every token has to match the start of a word
+        return ' '.join(f'"{token}"*' for token in tokens)
+    
+    def apply(self, queryset, query):
+        # bm25() only works in the query that MATCHes. LIMIT -1 (no limit)
+        # keeps SQLite from flattening the matches into the correlated rank
+        # lookup, so the MATCH runs once instead of once per profile
+        matches = (
+            f'SELECT rowid AS id, -bm25({SEARCH_TABLE}, 10.0, 1.0) AS rank '
+            f'FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s LIMIT -1'
+        )
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [query])
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT rank FROM ({matches}) AS matches WHERE matches.id = {queryset.model._meta.db_table}.id',
+                [query],
+                output_field=FloatField()
+            )
+        )
+    
+    def upsert(self, cursor, rows):
+        self.delete(cursor, [row[0] for row in rows])
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, bio) VALUES (%s, %s, %s)',
+            rows
+        )
+    
+    def delete(self, cursor, ids):
+        cursor.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [(pk,) for pk in ids]
+        )
+    
+    def clear(self, cursor):
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+
+
+class PostgresSearchBackend:
+    """tsvector column with a GIN index, names weighted above the bio"""
+    
+    document_sql = (
+        "setweight(to_tsvector('simple', %s), 'A') || "
+        "setweight(to_tsvector('simple', %s), 'B')"
+    )
+    
+    def create_table(self, cursor):
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+            'tutor_id bigint PRIMARY KEY REFERENCES accounts_tutorprofile(id) '
+            'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            'document tsvector NOT NULL)'
+        )
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_gin '
+            f'ON {SEARCH_TABLE} USING GIN (document)'
+        )
+    
+    def drop_table(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+    
+    def build_query(self, tokens):
+        return ' & '.join(f'{token}:*' for token in tokens)
+    
+    def apply(self, queryset, query):
+        tsquery = "to_tsquery('simple', %s)"
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT tutor_id FROM {SEARCH_TABLE} WHERE document @@ {tsquery}', [query])
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT ts_rank(document, {tsquery}) FROM {SEARCH_TABLE} '
+                f'WHERE tutor_id = {queryset.model._meta.db_table}.id',
+                [query],
+                output_field=FloatField()
+            )
+        )
+    
+    def upsert(self, cursor, rows):
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (tutor_id, document) '
+            f'VALUES (%s, {self.document_sql}) '
+            'ON CONFLICT (tutor_id) DO UPDATE SET document = EXCLUDED.document',
+            rows
+        )
+    
+    def delete(self, cursor, ids):
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE tutor_id = ANY(%s)', [list(ids)])
+    
+    def clear(self, cursor):
+        cursor.execute(f'TRUNCATE {SEARCH_TABLE}')
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_backend(vendor=None):
+    backend_class = BACKENDS.get(vendor or connection.vendor)
+    return backend_class() if backend_class else None
+
+
+def search_tutors(queryset, text):
+    """Filter a TutorProfile queryset by ``text`` and annotate ``search_rank``"""
+    no_rank = Value(0.0, output_field=FloatField())
+    tokens = tokenize(text)
+    if not tokens:
+        return queryset.annotate(search_rank=no_rank).none()
+    
+    backend = get_backend()
+    if backend is None:
+        # No index on this database, fall back to a plain scan
+        condition = Q()
+        for token in tokens:
+            condition &= (
+                Q(user__first_name__icontains=token) |
+                Q(user__last_name__icontains=token) |
+                Q(bio__icontains=token)
+            )
+        return queryset.filter(condition).annotate(search_rank=no_rank)
+    
+    return backend.apply(queryset, backend.build_query(tokens))
+
+
+def index_rows(tutor_ids=None):
+    queryset = TutorProfile.objects.order_by('id')
+    if tutor_ids is not None:
+        queryset = queryset.filter(id__in=tutor_ids)
+    for pk, first_name, last_name, bio in queryset.values_list(
+        'id', 'user__first_name', 'user__last_name', 'bio'
+    ).iterator(chunk_size=2000):
+        yield pk, f'{first_name} {last_name}'.strip(), bio
+
+
+def index_tutors(tutor_ids):
+    """Refresh the index entries of the given tutor profiles"""
+    backend = get_backend()
+    tutor_ids = list(tutor_ids)
+    if backend is None or not tutor_ids:
+        return
+    
+    rows = list(index_rows(tutor_ids))
+    with connection.cursor() as cursor:
+        if rows:
+            backend.upsert(cursor, rows)
+        missing = set(tutor_ids) - {row[0] for row in rows}
+        if missing:
+            backend.delete(cursor, missing)
+
+
+def remove_tutors(tutor_ids):
+    backend = get_backend()
+    if backend is None:
+        return
+    with connection.cursor() as cursor:
+        backend.delete(cursor, list(tutor_ids))
+
+
+def rebuild_index(batch_size=2000):
+    """Repopulate the whole index, returns the number of indexed tutors"""
+    backend = get_backend()
+    if backend is None:
+        return 0
+    
+    indexed = 0
+    batch = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        backend.create_table(cursor)
+        backend.clear(cursor)
+        for row in index_rows():
+            batch.append(row)
+            if len(batch) >= batch_size:
+                backend.upsert(cursor, batch)
+                indexed += len(batch)
+                batch = []
+        if batch:
+            backend.upsert(cursor, batch)
+            indexed += len(batch)
+    bump_catalog_version()
+    return indexed
\ No newline at end of file
@@ -1,10 +1,20 @@
+from datetime import timedelta
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Subject, LessonRequest
+from django.db.models import Case, CharField, F, Value, When
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
+from .models import Subject, LessonRequest, MAX_DURATION_MINUTES
+from .availability import MAX_RANGE
+from .scheduling import IntervalSet, overlapping_lessons
 from accounts.models import TutorProfile
 
 User = get_user_model()
 
+# Most requests one bulk status update selects
+BULK_STATUS_MAX_ROWS = 500
+
+CONFLICT_MESSAGE = "The tutor already has an approved lesson at this time"
+
 
 class SubjectSerializer(serializers.ModelSerializer):
     class Meta:
@@ -36,14 +46,16 @@ class TutorDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class LessonRequestCreateSerializer(serializers.ModelSerializer):
+class LessonRequestItemSerializer(serializers.ModelSerializer):
     tutor_id = serializers.IntegerField(write_only=True)
     subject_id = serializers.IntegerField(write_only=True)
     
     class Meta:
         model = LessonRequest
         fields = ['tutor_id', 'subject_id', 'start_time', 'duration_minutes', 'note']
-    
+
+
+class LessonRequestCreateSerializer(LessonRequestItemSerializer):
     def validate_tutor_id(self, value):
         try:
             tutor = User.objects.get(id=value, role='tutor')
@@ -58,12 +70,19 @@ class LessonRequestCreateSerializer(serializers.ModelSerializer):
         except Subject.DoesNotExist:
             raise serializers.ValidationError("Invalid subject ID")
     
+    def validate(self, attrs):
+        start = attrs['start_time']
+        end = start + timedelta(minutes=attrs['duration_minutes'])
+        if overlapping_lessons(attrs['tutor_id'], start, end).exists():
+            raise serializers.ValidationError({'start_time': [CONFLICT_MESSAGE]})
+        return attrs
+    
     def create(self, validated_data):
         tutor_id = validated_data.pop('tutor_id')
         subject_id = validated_data.pop('subject_id')
         
         lesson_request = LessonRequest.objects.create(
-            student=self.context['request'].user,
+            student_id=self.context['request'].user.id,
             tutor_id=tutor_id,
             subject_id=subject_id,
             **validated_data
@@ -71,6 +90,57 @@ class LessonRequestCreateSerializer(serializers.ModelSerializer):
         return lesson_request
 
 
+class LessonRequestBatchSerializer(serializers.Serializer):
+    """Creates several lesson requests, checking all ids with one query per table"""
+    requests = LessonRequestItemSerializer(many=True, allow_empty=False, max_length=50)
+    
+    def validate(self, attrs):
+        items = attrs['requests']
+        tutor_ids = set(User.objects.filter(
+            id__in={item['tutor_id'] for item in items}, role='tutor'
+        ).values_list('id', flat=True))
+        subject_ids = set(Subject.objects.filter(
+            id__in={item['subject_id'] for item in items}
+        ).values_list('id', flat=True))
+        
+        # One interval lookup per tutor covering all of that tutor's items
+        schedules = {}
+        for tutor_id in tutor_ids:
+            windows = [
+                (item['start_time'], item['start_time'] + timedelta(minutes=item['duration_minutes']))
+                for item in items if item['tutor_id'] == tutor_id
+            ]
+            schedules[tutor_id] = IntervalSet.for_tutor(
+                tutor_id, min(start for start, _ in windows), max(end for _, end in windows)
+            )
+        
+        errors = []
+        for item in items:
+            item_errors = {}
+            if item['tutor_id'] not in tutor_ids:
+                item_errors['tutor_id'] = ["Invalid tutor ID"]
+            elif schedules[item['tutor_id']].overlaps(
+                item['start_time'], item['start_time'] + timedelta(minutes=item['duration_minutes'])
+            ):
+                item_errors['start_time'] = [CONFLICT_MESSAGE]
+            if item['subject_id'] not in subject_ids:
+                item_errors['subject_id'] = ["Invalid subject ID"]
+            errors.append(item_errors)
+        
+        if any(errors):
+            raise serializers.ValidationError({'requests': errors})
+        return attrs
+    
+    def create(self, validated_data):
+        student_id = validated_data['student_id']
+        lesson_requests = [LessonRequest(student_id=student_id, **item) for item in validated_data['requests']]
+        for lesson_request in lesson_requests:
+            # bulk_create bypasses save()
+            lesson_request.set_end_time()
+        # bulk_create runs all of its INSERT batches in one transaction
+        return LessonRequest.objects.bulk_create(lesson_requests)
+
+
 class LessonRequestSerializer(serializers.ModelSerializer):
     student_email = serializers.CharField(source='student.email', read_only=True)
     tutor_email = serializers.CharField(source='tutor.email', read_only=True)
@@ -91,6 +161,56 @@ class LessonRequestSerializer(serializers.ModelSerializer):
         return obj.tutor.email
 
 
+class LessonRequestRowSerializer:
+    """
+    Read-only rendering of lesson requests fetched with ``project()``.
+    
+    Produces the same output as LessonRequestSerializer from ``.values()``
+    rows, with tutor_name computed in SQL and without DRF's per-field work.
+    """
+    datetime_field = serializers.DateTimeField()
+    
+    def __init__(self, instance=None, many=False, **kwargs):
+        self.instance = instance
+        self.many = many
+    
+    @staticmethod
+    def project(queryset):
+        full_name = Trim(Concat('tutor__first_name', Value(' '), 'tutor__last_name'))
+        return queryset.values(
+            'id', 'start_time', 'duration_minutes', 'status', 'note', 'created_at',
+            student_email=F('student__email'),
+            tutor_email=F('tutor__email'),
+            tutor_name=Case(
+                When(tutor__tutor_profile__isnull=True, then=F('tutor__email')),
+                default=Coalesce(NullIf(full_name, Value('')), F('tutor__email')),
+                output_field=CharField(),
+            ),
+            subject_name=F('subject__name'),
+        )
+    
+    def to_representation(self, row):
+        to_datetime = self.datetime_field.to_representation
+        return {
+            'id': row['id'],
+            'student_email': row['student_email'],
+            'tutor_email': row['tutor_email'],
+            'tutor_name': row['tutor_name'],
+            'subject_name': row['subject_name'],
+            'start_time': to_datetime(row['start_time']),
+            'duration_minutes': row['duration_minutes'],
+            'status': row['status'],
+            'note': row['note'],
+            'created_at': to_datetime(row['created_at']),
+        }
+    
+    @property
+    def data(self):
+        if self.many:
+            return [self.to_representation(row) for row in self.instance]
+        return self.to_representation(self.instance)
+
+
 class LessonRequestUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = LessonRequest
@@ -99,4 +219,109 @@ class LessonRequestUpdateSerializer(serializers.ModelSerializer):
     def validate_status(self, value):
         if value not in ['approved', 'rejected']:
             raise serializers.ValidationError("Status can only be 'approved' or 'rejected'")
-        return value
\ No newline at end of file
+        
+        instance = self.instance
+        if value == 'approved' and instance is not None and overlapping_lessons(
+            instance.tutor_id, instance.start_time, instance.end_time, exclude_ids=[instance.id]
+        ).exists():
+            raise serializers.ValidationError(CONFLICT_MESSAGE)
+        return value
+    
+    def update(self, instance, validated_data):
+        instance.status = validated_data.get('status', instance.status)
+        instance.save(update_fields=['status', 'updated_at'])
+        return instance
+
+
+class ConflictQuerySerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField(required=False)
+    duration_minutes = serializers.IntegerField(required=False, min_value=1, max_value=MAX_DURATION_MINUTES)
+    include_pending = serializers.BooleanField(required=False, default=False)
+    
+    def validate(self, attrs):
+        if 'end' not in attrs:
+            if 'duration_minutes' not in attrs:
+                raise serializers.ValidationError("Pass end or duration_minutes")
+            attrs['end'] = attrs['start'] + timedelta(minutes=attrs['duration_minutes'])
+        if attrs['end'] <= attrs['start']:
+            raise serializers.ValidationError("end must be after start")
+        return attrs
+
+
+class ConflictSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LessonRequest
+        fields = ['id', 'start_time', 'end_time', 'status']
+
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    """``from``/``to`` range (at most MAX_RANGE long) and the slot length in minutes"""
+    
+    def get_fields(self):
+        # ``from`` is a keyword, so the fields can't be declared as attributes
+        return {
+            'from': serializers.DateTimeField(),
+            'to': serializers.DateTimeField(),
+            'duration': serializers.IntegerField(
+                required=False, default=60, min_value=1, max_value=MAX_DURATION_MINUTES
+            ),
+        }
+    
+    def validate(self, attrs):
+        if attrs['to'] <= attrs['from']:
+            raise serializers.ValidationError("to must be after from")
+        if attrs['to'] - attrs['from'] > MAX_RANGE:
+            raise serializers.ValidationError(f"The range can span at most {MAX_RANGE.days} days")
+        attrs['duration'] = timedelta(minutes=attrs['duration'])
+        return attrs
+
+
+class SlotSerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+
+
+class TutorAvailabilitySerializer(serializers.Serializer):
+    tutor_id = serializers.IntegerField()
+    slots = SlotSerializer(many=True)
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    cursor = serializers.CharField(required=False)
+    role = serializers.ChoiceField(choices=['student', 'tutor'], required=False)
+    limit = serializers.IntegerField(required=False, default=500, min_value=1, max_value=1000)
+
+
+class SyncSerializer(serializers.Serializer):
+    changed = LessonRequestSerializer(many=True)
+    deleted = serializers.ListField(child=serializers.IntegerField())
+    cursor = serializers.CharField()
+    has_more = serializers.BooleanField()
+
+
+class LessonRequestBulkStatusSerializer(serializers.Serializer):
+    """Selects pending requests by id, or by subject and date filters a window of ``limit`` at a time"""
+    status = serializers.ChoiceField(choices=['approved', 'rejected'])
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        max_length=BULK_STATUS_MAX_ROWS
+    )
+    subject_id = serializers.IntegerField(required=False)
+    start_before = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    # Filter mode only, the next window starts past the previous response's last_id
+    limit = serializers.IntegerField(required=False, default=100, min_value=1, max_value=BULK_STATUS_MAX_ROWS)
+    after_id = serializers.IntegerField(required=False, default=0, min_value=0)
+    
+    filter_fields = ['subject_id', 'start_before', 'created_before']
+    
+    def validate(self, attrs):
+        has_filter = any(field in attrs for field in self.filter_fields)
+        if 'ids' in attrs and has_filter:
+            raise serializers.ValidationError("Pass either ids or filters, not both")
+        if 'ids' not in attrs and not has_filter:
+            raise serializers.ValidationError("Pass ids or at least one filter")
+        return attrs
\ No newline at end of file
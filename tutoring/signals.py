@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from accounts.models import TutorProfile
+from . import search
+from .cache import bump_catalog_version
+from .events import lesson_request_event, publish_lesson_events
+from .models import Subject, LessonRequest, LessonRequestTombstone
+
+User = get_user_model()
+
+SEARCHABLE_USER_FIELDS = {'first_name', 'last_name'}
+CATALOG_USER_FIELDS = {'first_name', 'last_name', 'email'}
+
+
+@receiver(post_save, sender=TutorProfile)
+def index_tutor_profile(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'bio' not in update_fields and not kwargs.get('created'):
+        return
+    search.index_tutors([instance.pk])
+
+
+@receiver(post_delete, sender=TutorProfile)
+def unindex_tutor_profile(sender, instance, **kwargs):
+    search.remove_tutors([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def index_tutor_names(sender, instance, update_fields=None, **kwargs):
+    if instance.role != 'tutor' or kwargs.get('created'):
+        return
+    if update_fields is not None and not SEARCHABLE_USER_FIELDS.intersection(update_fields):
+        return
+    tutor_ids = TutorProfile.objects.filter(user_id=instance.pk).values_list('id', flat=True)
+    search.index_tutors(tutor_ids)
+
+
+@receiver(post_save, sender=TutorProfile)
+@receiver(post_delete, sender=TutorProfile)
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def invalidate_catalog(sender, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(m2m_changed, sender=TutorProfile.subjects.through)
+def invalidate_catalog_subjects(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_catalog_version()
+
+
+@receiver(post_save, sender=User)
+def invalidate_catalog_tutor_names(sender, instance, update_fields=None, **kwargs):
+    if instance.role != 'tutor' or kwargs.get('created'):
+        return
+    if update_fields is not None and not CATALOG_USER_FIELDS.intersection(update_fields):
+        return
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=LessonRequest)
+def publish_lesson_request_change(sender, instance, created=False, update_fields=None, **kwargs):
+    if not created and update_fields is not None and 'status' not in update_fields:
+        return
+    publish_lesson_events([lesson_request_event(
+        'created' if created else 'updated',
+        instance.id,
+        instance.status,
+        instance.student_id,
+        instance.tutor_id,
+        instance.start_time
+    )])
+
+
+@receiver(post_delete, sender=LessonRequest)
+def record_lesson_request_deletion(sender, instance, **kwargs):
+    LessonRequestTombstone.objects.create(
+        lesson_request_id=instance.id,
+        student_id=instance.student_id,
+        tutor_id=instance.tutor_id
+    )
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Delta sync of a user's lesson requests.
+
+A sync cursor holds two positions: the (updated_at, id) of the last changed
+row handed out and the (deleted_at, id) of the last tombstone. Each call
+seeks past both on the (user, updated_at) and (user, deleted_at) indexes, so
+a client that is up to date pays for two empty index lookups instead of
+downloading its whole list again.
+
+Rows are only handed out once they are SETTLE_TIME old, because a
+transaction still open may commit rows with older timestamps than ones
+already visible. A transaction that commits more than SETTLE_TIME after
+stamping a row is not covered: the cursor may already be past that row, and
+clients only see it at its next change. Writes to lesson requests are short
+single-request transactions, keep it that way or raise SETTLE_TIME.
+
+Tombstones are pruned after LESSON_REQUEST_TOMBSTONE_RETENTION_DAYS, see
+prune_tombstones(). A cursor older than that may have missed deletions, so
+it is refused with ExpiredCursor and the client syncs from scratch.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .filters import filter_lesson_requests
+from .models import LessonRequest, LessonRequestTombstone
+from .serializers import LessonRequestRowSerializer
+
+SYNC_SALT = 'tutoring.sync'
+
+# Rows saved this recently may still be in an open transaction, along with
+# older timestamps, so they are left for the next call
+SETTLE_TIME = timedelta(seconds=2)
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class ExpiredCursor(Exception):
+    pass
+
+
+def tombstone_cutoff(days=None):
+    if days is None:
+        days = settings.LESSON_REQUEST_TOMBSTONE_RETENTION_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def prune_tombstones(days=None):
+    """Delete tombstones past the retention window, returns how many"""
+    deleted, _ = LessonRequestTombstone.objects.filter(deleted_at__lt=tombstone_cutoff(days)).delete()
+    return deleted
+
+
+def encode_cursor(role, changes, deletions):
+    return signing.dumps({
+        'r': role,
+        'c': changes and [changes[0].isoformat(), changes[1]],
+        'd': [deletions[0].isoformat(), deletions[1]],
+    }, salt=SYNC_SALT, compress=True)
+
+
+def decode_cursor(token, role):
+    try:
+        payload = signing.loads(token, salt=SYNC_SALT)
+        if payload['r'] != role:
+            raise ValueError
+        positions = []
+        for position in (payload['c'], payload['d']):
+            if position is not None:
+                moment = parse_datetime(position[0])
+                if moment is None:
+                    raise ValueError
+                position = (moment, int(position[1]))
+            positions.append(position)
+    except (signing.BadSignature, ValueError, KeyError, TypeError, IndexError):
+        raise InvalidCursor()
+    if positions[1] is None:
+        raise InvalidCursor()
+    return positions
+
+
+def seek(field, position):
+    moment, pk = position
+    return Q(**{f'{field}__gt': moment}) | Q(**{field: moment, 'id__gt': pk})
+
+
+def sync_page(user, role, cursor=None, limit=500):
+    """
+    Changes after ``cursor`` for the user's side ``role``, returns a dict of
+    changed rows, deleted ids, the next cursor and whether more are waiting.
+    """
+    until = timezone.now() - SETTLE_TIME
+    if cursor:
+        changes, deletions = decode_cursor(cursor, role)
+        if deletions[0] < tombstone_cutoff():
+            raise ExpiredCursor()
+    else:
+        # A first sync downloads every row, so earlier deletions don't matter
+        changes, deletions = None, (until, 0)
+    
+    rows = filter_lesson_requests(LessonRequest.objects.all(), user, role).filter(updated_at__lt=until)
+    if changes is not None:
+        rows = rows.filter(seek('updated_at', changes))
+    rows = list(
+        LessonRequestRowSerializer.project(rows)
+        .annotate(changed_at=F('updated_at'))
+        .order_by('updated_at', 'id')[:limit + 1]
+    )
+    
+    tombstones = LessonRequestTombstone.objects.filter(
+        seek('deleted_at', deletions),
+        deleted_at__lt=until,
+        **{f'{role}_id': user.id}
+    )
+    tombstones = list(
+        tombstones.order_by('deleted_at', 'id').values_list('id', 'deleted_at', 'lesson_request_id')[:limit + 1]
+    )
+    
+    more_tombstones = len(tombstones) > limit
+    has_more = len(rows) > limit or more_tombstones
+    rows, tombstones = rows[:limit], tombstones[:limit]
+    if rows:
+        changes = (rows[-1]['changed_at'], rows[-1]['id'])
+    if more_tombstones:
+        deletions = (tombstones[-1][1], tombstones[-1][0])
+    else:
+        # Every tombstone before ``until`` has been handed out, moving past
+        # it keeps the cursor's age that of the last sync
+        deletions = max(deletions, (until, 0))
+    
+    return {
+        'changed': rows,
+        'deleted': [lesson_request_id for _, _, lesson_request_id in tombstones],
+        'cursor': encode_cursor(role, changes, deletions),
+        'has_more': has_more,
+    }
\ No newline at end of file
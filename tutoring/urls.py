@@ -4,13 +4,27 @@ from .views import (
     TutorListView,
     TutorDetailView,
     LessonRequestView,
-    LessonRequestUpdateView
+    LessonRequestExportView,
+    LessonRequestSyncView,
+    LessonRequestBatchView,
+    LessonRequestUpdateView,
+    LessonRequestBulkStatusView,
+    TutorConflictsView,
+    TutorAvailabilityView,
+    SubjectAvailabilityView
 )
 
 urlpatterns = [
     path('subjects/', SubjectListView.as_view(), name='subject-list'),
+    path('subjects/<int:pk>/availability/', SubjectAvailabilityView.as_view(), name='subject-availability'),
     path('tutors/', TutorListView.as_view(), name='tutor-list'),
     path('tutors/<int:pk>/', TutorDetailView.as_view(), name='tutor-detail'),
+    path('tutors/<int:pk>/conflicts/', TutorConflictsView.as_view(), name='tutor-conflicts'),
+    path('tutors/<int:pk>/availability/', TutorAvailabilityView.as_view(), name='tutor-availability'),
     path('lesson-requests/', LessonRequestView.as_view(), name='lesson-request-list-create'),
+    path('lesson-requests/export.<str:export_format>', LessonRequestExportView.as_view(), name='lesson-request-export'),
+    path('lesson-requests/sync/', LessonRequestSyncView.as_view(), name='lesson-request-sync'),
+    path('lesson-requests/batch/', LessonRequestBatchView.as_view(), name='lesson-request-batch'),
+    path('lesson-requests/bulk-status/', LessonRequestBulkStatusView.as_view(), name='lesson-request-bulk-status'),
     path('lesson-requests/<int:pk>/', LessonRequestUpdateView.as_view(), name='lesson-request-update'),
 ]
\ No newline at end of file
@@ -1,30 +1,80 @@
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, extend_schema_view
 from django.contrib.auth import get_user_model
-from django.db.models import Q
-from .models import Subject, LessonRequest
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from .models import Subject, LessonRequest, ArchivedLessonRequest
 from accounts.models import TutorProfile
+from picourse.conditional import ConditionalGetMixin, make_etag
+from picourse.idempotency import idempotent
+from .availability import tutor_availability
+from .cache import CatalogCacheMixin
+from .events import lesson_request_event, publish_lesson_events
+from .export import EXPORT_FORMATS, export_response
+from .filters import filter_lesson_requests, resolve_role
+from .pagination import PaginationModeMixin
+from .scheduling import BLOCKING_STATUSES, IntervalSet, overlapping_lessons
+from .search import search_tutors
+from .sync import ExpiredCursor, InvalidCursor, sync_page
 from .serializers import (
     SubjectSerializer,
     TutorListSerializer,
     TutorDetailSerializer,
     LessonRequestCreateSerializer,
+    LessonRequestBatchSerializer,
     LessonRequestSerializer,
-    LessonRequestUpdateSerializer
+    LessonRequestRowSerializer,
+    LessonRequestUpdateSerializer,
+    LessonRequestBulkStatusSerializer,
+    ConflictQuerySerializer,
+    ConflictSerializer,
+    AvailabilityQuerySerializer,
+    TutorAvailabilitySerializer,
+    SyncQuerySerializer,
+    SyncSerializer
 )
 
 User = get_user_model()
 
 
-class SubjectListView(generics.ListAPIView):
+class SubjectListView(ConditionalGetMixin, CatalogCacheMixin, generics.ListAPIView):
     queryset = Subject.objects.all()
     serializer_class = SubjectSerializer
     permission_classes = [AllowAny]
+    cache_query_params = ['limit', 'offset']
+    
+    def get_validators(self, request, *args, **kwargs):
+        # The row count catches deletions, which leave no updated_at behind
+        stats = Subject.objects.aggregate(last_modified=Max('updated_at'), count=Count('id'))
+        etag = make_etag('subjects', stats['last_modified'], stats['count'])
+        return etag, stats['last_modified']
 
 
-class TutorListView(generics.ListAPIView):
+class TutorListView(CatalogCacheMixin, PaginationModeMixin, generics.ListAPIView):
     serializer_class = TutorListSerializer
     permission_classes = [AllowAny]
+    cache_query_params = ['subject', 'search', 'ordering', 'paginate', 'cursor', 'limit', 'offset']
+    ordering_fields = ['rating', '-rating', 'hourly_rate', '-hourly_rate']
+    
+    def get_ordering(self):
+        ordering = self.request.query_params.get('ordering')
+        if ordering in self.ordering_fields:
+            return (ordering, 'id')
+        
+        # Search results are ranked by relevance unless asked otherwise
+        if self.request.query_params.get('search'):
+            return ('-search_rank', 'id')
+        return ('-rating', 'id')
+    
+    def get_keyset_ordering(self):
+        return self.get_ordering()
     
     def get_queryset(self):
         queryset = TutorProfile.objects.select_related('user').prefetch_related('subjects')
@@ -34,59 +84,67 @@ class TutorListView(generics.ListAPIView):
         if subject_id:
             queryset = queryset.filter(subjects__id=subject_id)
         
-        # Search in name and bio
+        # Search in name and bio through the full-text index
         search = self.request.query_params.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(user__first_name__icontains=search) |
-                Q(user__last_name__icontains=search) |
-                Q(bio__icontains=search)
-            )
+            queryset = search_tutors(queryset, search)
         
-        # Ordering
-        ordering = self.request.query_params.get('ordering', '-rating')
-        if ordering in ['rating', '-rating', 'hourly_rate', '-hourly_rate']:
-            queryset = queryset.order_by(ordering)
-        
-        return queryset.distinct()
+        return queryset.order_by(*self.get_ordering()).distinct()
 
 
-class TutorDetailView(generics.RetrieveAPIView):
+class TutorDetailView(ConditionalGetMixin, CatalogCacheMixin, generics.RetrieveAPIView):
     queryset = TutorProfile.objects.select_related('user').prefetch_related('subjects')
     serializer_class = TutorDetailSerializer
     permission_classes = [AllowAny]
+    
+    def get_validators(self, request, *args, **kwargs):
+        # updated_at is touched on name and subject changes, subject renames
+        # show up through the subjects' own updated_at
+        row = TutorProfile.objects.filter(pk=kwargs['pk']).annotate(
+            subjects_updated_at=Max('subjects__updated_at')
+        ).values_list('updated_at', 'subjects_updated_at').first()
+        if row is None:
+            return None, None
+        
+        last_modified = max(value for value in row if value is not None)
+        return make_etag('tutor', kwargs['pk'], *row), last_modified
 
 
-class LessonRequestView(generics.ListCreateAPIView):
+# Lesson-request rows of the current user, shared by the listing and the export
+class LessonRequestQueryMixin:
+    def get_keyset_ordering(self):
+        return ('-created_at', 'id')
+    
+    def filter_for_user(self, queryset):
+        params = self.request.query_params
+        queryset = filter_lesson_requests(queryset, self.request.user, params.get('role'), params.get('status'))
+        
+        # Listings read a flat projection, tutor_name included, in one query
+        return LessonRequestRowSerializer.project(queryset)
+    
+    def get_queryset(self):
+        queryset = self.filter_for_user(LessonRequest.objects.all())
+        
+        # Archived requests are opt-in, both tables are read as one UNION ALL
+        if self.request.query_params.get('include_archived') in ('1', 'true'):
+            archived = self.filter_for_user(ArchivedLessonRequest.objects.all())
+            queryset = queryset.order_by().union(archived.order_by(), all=True)
+        return queryset.order_by(*self.get_keyset_ordering())
+
+
+@extend_schema_view(get=extend_schema(responses=LessonRequestSerializer(many=True)))
+class LessonRequestView(LessonRequestQueryMixin, PaginationModeMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
+    stateless_auth = True
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return LessonRequestCreateSerializer
-        return LessonRequestSerializer
+        return LessonRequestRowSerializer
     
-    def get_queryset(self):
-        user = self.request.user
-        role = self.request.query_params.get('role', user.role)
-        status_filter = self.request.query_params.get('status')
-        
-        # Get requests based on user role
-        if role == 'student':
-            queryset = LessonRequest.objects.filter(student=user)
-        elif role == 'tutor':
-            queryset = LessonRequest.objects.filter(tutor=user)
-        else:
-            # Fallback: show user's own requests based on their actual role
-            if user.role == 'student':
-                queryset = LessonRequest.objects.filter(student=user)
-            else:
-                queryset = LessonRequest.objects.filter(tutor=user)
-        
-        # Filter by status
-        if status_filter and status_filter in ['pending', 'approved', 'rejected']:
-            queryset = queryset.filter(status=status_filter)
-        
-        return queryset.select_related('student', 'tutor', 'subject')
+    @method_decorator(idempotent('lesson-request'))
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
     
     def perform_create(self, serializer):
         # Ensure only students can create lesson requests
@@ -95,21 +153,264 @@ class LessonRequestView(generics.ListCreateAPIView):
         serializer.save()
 
 
+class LessonRequestExportView(LessonRequestQueryMixin, generics.GenericAPIView):
+    """Streams every matching lesson request as NDJSON or CSV, without pagination"""
+    permission_classes = [IsAuthenticated]
+    stateless_auth = True
+    serializer_class = LessonRequestSerializer
+    
+    @extend_schema(responses={(200, 'application/x-ndjson'): str, (200, 'text/csv'): str})
+    def get(self, request, export_format, *args, **kwargs):
+        if export_format not in EXPORT_FORMATS:
+            raise NotFound()
+        return export_response(
+            self.get_queryset(), export_format, asynchronous=isinstance(request._request, ASGIRequest)
+        )
+
+
+class LessonRequestSyncView(generics.GenericAPIView):
+    """Lesson requests created, updated or deleted since the client's cursor"""
+    serializer_class = SyncSerializer
+    permission_classes = [IsAuthenticated]
+    stateless_auth = True
+    
+    @extend_schema(parameters=[SyncQuerySerializer])
+    def get(self, request, *args, **kwargs):
+        query = SyncQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        
+        role = resolve_role(request.user, params.get('role'))
+        try:
+            page = sync_page(request.user, role, params.get('cursor'), params['limit'])
+        except InvalidCursor:
+            raise ValidationError({'cursor': ['Invalid cursor']})
+        except ExpiredCursor:
+            return Response(
+                {'detail': 'Cursor expired, sync again without a cursor', 'code': 'resync_required'},
+                status=status.HTTP_410_GONE
+            )
+        
+        page['changed'] = LessonRequestRowSerializer(page['changed'], many=True).data
+        return Response(page)
+
+
+class LessonRequestBatchView(generics.GenericAPIView):
+    """Create a series of lesson requests in one call"""
+    serializer_class = LessonRequestBatchSerializer
+    permission_classes = [IsAuthenticated]
+    
+    @extend_schema(responses={201: LessonRequestSerializer(many=True)})
+    @method_decorator(idempotent('lesson-request-batch'))
+    def post(self, request, *args, **kwargs):
+        if request.user.role != 'student':
+            raise PermissionDenied("Only students can create lesson requests")
+        
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        lesson_requests = serializer.save(student_id=request.user.id)
+        # bulk_create sends no post_save, publish the events here
+        publish_lesson_events(
+            lesson_request_event(
+                'created', lesson.id, lesson.status, lesson.student_id, lesson.tutor_id, lesson.start_time
+            )
+            for lesson in lesson_requests
+        )
+        
+        rows = LessonRequestRowSerializer.project(
+            LessonRequest.objects.filter(id__in=[lesson_request.id for lesson_request in lesson_requests])
+        )
+        return Response(
+            {'results': LessonRequestRowSerializer(rows, many=True).data},
+            status=status.HTTP_201_CREATED
+        )
+
+
 class LessonRequestUpdateView(generics.UpdateAPIView):
     serializer_class = LessonRequestUpdateSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         # Only tutors can update lesson requests, and only their own
-        return LessonRequest.objects.filter(tutor=self.request.user)
+        return LessonRequest.objects.filter(tutor_id=self.request.user.id)
     
     def perform_update(self, serializer):
         # Ensure only tutors can update lesson requests
         if self.request.user.role != 'tutor':
             raise PermissionError("Only tutors can update lesson requests")
         
-        lesson_request = self.get_object()
-        if lesson_request.tutor != self.request.user:
+        # The instance was already fetched, scoped to this tutor, by get_object()
+        if serializer.instance.tutor_id != self.request.user.id:
             raise PermissionError("You can only update your own lesson requests")
         
-        serializer.save()
\ No newline at end of file
+        serializer.save()
+
+
+class LessonRequestBulkStatusView(generics.GenericAPIView):
+    """Approve or reject many pending lesson requests with a single UPDATE"""
+    serializer_class = LessonRequestBulkStatusSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, *args, **kwargs):
+        if request.user.role != 'tutor':
+            raise PermissionDenied("Only tutors can update lesson requests")
+        
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        candidates = LessonRequest.objects.filter(tutor_id=request.user.id)
+        if 'ids' in data:
+            candidates = candidates.filter(id__in=data['ids'])
+        else:
+            candidates = candidates.filter(status='pending', id__gt=data['after_id'])
+            if 'subject_id' in data:
+                candidates = candidates.filter(subject_id=data['subject_id'])
+            if 'start_before' in data:
+                candidates = candidates.filter(start_time__lt=data['start_before'])
+            if 'created_before' in data:
+                candidates = candidates.filter(created_at__lt=data['created_before'])
+        
+        has_more = False
+        with transaction.atomic():
+            rows = candidates.select_for_update().order_by('id').values_list(
+                'id', 'status', 'start_time', 'end_time', 'student_id'
+            )
+            if 'ids' in data:
+                rows = list(rows)
+            else:
+                # One window of the matches, the client asks for the next past last_id
+                rows = list(rows[:data['limit'] + 1])
+                has_more = len(rows) > data['limit']
+                rows = rows[:data['limit']]
+            found = {pk: current for pk, current, _, _, _ in rows}
+            pending = sorted((row for row in rows if row[1] == 'pending'), key=lambda row: (row[2], row[0]))
+            conflicting = set()
+            
+            if data['status'] == 'approved' and pending:
+                # Approve in start order, each approval blocks the later ones
+                schedule = IntervalSet.for_tutor(
+                    request.user.id, pending[0][2], max(end for _, _, _, end, _ in pending)
+                )
+                for pk, _, start, end, _ in pending:
+                    if schedule.overlaps(start, end):
+                        conflicting.add(pk)
+                    else:
+                        schedule.add(start, end)
+            
+            updated_ids = [pk for pk, _, _, _, _ in pending if pk not in conflicting]
+            if updated_ids:
+                # The window is every match up to its last id, so the UPDATE
+                # repeats the filter bounded by that id instead of listing them
+                updated = candidates.filter(status='pending')
+                if 'ids' not in data:
+                    updated = updated.filter(id__lte=rows[-1][0])
+                count = updated.exclude(id__in=conflicting).update(status=data['status'], updated_at=timezone.now())
+                if count != len(updated_ids):
+                    # A matching request appeared inside the window meanwhile
+                    raise ValidationError("Lesson requests changed during the update, try again")
+            
+            # update() sends no post_save, publish the events here
+            publish_lesson_events(
+                lesson_request_event('updated', pk, data['status'], student_id, request.user.id, start)
+                for pk, _, start, _, student_id in pending
+                if pk not in conflicting
+            )
+        
+        if 'ids' in data:
+            results = []
+            for pk in dict.fromkeys(data['ids']):
+                if pk not in found:
+                    result = 'not_found'
+                elif found[pk] != 'pending':
+                    result = 'not_pending'
+                elif pk in conflicting:
+                    result = 'conflict'
+                else:
+                    result = 'updated'
+                results.append({'id': pk, 'result': result})
+        else:
+            results = [
+                {'id': pk, 'result': 'conflict' if pk in conflicting else 'updated'}
+                for pk, _, _, _, _ in rows
+            ]
+        
+        return Response({
+            'status': data['status'],
+            'updated': len(updated_ids),
+            'results': results,
+            'has_more': has_more,
+            'last_id': rows[-1][0] if rows else None,
+        })
+
+
+class TutorConflictsView(generics.GenericAPIView):
+    """Lessons of a tutor that overlap a candidate slot"""
+    serializer_class = ConflictSerializer
+    permission_classes = [IsAuthenticated]
+    stateless_auth = True
+    
+    @extend_schema(parameters=[ConflictQuerySerializer], responses=ConflictSerializer(many=True))
+    def get(self, request, pk, *args, **kwargs):
+        query = ConflictQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        slot = query.validated_data
+        
+        tutor_id = TutorProfile.objects.filter(pk=pk).values_list('user_id', flat=True).first()
+        if tutor_id is None:
+            raise NotFound()
+        
+        statuses = ('approved', 'pending') if slot['include_pending'] else BLOCKING_STATUSES
+        lessons = overlapping_lessons(tutor_id, slot['start'], slot['end'], statuses)
+        return Response({'conflicts': ConflictSerializer(lessons, many=True).data})
+
+
+def availability_rows(tutors, query):
+    """Serialize free slots of ``(profile_id, user_id)`` pairs, in the given order"""
+    availability = tutor_availability(tutors, query['from'], query['to'], query['duration'])
+    return TutorAvailabilitySerializer([
+        {
+            'tutor_id': profile_id,
+            'slots': [{'start': start, 'end': end} for start, end in availability[profile_id]],
+        }
+        for profile_id, _ in tutors
+    ], many=True).data
+
+
+class TutorAvailabilityView(generics.GenericAPIView):
+    """Free slots of a tutor: working hours minus approved lessons"""
+    serializer_class = TutorAvailabilitySerializer
+    permission_classes = [IsAuthenticated]
+    stateless_auth = True
+    
+    @extend_schema(parameters=[AvailabilityQuerySerializer])
+    def get(self, request, pk, *args, **kwargs):
+        query = AvailabilityQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        
+        tutor = TutorProfile.objects.filter(pk=pk).values_list('id', 'user_id').first()
+        if tutor is None:
+            raise NotFound()
+        return Response(availability_rows([tutor], query.validated_data)[0])
+
+
+class SubjectAvailabilityView(generics.GenericAPIView):
+    """Free slots of every tutor teaching a subject, computed in one pass per page"""
+    serializer_class = TutorAvailabilitySerializer
+    permission_classes = [IsAuthenticated]
+    stateless_auth = True
+    pagination_class = LimitOffsetPagination
+    
+    def get_queryset(self):
+        return TutorProfile.objects.filter(subjects__id=self.kwargs['pk']).order_by('id').values_list('id', 'user_id')
+    
+    @extend_schema(parameters=[AvailabilityQuerySerializer])
+    def get(self, request, pk, *args, **kwargs):
+        query = AvailabilityQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        
+        if not Subject.objects.filter(pk=pk).exists():
+            raise NotFound()
+        
+        tutors = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response(availability_rows(tutors, query.validated_data))
\ No newline at end of file